@@ -4,12 +4,15 @@ from flask_bcrypt import Bcrypt
 from flask_restx import Api
 from config import DevelopmentConfig
 from flask_jwt_extended import JWTManager
+from flask_migrate import Migrate
+from app.persistence.routing import RoutingSession
 
 
 bcrypt = Bcrypt()
 jwt = JWTManager()
 jwt = JWTManager()
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+migrate = Migrate()
 
 def create_app(config_class=DevelopmentConfig):
     """Initialize the Flask application and API namespaces."""
@@ -18,14 +21,31 @@ def create_app(config_class=DevelopmentConfig):
     jwt.init_app(app)
 
     db.init_app(app)
+    from app.persistence import fulltext
+    # render_as_batch lets Alembic alter SQLite tables by copying them; the
+    # FTS5 tables are created by their own migrations, not autogenerate
+    migrate.init_app(app, db, render_as_batch=True, include_name=fulltext.include_name)
     bcrypt.init_app(app)
 
+    from app.persistence import sqlite
+    sqlite.init_app(app, db)
+
+    from app.services import revocation_list
+    revocation_list.init_app(app)
+    fulltext.init_app(app, db)
+    from app.persistence.place_repository import amenity_index
+    amenity_index.init_app(app, db)
+    from app.services import facade
+    facade.place_search.init_app(app)
+    facade.summary_cache.init_app(app, db)
+
     from app.api.v1.users import api as users_ns
     from app.api.v1.amenities import api as amenities_ns
     from app.api.v1.places import api as places_ns
     from app.api.v1.reviews import api as reviews_ns
     from app.api.v1.auth import api as auth_ns
     from app.api.v1.admin import api as admin_ns
+    from app.api.health import api as health_ns
 
     
     api = Api(app, version='1.0', title='HBnB API', description='HBnB Application API')
@@ -36,6 +56,16 @@ def create_app(config_class=DevelopmentConfig):
     api.add_namespace(reviews_ns, path='/api/v1/reviews')
     api.add_namespace(auth_ns, path='/api/v1/auth')
     api.add_namespace(admin_ns, path='/api/v1/admin')
+    api.add_namespace(health_ns, path='/health')
+
+    from app.cli import register_commands
+    register_commands(app)
+
+    from app import metrics
+    metrics.init_app(app, db)
+
+    from app.tracing import tracer
+    tracer.init_app(app, db)
 
 
     return app
@@ -0,0 +1,60 @@
+from flask import current_app
+from flask_restx import Namespace, Resource
+from sqlalchemy import text
+from app import db
+
+api = Namespace('health', description='Liveness and readiness probes')
+
+
+def pool_status(engine):
+    """Describe the connection pool of an engine."""
+    pool = engine.pool
+    status = {'class': type(pool).__name__}
+    if not hasattr(pool, 'checkedout') or not hasattr(pool, 'size'):
+        return status
+    max_overflow = getattr(pool, '_max_overflow', 0)
+    capacity = None if max_overflow < 0 else pool.size() + max_overflow
+    status.update({
+        'size': pool.size(),
+        'checked_out': pool.checkedout(),
+        'checked_in': pool.checkedin(),
+        'overflow': max(0, pool.overflow()),
+        'max_overflow': max_overflow,
+        'capacity': capacity,
+        'utilization': round(pool.checkedout() / capacity, 3) if capacity else None,
+    })
+    return status
+
+
+@api.route('/live')
+class Liveness(Resource):
+    @api.response(200, 'The process is up')
+    def get(self):
+        """Liveness probe"""
+        return {'status': 'ok'}, 200
+
+
+@api.route('/ready')
+class Readiness(Resource):
+    @api.response(200, 'Ready to serve traffic')
+    @api.response(503, 'Connection pool exhausted or database unreachable')
+    def get(self):
+        """Readiness probe reporting connection pool utilization"""
+        saturation = current_app.config.get('HEALTH_POOL_SATURATION', 1.0)
+        pools = {}
+        ready = True
+        for bind, engine in db.engines.items():
+            name = bind or 'default'
+            status = pool_status(engine)
+            if status.get('utilization') is not None and status['utilization'] >= saturation:
+                status['error'] = 'Connection pool exhausted'
+                ready = False
+            else:
+                try:
+                    with engine.connect() as conn:
+                        conn.execute(text('SELECT 1'))
+                except Exception as e:
+                    status['error'] = str(e)
+                    ready = False
+            pools[name] = status
+        return {'status': 'ready' if ready else 'unavailable', 'pools': pools}, 200 if ready else 503
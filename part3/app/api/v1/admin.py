@@ -1,8 +1,9 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from flask import request
+from flask import request, current_app, Response
 from app.models.user import User
 from app.services import facade
+from app.profiler import profiler, collapsed, ProfilerBusyError
 from werkzeug.security import generate_password_hash
 
 api = Namespace('admin', description='Admin operations')
@@ -119,3 +120,34 @@ class AdminAmenityModify(Resource):
             return {'message': 'Amenity updated successfully'}, 200
         except Exception as e:
             return {'error': str(e)}, 400
+
+@api.route('/profile')
+class AdminProfile(Resource):
+    @api.doc(params={
+        'seconds': 'Sampling duration in seconds (default 10)',
+        'interval_ms': 'Time between two samples in milliseconds (default 5)'
+    })
+    @api.response(200, 'Collapsed stacks, one "frame;frame count" line per stack')
+    @api.response(403, 'Admin privileges required')
+    @api.response(409, 'A profiling session is already running')
+    @jwt_required()
+    def get(self):
+        """Sample the stacks of every worker thread (only for admins)"""
+        current_user = get_jwt_identity()
+        if not current_user.get('is_admin'):
+            return {'error': 'Admin privileges required'}, 403
+        try:
+            seconds = float(request.args.get('seconds', 10))
+            interval = float(request.args.get('interval_ms', 5)) / 1000
+        except ValueError:
+            return {'error': 'seconds and interval_ms must be numbers'}, 400
+        max_seconds = current_app.config.get('PROFILER_MAX_SECONDS', 60)
+        if not 0 < seconds <= max_seconds or not 0 < interval <= 1:
+            return {'error': f'seconds must be between 0 and {max_seconds}, interval_ms between 0 and 1000'}, 400
+        try:
+            stacks = profiler.profile(seconds, interval)
+        except ProfilerBusyError as e:
+            return {'error': str(e)}, 409
+        response = Response(collapsed(stacks), mimetype='text/plain')
+        response.headers['X-Profile-Samples'] = str(sum(stacks.values()))
+        return response
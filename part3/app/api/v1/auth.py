@@ -1,6 +1,6 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import create_access_token
-from app.services import facade
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt, get_jwt_identity
+from app.services import facade, revocation_list
 
 api = Namespace('auth', description='Authentication operations')
 
@@ -14,16 +14,40 @@ login_model = api.model('Login', {
 class Login(Resource):
     @api.expect(login_model)
     def post(self):
-        """Authenticate user and return a JWT token"""
+        """Authenticate user and return an access and a refresh JWT token"""
         credentials = api.payload
-        
+
         # Authenticate the user using the facade
         user = facade.authenticate_user(credentials['email'], credentials['password'])
-        
+
         if not user:
             return {'error': 'Invalid credentials'}, 401
-            
-        # Create a JWT token
-        access_token = create_access_token(identity={'id': str(user.id), 'is_admin': user.is_admin})
-        
+
+        # Create a short-lived access token and a long-lived refresh token
+        identity = {'id': str(user.id), 'is_admin': user.is_admin}
+        access_token = create_access_token(identity=identity)
+        refresh_token = create_refresh_token(identity=identity)
+
+        return {'access_token': access_token, 'refresh_token': refresh_token}, 200
+
+@api.route('/refresh')
+class Refresh(Resource):
+    @api.response(200, 'Access token refreshed')
+    @api.response(401, 'Invalid or revoked refresh token')
+    @jwt_required(refresh=True)
+    def post(self):
+        """Issue a new access token from a refresh token"""
+        access_token = create_access_token(identity=get_jwt_identity())
         return {'access_token': access_token}, 200
+
+@api.route('/logout')
+class Logout(Resource):
+    @api.response(200, 'Token successfully revoked')
+    @api.response(401, 'Invalid or revoked token')
+    @jwt_required(verify_type=False)
+    def post(self):
+        """Revoke the access or refresh token used for this request"""
+        token = get_jwt()
+        revocation_list.revoke(token)
+        revocation_list.purge_expired()
+        return {'message': f"{token['type'].capitalize()} token successfully revoked"}, 200
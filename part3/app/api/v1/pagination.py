@@ -0,0 +1,53 @@
+import base64
+import json
+import math
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+# Cursor value type of scores and other numeric sort keys
+NUMBER = (int, float)
+
+
+def encode_cursor(values):
+    """Encode the sort key of the last returned row as an opaque cursor."""
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _valid_value(value, expected):
+    if isinstance(value, bool) or not isinstance(value, expected):
+        return False
+    return not isinstance(value, float) or math.isfinite(value)
+
+
+def decode_cursor(cursor, size, types=None):
+    """Decode a cursor produced by encode_cursor holding `size` values.
+
+    `types` gives the expected type of each value (e.g. (NUMBER, str)), so
+    that a forged cursor is rejected here rather than by the database.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    if types is not None and not all(_valid_value(value, expected) for value, expected in zip(values, types)):
+        raise ValueError("Invalid cursor")
+    return tuple(values)
+
+
+def parse_limit(value, default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    """Validate a page size query parameter."""
+    if value in (None, ''):
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if not 1 <= limit <= maximum:
+        raise ValueError(f"limit must be between 1 and {maximum}")
+    return limit
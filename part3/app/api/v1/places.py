@@ -1,5 +1,8 @@
+from datetime import datetime
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
+from app.api.v1.pagination import NUMBER, decode_cursor, encode_cursor, parse_limit
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 api = Namespace('places', description='Place operations')
@@ -29,6 +32,51 @@ place_model = api.model('Place', {
     'amenities': fields.List(fields.String, required=True, description="List of amenities IDs")
 })
 
+
+def parse_rating(value):
+    """Validate a rating query parameter."""
+    if value in (None, ''):
+        return None
+    try:
+        rating = int(value)
+    except ValueError:
+        raise ValueError("Ratings must be integers between 1 and 5")
+    if not 1 <= rating <= 5:
+        raise ValueError("Ratings must be integers between 1 and 5")
+    return rating
+
+def parse_float(args, name):
+    """Validate a numeric query parameter."""
+    value = args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+
+
+def parse_place_filters(args):
+    """Read the place listing filters from the query string, leaving out absent ones."""
+    filters = {
+        'min_price': parse_float(args, 'min_price'),
+        'max_price': parse_float(args, 'max_price'),
+        'min_rating': parse_rating(args.get('min_rating')),
+        'amenities': args.get('amenities') or None,
+        'query': args.get('q', '').strip() or None,
+    }
+    center = [parse_float(args, name) for name in ('lat', 'lon', 'radius')]
+    if any(value is not None for value in center):
+        latitude, longitude, radius = center
+        if None in center:
+            raise ValueError("lat, lon and radius must be given together")
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError("lat must be between -90 and 90 and lon between -180 and 180")
+        if radius <= 0:
+            raise ValueError("radius must be positive")
+        filters.update(latitude=latitude, longitude=longitude, radius=radius)
+    return {name: value for name, value in filters.items() if value is not None}
+
 @api.route('/')
 class PlaceList(Resource): 
     @api.expect(place_model)
@@ -47,11 +95,70 @@ class PlaceList(Resource):
             return {'error': str(e)}, 400
 
 
+    @api.doc(params={'amenities': "Amenity ids or names; ',' means AND, '|' means OR (e.g. WiFi|Fiber,Pool)",
+                     'min_price': 'Lowest price per night', 'max_price': 'Highest price per night',
+                     'lat': 'Latitude of the search center', 'lon': 'Longitude of the search center',
+                     'radius': 'Search radius in km around lat/lon',
+                     'min_rating': 'Lowest average rating (1-5)',
+                     'q': 'Keywords, all of them must match',
+                     'explain': '1 to return {"results", "plan"} with the estimates, the database query plan and timings',
+                     'limit': 'Page size of a filtered search (1-100, default 20)',
+                     'cursor': 'X-Next-Cursor header of the previous page'})
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid filter, unknown amenity, limit or cursor')
     def get(self):
-        """Retrieve a list of all places"""
-        places = facade.get_places()
-        return [place.to_dict() for place in places], 200
+        """Retrieve a list of all places, or one page of the places matching filters"""
+        explain = request.args.get('explain', '').lower() in ('1', 'true')
+        headers = {}
+        try:
+            filters = parse_place_filters(request.args)
+            if filters or explain:
+                limit = parse_limit(request.args.get('limit'))
+                after = decode_cursor(request.args.get('cursor'), 1)
+                if after is not None:
+                    after, = after
+                    if not isinstance(after, str):
+                        raise ValueError("Invalid cursor")
+                places, plan = facade.find_places(limit=limit, after=after, explain=explain, **filters)
+                if len(places) == limit:
+                    headers['X-Next-Cursor'] = encode_cursor((places[-1].id,))
+            else:
+                places = facade.get_places()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        results = [place.to_dict() for place in places]
+        if explain:
+            return {'results': results, 'plan': plan}, 200, headers
+        return results, 200, headers
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.doc(params={'q': 'Keywords, all of them must match',
+                     'limit': 'Page size (1-100, default 20)',
+                     'cursor': 'next_cursor of the previous page',
+                     'facets': '1 to also count all matches per amenity, price bucket and rating'})
+    @api.response(200, 'Matching places, best match first')
+    @api.response(400, 'Invalid query, limit or cursor')
+    def get(self):
+        """Search places by keywords in their title and description"""
+        query = request.args.get('q', '').strip()
+        if not query:
+            return {'error': 'Query parameter q is required'}, 400
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            after = decode_cursor(request.args.get('cursor'), 2, (NUMBER, str))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        hits = facade.search_places(query, limit, after)
+        results = [dict(place.to_dict(), score=-score) for place, score in hits]
+        next_cursor = None
+        if len(hits) == limit:
+            place, score = hits[-1]
+            next_cursor = encode_cursor((score, place.id))
+        response = {'results': results, 'next_cursor': next_cursor}
+        if request.args.get('facets', '').lower() in ('1', 'true'):
+            response['facets'] = facade.get_place_facets(query)
+        return response, 200
 
 @api.route('/<place_id>')
 class PlaceResource(Resource):
@@ -59,7 +166,7 @@ class PlaceResource(Resource):
     @api.response(404, 'Place not found')
     def get(self, place_id):
         """Get place details by ID"""
-        place = facade.get_places(place_id)
+        place = facade.get_place_by_id(place_id)
         if not place:
             return {'error': 'Place not found'}, 404
         return place.to_dict_list(), 200
@@ -88,67 +195,144 @@ class PlaceResource(Resource):
         except Exception as e:
             return {'error': str(e)}, 400
 
+    @api.response(200, 'Place deleted successfully')
+    @api.response(404, 'Place not found')
+    @api.response(403, 'Forbidden: You are not the owner of this place')
+    @jwt_required()
+    def delete(self, place_id):
+        """Delete a place"""        
+        place = facade.get_place(place_id)
+        if not place:
+            return {'error': 'Place not found'}, 404        
+        current_user = get_jwt_identity()
+        is_admin = current_user.get('is_admin', False)
+        user_id = current_user.get('id')
+        if not is_admin and place.owner_id != user_id:
+            return {'error': 'Forbidden: You are not the owner of this place'}, 403
+
+        try:
+            facade.delete_place(place_id)
+            return {'message': 'Place deleted successfully'}, 200
+        except Exception as e:
+            return {'error': str(e)}, 400
+
+def parse_amenity_ids(payload):
+    """Read a list of {'id': ...} amenity references."""
+    if not isinstance(payload, list) or not all(isinstance(item, dict) and item.get('id') for item in payload):
+        raise ValueError('Invalid input data')
+    return [item['id'] for item in payload]
+
+
+def owned_place(place_id):
+    """Return (place, None) if the current user may edit the place, else (None, error response)."""
+    place = facade.get_place(place_id)
+    if not place:
+        return None, ({'error': 'Place not found'}, 404)
+    current_user = get_jwt_identity()
+    if not current_user.get('is_admin', False) and place.owner_id != current_user.get('id'):
+        return None, ({'error': 'Forbidden: You are not the owner of this place'}, 403)
+    return place, None
+
 @api.route('/<place_id>/amenities')
 class PlaceAmenities(Resource):
-    @api.expect(amenity_model)
+    @api.expect([amenity_model])
     @api.response(200, 'Amenities added successfully')
     @api.response(404, 'Place not found')
     @api.response(400, 'Invalid input data')
+    @api.response(403, 'Forbidden: You are not the owner of this place')
+    @jwt_required()
     def post(self, place_id):
         """Add amenities to a place"""
-        amenities_data = api.payload
-
-        if not amenities_data or not isinstance(amenities_data, list):
-            return {'error': 'Invalid input data'}, 400
-
-        place = facade.get_place(place_id)
-        if not place:
-            return {'error': 'Place not found'}, 404
+        try:
+            amenity_ids = parse_amenity_ids(api.payload)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        place, error = owned_place(place_id)
+        if error:
+            return error
+        try:
+            facade.attach_amenities(place_id, amenity_ids)
+        except ValueError as e:
+            return {'error': str(e)}, 400
 
-        # Ensure all amenities exist before adding
-        amenities_to_add = []
-        for amenity in amenities_data:
-            a = facade.get_amenity(amenity['id'])
-            if not a:
-                return {'error': f"Amenity {amenity['id']} not found"}, 400
-            amenities_to_add.append(a)
+        return {'message': 'Amenities added successfully'}, 200
 
-        # Add the valid amenities
-        for amenity in amenities_to_add:
-            place.add_amenity(amenity)
+    @api.expect([amenity_model])
+    @api.response(200, 'Amenities replaced successfully')
+    @api.response(404, 'Place not found')
+    @api.response(400, 'Invalid input data')
+    @api.response(403, 'Forbidden: You are not the owner of this place')
+    @jwt_required()
+    def put(self, place_id):
+        """Replace the amenities of a place"""
+        try:
+            amenity_ids = parse_amenity_ids(api.payload)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        place, error = owned_place(place_id)
+        if error:
+            return error
+        try:
+            facade.set_place_amenities(place_id, amenity_ids)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return {'message': 'Amenities replaced successfully'}, 200
 
-        return {'message': 'Amenities added successfully'}, 200
+    @api.expect([amenity_model])
+    @api.response(200, 'Amenities removed successfully')
+    @api.response(404, 'Place not found')
+    @api.response(400, 'Invalid input data')
+    @api.response(403, 'Forbidden: You are not the owner of this place')
+    @jwt_required()
+    def delete(self, place_id):
+        """Remove amenities from a place"""
+        try:
+            amenity_ids = parse_amenity_ids(api.payload)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        place, error = owned_place(place_id)
+        if error:
+            return error
+        facade.detach_amenities(place_id, amenity_ids)
+        return {'message': 'Amenities removed successfully'}, 200
 
 @api.route('/<place_id>/reviews/')
 class PlaceReviewList(Resource):
+    @api.doc(params={'min_rating': 'Lowest rating (1-5)', 'max_rating': 'Highest rating (1-5)',
+                     'q': 'Keywords the review text must contain',
+                     'sort': 'newest (default), oldest, highest or lowest',
+                     'limit': 'Page size (1-100, default 20)',
+                     'cursor': 'X-Next-Cursor header of the previous page'})
     @api.response(200, 'List of reviews for the place retrieved successfully')
+    @api.response(400, 'Invalid filter, sort, limit or cursor')
     @api.response(404, 'Place not found')
     def get(self, place_id):
-        """Get all reviews for a specific place"""
+        """Get the reviews of a place, filtered and paginated"""
         place = facade.get_place(place_id)
         if not place:
             return {'error': 'Place not found'}, 404
-        return [review.to_dict() for review in place.reviews], 200
-
-@api.route('/places/<place_id>')
-class PlaceResource(Resource):
-    @api.response(200, 'Place deleted successfully')
-    @api.response(404, 'Place not found')
-    @api.response(403, 'Forbidden: You are not the owner of this place')
-    @jwt_required()
-    def delete(self, place_id):
-        """Delete a place"""        
-        place = facade.get_place(place_id)
-        if not place:
-            return {'error': 'Place not found'}, 404        
-        current_user = get_jwt_identity()
-        is_admin = current_user.get('is_admin', False)
-        user_id = current_user.get('id')
-        if not is_admin and place.owner_id != user_id:
-            return {'error': 'Forbidden: You are not the owner of this place'}, 403
-
+        sort = request.args.get('sort', 'newest')
+        # Cursors hold (created_at, id) for the date sorts and (rating, id) otherwise
+        cursor_types = (str, str) if sort in ('newest', 'oldest') else (int, str)
         try:
-            facade.delete_place(place_id)
-            return {'message': 'Place deleted successfully'}, 200
-        except Exception as e:
+            filters = {
+                'min_rating': parse_rating(request.args.get('min_rating')),
+                'max_rating': parse_rating(request.args.get('max_rating')),
+                'query': request.args.get('q', '').strip() or None,
+                'sort': sort,
+                'limit': parse_limit(request.args.get('limit')),
+                'after': decode_cursor(request.args.get('cursor'), 2, cursor_types),
+            }
+            if filters['after'] is not None and sort in ('newest', 'oldest'):
+                value, last_id = filters['after']
+                filters['after'] = (datetime.fromisoformat(value), last_id)
+            reviews = facade.search_reviews(place_id, **filters)
+        except (TypeError, ValueError) as e:
             return {'error': str(e)}, 400
+        headers = {}
+        if len(reviews) == filters['limit']:
+            last = reviews[-1]
+            value = last.created_at.isoformat() if sort in ('newest', 'oldest') else last.rating
+            headers['X-Next-Cursor'] = encode_cursor((value, last.id))
+        return [review.to_dict() for review in reviews], 200, headers
+
@@ -21,17 +21,6 @@ class ReviewList(Resource):
     def post(self):
         """Register a new review"""
         review_data = api.payload
-        place = facade.get_place_by_id(review_data['place_id'])
-        if not place:
-            return {'error': 'Place not found'}, 400
-        user = facade.get_user(review_data['user_id'])
-        if not user:
-            return {'error': 'User not found'}, 400
-        if place.owner.id == user.id:
-            return {'error': 'You cannot review your own place'}, 400
-        existing_review = facade.get_review_by_place_and_user(review_data['place_id'], review_data['user_id'])
-        if existing_review:
-            return {'error': 'You have already reviewed this place'}, 400
         try:
             new_review = facade.create_review(review_data)
             return new_review.to_dict(), 201
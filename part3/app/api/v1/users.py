@@ -1,5 +1,7 @@
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
+from app.api.v1.pagination import decode_cursor, encode_cursor, parse_limit
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 api = Namespace('users', description='User operations')
@@ -44,10 +46,21 @@ class UserList(Resource):
     
 @api.route('/<user_id>')
 class UserResource(Resource):
+    @api.doc(params={'include': "'counts' to add the number of places and reviews of the user"})
     @api.response(200, 'User details retrieved successfully')
+    @api.response(400, 'Unknown include')
     @api.response(404, 'User not found')
     def get(self, user_id):
         """Get user details by ID"""
+        include = {name.strip() for name in request.args.get('include', '').split(',') if name.strip()}
+        if include - {'counts'}:
+            return {'error': f"Unknown include: {', '.join(sorted(include - {'counts'}))}"}, 400
+        if 'counts' in include:
+            found = facade.get_user_with_counts(user_id)
+            if not found:
+                return {'error': 'User not found'}, 404
+            user, counts = found
+            return dict(user.to_dict(), counts=counts), 200
         user = facade.get_user(user_id)
         if not user:
             return {'error': 'User not found'}, 404
@@ -73,3 +86,23 @@ class UserResource(Resource):
             return {'message': 'User details updated successfully'}, 200
         except Exception as e:
             return {'error': str(e)}, 400
+
+@api.route('/<user_id>/places/summary')
+class UserPlaceSummary(Resource):
+    @api.doc(params={'limit': 'Page size (1-100, default 20)',
+                     'cursor': 'next_cursor of the previous page'})
+    @api.response(200, "The owner's places with review count, average rating and latest review")
+    @api.response(400, 'Invalid limit or cursor')
+    @api.response(404, 'User not found')
+    def get(self, user_id):
+        """Dashboard summary of the places owned by a user"""
+        if not facade.get_user(user_id):
+            return {'error': 'User not found'}, 404
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            after = decode_cursor(request.args.get('cursor'), 1, (str,))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        results = facade.get_owner_place_summary(user_id, limit, after[0] if after else None)
+        next_cursor = encode_cursor((results[-1]['id'],)) if len(results) == limit else None
+        return {'results': results, 'next_cursor': next_cursor}, 200
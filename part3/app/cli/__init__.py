@@ -0,0 +1,9 @@
+def register_commands(app):
+    """Attach the HBnB command groups to the Flask CLI."""
+    from app.cli.users import users_cli
+    from app.cli.data import data_cli
+    from app.cli.seed import seed_command
+
+    app.cli.add_command(users_cli)
+    app.cli.add_command(data_cli)
+    app.cli.add_command(seed_command)
@@ -0,0 +1,253 @@
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import exists, func, select, text
+from app import db
+
+data_cli = AppGroup('data', help='Dataset backup and restore commands.')
+
+FORMAT_VERSION = 1
+MANIFEST = 'manifest.json'
+# Tables grouped by foreign key depth: a level only references earlier ones
+RESTORE_LEVELS = [
+    ['users', 'amenities'],
+    ['places'],
+    ['place_amenity', 'reviews'],
+]
+TABLES = [name for level in RESTORE_LEVELS for name in level]
+
+# Statements turning per-row constraint checks off / back on, per dialect
+CONSTRAINT_CHECKS = {
+    'sqlite': ('PRAGMA foreign_keys=OFF', 'PRAGMA foreign_keys=ON'),
+    'mysql': ('SET FOREIGN_KEY_CHECKS=0, UNIQUE_CHECKS=0', 'SET FOREIGN_KEY_CHECKS=1, UNIQUE_CHECKS=1'),
+    'postgresql': ("SET session_replication_role = 'replica'", "SET session_replication_role = 'origin'"),
+}
+
+
+def _table(name):
+    return db.metadata.tables[name]
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def export_table(conn, name, directory, batch_size):
+    """Stream one table into <name>.jsonl.gz with a server-side cursor."""
+    table = _table(name)
+    columns = [column.name for column in table.columns]
+    filename = f"{name}.jsonl.gz"
+    rows = 0
+    with gzip.open(os.path.join(directory, filename), 'wt', encoding='utf-8') as out:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(select(table))
+        for partition in result.partitions():
+            out.writelines(
+                json.dumps([_encode(value) for value in row], separators=(',', ':')) + "\n"
+                for row in partition
+            )
+            rows += len(partition)
+    return {'file': filename, 'columns': columns, 'rows': rows}
+
+
+@contextmanager
+def snapshot(engine):
+    """A connection reading every table from the same snapshot, so exports have no orphan rows."""
+    with engine.connect() as conn:
+        if conn.dialect.name == 'sqlite':
+            # pysqlite opens no transaction for SELECTs: BEGIN pins one WAL snapshot
+            if not conn.connection.driver_connection.in_transaction:
+                conn.exec_driver_sql('BEGIN')
+        else:
+            conn.execution_options(isolation_level='REPEATABLE READ')
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+
+
+def export_dataset(engine, directory, batch_size=10000, echo=click.echo):
+    """Export every table in one read transaction and write the manifest; returns the manifest."""
+    os.makedirs(directory, exist_ok=True)
+    manifest = {'format_version': FORMAT_VERSION, 'created_at': datetime.utcnow().isoformat(), 'tables': {}}
+    with snapshot(engine) as conn:
+        for name in TABLES:
+            entry = manifest['tables'][name] = export_table(conn, name, directory, batch_size)
+            echo(f"{name}: {entry['rows']} rows exported")
+    with open(os.path.join(directory, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_chunks(path, columns, datetime_columns, chunk_size):
+    """Decode a .jsonl.gz file into lists of row dicts."""
+    chunk = []
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            row = dict(zip(columns, json.loads(line)))
+            for column in datetime_columns:
+                if row.get(column) is not None:
+                    row[column] = datetime.fromisoformat(row[column])
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def prefetch(iterable, depth=2):
+    """Run an iterator in a background thread so decoding overlaps inserts.
+
+    The thread stops, closing the iterator, as soon as the consumer does.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    done = object()
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except Exception as e:
+            put(e)
+            return
+        finally:
+            close = getattr(iterable, 'close', None)
+            if close is not None:
+                close()
+        put(done)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+@contextmanager
+def constraint_checks_disabled(conn):
+    """Turn off per-row foreign key/unique checks on a connection."""
+    statements = CONSTRAINT_CHECKS.get(conn.dialect.name)
+    if statements:
+        conn.execute(text(statements[0]))
+        conn.commit()
+    try:
+        yield conn
+    finally:
+        if statements:
+            conn.rollback()
+            conn.execute(text(statements[1]))
+            conn.commit()
+
+
+def restore_table(conn, name, directory, entry, chunk_size):
+    """Insert the rows of one exported table in chunks."""
+    table = _table(name)
+    datetime_columns = [column.name for column in table.columns
+                        if isinstance(column.type, db.DateTime) and column.name in entry['columns']]
+    chunks = read_chunks(os.path.join(directory, entry['file']), entry['columns'], datetime_columns, chunk_size)
+    rows = 0
+    for chunk in prefetch(chunks):
+        conn.execute(table.insert(), chunk)
+        rows += len(chunk)
+    return rows
+
+
+def foreign_key_violations(conn):
+    """Return the (table, referenced table) pairs having rows whose foreign key points nowhere."""
+    if conn.dialect.name == 'sqlite':
+        return sorted({(row[0], row[2]) for row in conn.exec_driver_sql('PRAGMA foreign_key_check')})
+    violations = []
+    for name in TABLES:
+        table = _table(name)
+        for constraint in table.foreign_key_constraints:
+            referenced = exists().where(*(element.column == element.parent for element in constraint.elements))
+            if conn.execute(select(func.count()).select_from(table).where(~referenced)).scalar():
+                violations.append((name, constraint.referred_table.name))
+    return violations
+
+
+def restore_dataset(engine, directory, chunk_size=10000, replace=False, echo=click.echo):
+    """Restore an export in one transaction.
+
+    With replace, the existing rows are deleted in the same transaction.
+    Tables load level by level with per-row checks off, then every foreign
+    key is checked before the commit.
+    """
+    with open(os.path.join(directory, MANIFEST), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise click.ClickException(f"Unsupported export format {manifest.get('format_version')}")
+
+    with engine.connect() as conn, constraint_checks_disabled(conn):
+        non_empty = [name for name in TABLES
+                     if conn.execute(select(func.count()).select_from(_table(name))).scalar()]
+        if non_empty and not replace:
+            raise click.ClickException(f"Tables are not empty: {', '.join(non_empty)} (use --replace)")
+        for name in reversed(TABLES):
+            conn.execute(_table(name).delete())
+
+        for level in RESTORE_LEVELS:
+            for name in level:
+                if name not in manifest['tables']:
+                    continue
+                started = time.perf_counter()
+                rows = restore_table(conn, name, directory, manifest['tables'][name], chunk_size)
+                expected = manifest['tables'][name]['rows']
+                if rows != expected:
+                    raise click.ClickException(f"{name}: restored {rows} rows, expected {expected}")
+                echo(f"{name}: {rows} rows restored ({time.perf_counter() - started:.1f}s)")
+
+        violations = foreign_key_violations(conn)
+        if violations:
+            details = ', '.join(f"{table} -> {referenced}" for table, referenced in violations)
+            raise click.ClickException(f"Foreign key violations, nothing restored: {details}")
+        conn.commit()
+    return manifest
+
+
+@data_cli.command('export')
+@click.argument('directory', type=click.Path(file_okay=False))
+@click.option('--batch-size', default=10000, show_default=True, help='Rows fetched per cursor batch.')
+def export_command(directory, batch_size):
+    """Export all tables, as of one snapshot, to compressed JSONL files in DIRECTORY."""
+    export_dataset(db.engine, directory, batch_size=batch_size)
+    click.echo(f"Export written to {directory}")
+
+
+@data_cli.command('import')
+@click.argument('directory', type=click.Path(exists=True, file_okay=False))
+@click.option('--chunk-size', default=10000, show_default=True, help='Rows inserted per statement.')
+@click.option('--replace', is_flag=True, help='Delete existing rows, in the same transaction as the restore.')
+def import_command(directory, chunk_size, replace):
+    """Restore an export created by 'flask data export'."""
+    restore_dataset(db.engine, directory, chunk_size=chunk_size, replace=replace)
+    click.echo("Restore complete")
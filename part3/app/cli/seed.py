@@ -0,0 +1,209 @@
+import bisect
+import hashlib
+import itertools
+import math
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import insert
+from app import db, bcrypt
+
+# Preset volumes used as scale-test fixtures
+SCALES = {
+    'tiny': {'users': 100, 'amenities': 20, 'places': 200, 'reviews': 1000},
+    'small': {'users': 1000, 'amenities': 40, 'places': 5000, 'reviews': 20000},
+    'medium': {'users': 10000, 'amenities': 60, 'places': 100000, 'reviews': 1000000},
+    'large': {'users': 100000, 'amenities': 80, 'places': 1000000, 'reviews': 10000000},
+}
+
+FIRST_NAMES = ['Alice', 'Bob', 'Chloé', 'David', 'Emma', 'Farid', 'Giulia', 'Hugo', 'Inès', 'Jules',
+               'Kenji', 'Léa', 'Mateo', 'Nora', 'Omar', 'Paul', 'Quentin', 'Rosa', 'Sami', 'Zoé']
+LAST_NAMES = ['Martin', 'Bernard', 'Dubois', 'Garcia', 'Nguyen', 'Rossi', 'Smith', 'Tanaka',
+              'Moreau', 'Laurent', 'Fournier', 'Lopez', 'Muller', 'Kowalski', 'Silva']
+ADJECTIVES = ['Cozy', 'Sunny', 'Quiet', 'Modern', 'Rustic', 'Spacious', 'Charming', 'Bright', 'Hidden', 'Luxury']
+KINDS = ['loft', 'studio', 'cabin', 'villa', 'apartment', 'cottage', 'townhouse', 'chalet', 'room', 'houseboat']
+FEATURES = ['sea view', 'garden', 'balcony', 'fireplace', 'terrace', 'rooftop', 'city center', 'mountain view',
+            'near the beach', 'close to transport', 'quiet street', 'historic building']
+REVIEW_WORDS = ['great', 'clean', 'noisy', 'friendly', 'host', 'location', 'comfortable', 'bed', 'small',
+                'view', 'recommend', 'stay', 'again', 'perfect', 'dirty', 'spacious', 'kitchen', 'cold']
+AMENITY_NAMES = ['Wi-Fi', 'Pool', 'Air conditioning', 'Kitchen', 'Parking', 'Washer', 'Dryer', 'Heating',
+                 'TV', 'Workspace', 'Hot tub', 'Gym', 'Breakfast', 'Fireplace', 'Elevator', 'Crib']
+RATING_WEIGHTS = [5, 8, 15, 35, 37]
+EPOCH = datetime(2022, 1, 1)
+
+
+def zipf_weights(n, exponent=1.1):
+    """Power-law weights for ranks 1..n."""
+    return [1.0 / (rank ** exponent) for rank in range(1, n + 1)]
+
+
+class SyntheticDataGenerator:
+    """Deterministic, seeded generator of production-like HBnB data.
+
+    Every value is derived from the seed, so two runs with the same seed and
+    volumes produce identical rows (password hashes excepted, bcrypt salts
+    are random). Rows are generated lazily and inserted in chunks.
+    """
+
+    def __init__(self, users, amenities, places, reviews, seed=42, clusters=50, password='password'):
+        self.counts = {'users': users, 'amenities': amenities, 'places': places, 'reviews': reviews}
+        self.seed = seed
+        self.clusters = clusters
+        self.password = password
+
+    @classmethod
+    def from_scale(cls, scale, **kwargs):
+        """Build a generator from one of the SCALES presets."""
+        return cls(**SCALES[scale], **kwargs)
+
+    def make_id(self, kind, index):
+        """Stable UUID for the index-th row of a kind."""
+        digest = hashlib.blake2b(f"{self.seed}:{kind}:{index}".encode(), digest_size=16).digest()
+        return str(uuid.UUID(bytes=digest, version=4))
+
+    def _rng(self, kind):
+        return random.Random(f"{self.seed}:{kind}")
+
+    def _timestamp(self, rng):
+        return EPOCH + timedelta(seconds=rng.randrange(3 * 365 * 24 * 3600))
+
+    def _owner_indexes(self):
+        """Owner of each place: a few hosts own many places."""
+        rng = self._rng('owners')
+        cum_weights = list(itertools.accumulate(zipf_weights(self.counts['users'], 1.0)))
+        ranks = list(range(self.counts['users']))
+        rng.shuffle(ranks)
+        total = cum_weights[-1]
+        for _ in range(self.counts['places']):
+            yield ranks[bisect.bisect(cum_weights, rng.random() * total)]
+
+    def iter_users(self, password_hash):
+        rng = self._rng('users')
+        for i in range(self.counts['users']):
+            yield {
+                'id': self.make_id('user', i),
+                'first_name': rng.choice(FIRST_NAMES),
+                'last_name': rng.choice(LAST_NAMES),
+                'email': f"user{i}@example.com",
+                'password': password_hash,
+                'is_admin': i == 0,
+                'created_at': self._timestamp(rng),
+            }
+
+    def iter_amenities(self):
+        for i in range(self.counts['amenities']):
+            base = AMENITY_NAMES[i % len(AMENITY_NAMES)]
+            name = base if i < len(AMENITY_NAMES) else f"{base} {i // len(AMENITY_NAMES) + 1}"
+            yield {'id': self.make_id('amenity', i), 'name': name}
+
+    def iter_places(self):
+        rng = self._rng('places')
+        centers = [(rng.uniform(-55, 65), rng.uniform(-170, 170), rng.uniform(0.02, 0.5))
+                   for _ in range(self.clusters)]
+        cluster_weights = list(itertools.accumulate(zipf_weights(self.clusters, 0.8)))
+        for i, owner in zip(range(self.counts['places']), self._owner_indexes()):
+            lat, lng, spread = centers[bisect.bisect(cluster_weights, rng.random() * cluster_weights[-1])]
+            yield {
+                'id': self.make_id('place', i),
+                'title': f"{rng.choice(ADJECTIVES)} {rng.choice(KINDS)} with {rng.choice(FEATURES)}",
+                'description': ', '.join(rng.sample(FEATURES, rng.randint(1, 4))),
+                'price': round(min(5000.0, rng.lognormvariate(4.4, 0.6)), 2),
+                'latitude': max(-90.0, min(90.0, rng.gauss(lat, spread))),
+                'longitude': max(-180.0, min(180.0, rng.gauss(lng, spread))),
+                'owner_id': self.make_id('user', owner),
+                'created_at': self._timestamp(rng),
+            }
+
+    def iter_place_amenities(self):
+        """Amenity popularity follows a power law (Wi-Fi everywhere, hot tubs rare)."""
+        rng = self._rng('place_amenity')
+        n = self.counts['amenities']
+        if not n:
+            return
+        cum_weights = list(itertools.accumulate(zipf_weights(n, 1.2)))
+        for i in range(self.counts['places']):
+            chosen = {bisect.bisect(cum_weights, rng.random() * cum_weights[-1])
+                      for _ in range(rng.randint(0, min(n, 12)))}
+            place_id = self.make_id('place', i)
+            for amenity in sorted(chosen):
+                yield {'place_id': place_id, 'amenity_id': self.make_id('amenity', amenity)}
+
+    def iter_reviews(self):
+        """Review counts per place follow a power law; (place, user) pairs are unique."""
+        rng = self._rng('reviews')
+        n_places, n_users = self.counts['places'], self.counts['users']
+        if not n_places or n_users < 2:
+            return
+        weights = zipf_weights(n_places, 0.9)
+        rng.shuffle(weights)
+        scale = self.counts['reviews'] / math.fsum(weights)
+        owners = self._owner_indexes()
+        index = 0
+        for place, owner in zip(range(n_places), owners):
+            expected = weights[place] * scale
+            count = min(n_users - 1, int(expected) + (rng.random() < expected % 1))
+            place_id = self.make_id('place', place)
+            for user in rng.sample(range(n_users), count + 1):
+                if user == owner or count == 0:
+                    continue
+                count -= 1
+                yield {
+                    'id': self.make_id('review', index),
+                    'text': ' '.join(rng.choices(REVIEW_WORDS, k=rng.randint(3, 20))).capitalize() + '.',
+                    'rating': rng.choices(range(1, 6), RATING_WEIGHTS)[0],
+                    'place_id': place_id,
+                    'user_id': self.make_id('user', user),
+                    'created_at': self._timestamp(rng),
+                }
+                index += 1
+
+    def generate(self, engine, chunk_size=10000, echo=None):
+        """Bulk insert every table into `engine`; returns the row count per table."""
+        from app.models import User, Amenity, Place, Review, place_amenity
+
+        password_hash = bcrypt.generate_password_hash(self.password).decode('utf-8')
+        sources = [
+            ('users', User.__table__, self.iter_users(password_hash)),
+            ('amenities', Amenity.__table__, self.iter_amenities()),
+            ('places', Place.__table__, self.iter_places()),
+            ('place_amenity', place_amenity, self.iter_place_amenities()),
+            ('reviews', Review.__table__, self.iter_reviews()),
+        ]
+        inserted = {}
+        for name, table, rows in sources:
+            started = time.perf_counter()
+            total = 0
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+                with engine.begin() as conn:
+                    conn.execute(insert(table), chunk)
+                total += len(chunk)
+            inserted[name] = total
+            if echo:
+                echo(f"{name}: {total} rows in {time.perf_counter() - started:.1f}s")
+        return inserted
+
+
+@click.command('seed')
+@click.option('--scale', type=click.Choice(list(SCALES)), default='tiny', show_default=True,
+              help='Preset volumes; individual counts below override it.')
+@click.option('--users', type=int, help='Number of users.')
+@click.option('--amenities', type=int, help='Number of amenities.')
+@click.option('--places', type=int, help='Number of places.')
+@click.option('--reviews', type=int, help='Approximate number of reviews.')
+@click.option('--seed', default=42, show_default=True, help='Random seed.')
+@click.option('--chunk-size', default=10000, show_default=True, help='Rows inserted per transaction.')
+@with_appcontext
+def seed_command(scale, users, amenities, places, reviews, seed, chunk_size):
+    """Fill the configured database with deterministic synthetic data."""
+    counts = dict(SCALES[scale])
+    overrides = {'users': users, 'amenities': amenities, 'places': places, 'reviews': reviews}
+    counts.update({key: value for key, value in overrides.items() if value is not None})
+    generator = SyntheticDataGenerator(seed=seed, **counts)
+    generator.generate(db.engine, chunk_size=chunk_size, echo=click.echo)
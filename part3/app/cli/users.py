@@ -0,0 +1,194 @@
+import csv
+import hashlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import bcrypt as bcrypt_lib
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import insert, select
+from app import db
+from app.models.user import User
+
+users_cli = AppGroup('users', help='User maintenance commands.')
+
+# SQLite accepts at most 32766 bound parameters per statement
+EMAIL_LOOKUP_BATCH = 500
+BOOLEAN_TRUE = {'1', 'true', 'yes', 'y'}
+
+
+def _hash_password(job):
+    """Hash one password the same way flask_bcrypt does (runs in a worker process)."""
+    password, rounds, prefix, handle_long = job
+    password = password.encode('utf-8')
+    if handle_long:
+        password = hashlib.sha256(password).hexdigest().encode('utf-8')
+    salt = bcrypt_lib.gensalt(rounds=rounds, prefix=prefix.encode('utf-8'))
+    return bcrypt_lib.hashpw(password, salt).decode('utf-8')
+
+
+def iter_records(stream, fmt):
+    """Yield (line number, record) pairs from a CSV or JSONL stream.
+
+    A JSONL line that does not parse yields its ValueError instead of a
+    record, so one bad line is rejected without stopping the import.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+    else:
+        for line_num, line in enumerate(stream, start=1):
+            if line.strip():
+                try:
+                    yield line_num, json.loads(line)
+                except ValueError as e:
+                    yield line_num, ValueError(f"Invalid JSON: {e}")
+
+
+def iter_chunks(iterable, size):
+    """Group an iterable into lists of at most `size` items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_record(record):
+    """Validate a record with the User model validators and return clean fields."""
+    if not isinstance(record, dict):
+        raise TypeError("Record must be a JSON object")
+    for field in ('first_name', 'last_name', 'email', 'password'):
+        if record.get(field) is not None and not isinstance(record[field], str):
+            raise TypeError(f"{field} must be a string")
+    password = record.get('password')
+    if not password:
+        raise ValueError("Password is required")
+    fields = {
+        'first_name': record.get('first_name'),
+        'last_name': record.get('last_name'),
+        'email': (record.get('email') or '').strip(),
+    }
+    # Building a transient User runs every @validates hook
+    User(**fields)
+    is_admin = record.get('is_admin', False)
+    if isinstance(is_admin, str):
+        is_admin = is_admin.strip().lower() in BOOLEAN_TRUE
+    fields['is_admin'] = bool(is_admin)
+    fields['password'] = password
+    return fields
+
+
+def existing_emails(emails):
+    """Return the subset of `emails` already stored, using batched IN queries."""
+    found = set()
+    emails = list(emails)
+    for start in range(0, len(emails), EMAIL_LOOKUP_BATCH):
+        batch = emails[start:start + EMAIL_LOOKUP_BATCH]
+        found.update(db.session.execute(
+            select(User.email).where(User.email.in_(batch))
+        ).scalars())
+    return found
+
+
+class UserImporter:
+    """Stream users into the users table in chunks."""
+
+    def __init__(self, chunk_size=1000, workers=None, prehashed=False, echo=click.echo):
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.prehashed = prehashed
+        self.echo = echo
+        self.imported = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self._seen = set()
+        config = current_app.config
+        self._hash_settings = (
+            config.get('BCRYPT_LOG_ROUNDS', 12),
+            config.get('BCRYPT_HASH_PREFIX', '2b'),
+            config.get('BCRYPT_HANDLE_LONG_PASSWORDS', False),
+        )
+
+    def run(self, records):
+        """Import every record and return the number of inserted users."""
+        started = time.perf_counter()
+        executor = None
+        if not self.prehashed and (self.workers is None or self.workers > 1):
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            for chunk in iter_chunks(records, self.chunk_size):
+                self._import_chunk(chunk, executor)
+                elapsed = time.perf_counter() - started
+                self.echo(
+                    f"{self.imported} imported, {self.duplicates} duplicates, "
+                    f"{self.rejected} rejected ({self.imported / elapsed:.0f} users/s)"
+                )
+        finally:
+            if executor:
+                executor.shutdown()
+        return self.imported
+
+    def _import_chunk(self, chunk, executor):
+        rows = []
+        for line_num, record in chunk:
+            try:
+                if isinstance(record, ValueError):
+                    raise record
+                row = validate_record(record)
+            except (ValueError, TypeError) as e:
+                self.rejected += 1
+                self.echo(f"line {line_num}: {e}", err=True)
+                continue
+            if row['email'] in self._seen:
+                self.duplicates += 1
+                continue
+            self._seen.add(row['email'])
+            rows.append(row)
+
+        stored = existing_emails(row['email'] for row in rows)
+        if stored:
+            self.duplicates += len(stored)
+            rows = [row for row in rows if row['email'] not in stored]
+        if not rows:
+            return
+
+        if not self.prehashed:
+            jobs = [(row['password'],) + self._hash_settings for row in rows]
+            if executor:
+                hashes = executor.map(_hash_password, jobs, chunksize=max(1, len(jobs) // 32))
+            else:
+                hashes = map(_hash_password, jobs)
+            for row, password_hash in zip(rows, hashes):
+                row['password'] = password_hash
+
+        db.session.execute(insert(User), rows)
+        db.session.commit()
+        self.imported += len(rows)
+
+
+@users_cli.command('import')
+@click.argument('source', type=click.File('r', encoding='utf-8'))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']),
+              help='Input format (guessed from the file extension by default).')
+@click.option('--chunk-size', default=1000, show_default=True,
+              help='Number of users inserted per transaction.')
+@click.option('--workers', type=int, default=None,
+              help='Password hashing processes (defaults to the CPU count).')
+@click.option('--prehashed', is_flag=True,
+              help='Passwords are already bcrypt hashes and are stored as is.')
+def import_users(source, fmt, chunk_size, workers, prehashed):
+    """Bulk import users from a CSV or JSONL file ('-' for stdin)."""
+    if fmt is None:
+        fmt = 'jsonl' if source.name.endswith(('.jsonl', '.ndjson')) else 'csv'
+    importer = UserImporter(chunk_size=chunk_size, workers=workers, prehashed=prehashed)
+    importer.run(iter_records(source, fmt))
+    click.echo(
+        f"Done: {importer.imported} imported, {importer.duplicates} duplicates, "
+        f"{importer.rejected} rejected"
+    )
@@ -0,0 +1,241 @@
+"""In-process metrics exposed in the Prometheus text format on /metrics.
+
+Every metric keeps its samples in a dict guarded by its own lock, so
+updates are safe under threaded servers and cost one dict lookup. Each
+worker process exposes its own counters.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, request
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """Yield (suffix, labels, value) tuples."""
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in sorted(items):
+            yield '', _format_labels(self.labelnames, key), value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{self.name}{suffix}{labels} {float(value)!r}" for suffix, labels, value in self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the wrapped block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels):
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def samples(self):
+        with self._lock:
+            items = [(key, ([*state[0]], state[1], state[2])) for key, state in self._values.items()]
+        for key, (counts, total, count) in sorted(items):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield '_bucket', _format_labels(self.labelnames, key, [('le', repr(float(bound)))]), cumulative
+            yield '_bucket', _format_labels(self.labelnames, key, [('le', '+Inf')]), count
+            yield '_sum', _format_labels(self.labelnames, key), total
+            yield '_count', _format_labels(self.labelnames, key), count
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    'hbnb_http_requests_total', 'HTTP requests by route, method and status code.',
+    ('method', 'route', 'status'))
+http_request_duration = registry.histogram(
+    'hbnb_http_request_duration_seconds', 'HTTP request latency by route and method.',
+    ('method', 'route'))
+http_in_flight = registry.gauge(
+    'hbnb_http_requests_in_flight', 'HTTP requests currently being served.')
+# Measured from checkout to checkin: how long a connection is held, not the wait to get one
+db_connection_hold_duration = registry.histogram(
+    'hbnb_db_pool_connection_hold_seconds', 'Time a pooled database connection stays checked out.',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+db_checkouts_active = registry.gauge(
+    'hbnb_db_pool_checked_out_connections', 'Database connections currently checked out of the pool.')
+bcrypt_duration = registry.histogram(
+    'hbnb_bcrypt_duration_seconds', 'Time spent hashing or verifying passwords.',
+    ('operation',), buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0))
+cache_requests = registry.counter(
+    'hbnb_cache_requests_total', 'Cache lookups by cache name and result (hit or miss).',
+    ('cache', 'result'))
+
+
+def record_cache(cache, hit):
+    """Count one lookup of an in-process cache."""
+    cache_requests.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def _route():
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+
+def _before_request():
+    g._metrics_started = time.perf_counter()
+    g._metrics_in_flight = True
+    http_in_flight.inc()
+
+
+def _after_request(response):
+    started = g.pop('_metrics_started', None)
+    if started is not None:
+        route = _route()
+        http_request_duration.observe(time.perf_counter() - started, method=request.method, route=route)
+        http_requests.inc(method=request.method, route=route, status=response.status_code)
+    return response
+
+
+def _teardown_request(exc):
+    if g.pop('_metrics_in_flight', False):
+        http_in_flight.dec()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    connection_record.info['_metrics_checkout'] = time.perf_counter()
+    db_checkouts_active.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    started = connection_record.info.pop('_metrics_checkout', None)
+    if started is not None:
+        db_connection_hold_duration.observe(time.perf_counter() - started)
+        db_checkouts_active.dec()
+
+
+def metrics_view():
+    return Response(registry.render(), mimetype=CONTENT_TYPE)
+
+
+def init_app(app, db):
+    """Install request hooks, pool listeners and the /metrics endpoint."""
+    from sqlalchemy import event
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+    with app.app_context():
+        for engine in db.engines.values():
+            if not event.contains(engine.pool, 'checkout', _on_checkout):
+                event.listen(engine.pool, 'checkout', _on_checkout)
+                event.listen(engine.pool, 'checkin', _on_checkin)
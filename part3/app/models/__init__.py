@@ -6,3 +6,4 @@ from .place import Place
 from .place_amenity import place_amenity
 from .review import Review
 from .amenity import Amenity
+from .revoked_token import RevokedToken
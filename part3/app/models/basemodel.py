@@ -1,14 +1,16 @@
 from app import db
-import uuid
 from datetime import datetime
 from sqlalchemy.sql import func
+from .types import GUID, new_id
+from app.persistence import unit_of_work
 
 class BaseModel(db.Model):
 
     __abstract__ = True 
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = db.Column(db.DateTime, default=func.now())
+    id = db.Column(GUID(), primary_key=True, default=new_id)
+    # Set in Python so every row stores the same microsecond format (keyset cursors compare it)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=func.now(), onupdate=func.now())
 
 
@@ -16,7 +18,7 @@ class BaseModel(db.Model):
         """Update the updated_at timestamp and commit changes to the database"""
         self.updated_at = func.now()
         db.session.add(self)
-        db.session.commit()
+        unit_of_work.commit()
 
     def update(self, data):
         """Update the attributes of the object based on the provided dictionary"""
@@ -1,19 +1,27 @@
 from app import db
 from .basemodel import BaseModel
+from .types import GUID
 from app.models.review import Review
 from app.models.amenity import Amenity
 from sqlalchemy.orm import validates
 from sqlalchemy.orm import relationship
+from app.tracing import traced
 
 class Place(BaseModel):
     __tablename__ = 'places'
+    __table_args__ = (
+        db.CheckConstraint('price >= 0', name='ck_places_price'),
+        db.CheckConstraint('latitude BETWEEN -90 AND 90', name='ck_places_latitude'),
+        db.CheckConstraint('longitude BETWEEN -180 AND 180', name='ck_places_longitude'),
+    )
 
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=True)
-    price = db.Column(db.Float, nullable=False)
-    latitude = db.Column(db.Float, nullable=False)
+    # Access paths of the place search planner
+    price = db.Column(db.Float, nullable=False, index=True)
+    latitude = db.Column(db.Float, nullable=False, index=True)
     longitude = db.Column(db.Float, nullable=False)
-    owner_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete="CASCADE"), nullable=False)
+    owner_id = db.Column(GUID(), db.ForeignKey('users.id', ondelete="CASCADE"), nullable=False, index=True)
 
     owner = db.relationship("User", backref="places")
     amenities = db.relationship("Amenity", secondary="place_amenity", backref="places")
@@ -89,6 +97,7 @@ class Place(BaseModel):
             'owner_id': self.owner_id
         }
 
+    @traced('Place.to_dict_list')
     def to_dict_list(self):
         """Convert Place object including owner, amenities, and reviews."""
         return {
@@ -1,6 +1,9 @@
 from app import db
+from .types import GUID
 
 place_amenity = db.Table('place_amenity',
-    db.Column('place_id', db.String(36), db.ForeignKey('places.id', ondelete="CASCADE"), primary_key=True),
-    db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id', ondelete="CASCADE"), primary_key=True)
+    db.Column('place_id', GUID(), db.ForeignKey('places.id', ondelete="CASCADE"), primary_key=True),
+    db.Column('amenity_id', GUID(), db.ForeignKey('amenities.id', ondelete="CASCADE"), primary_key=True),
+    # The primary key covers lookups by place_id; this one serves amenity -> places
+    db.Index('ix_place_amenity_amenity_id', 'amenity_id')
 )
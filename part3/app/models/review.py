@@ -1,14 +1,22 @@
 from app import db
 from .basemodel import BaseModel
+from .types import GUID
 from sqlalchemy.orm import validates
 
 class Review(BaseModel):
     __tablename__ = 'reviews'
+    __table_args__ = (
+        # Also serves lookups by place_id alone (leftmost column)
+        db.UniqueConstraint('place_id', 'user_id', name='uq_reviews_place_user'),
+        db.CheckConstraint('rating BETWEEN 1 AND 5', name='ck_reviews_rating'),
+        # Rating filters within a place
+        db.Index('ix_reviews_place_id_rating', 'place_id', 'rating'),
+    )
 
     text = db.Column(db.Text, nullable=False)
     rating = db.Column(db.Integer, nullable=False)
-    place_id = db.Column(db.String(36), db.ForeignKey('places.id', ondelete="CASCADE"), nullable=False)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete="CASCADE"), nullable=False)
+    place_id = db.Column(GUID(), db.ForeignKey('places.id', ondelete="CASCADE"), nullable=False)
+    user_id = db.Column(GUID(), db.ForeignKey('users.id', ondelete="CASCADE"), nullable=False, index=True)
 
     place = db.relationship("Place", back_populates="reviews")
     user = db.relationship("User", backref="reviews")
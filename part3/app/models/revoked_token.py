@@ -0,0 +1,20 @@
+from app import db
+from .basemodel import BaseModel
+
+class RevokedToken(BaseModel):
+    __tablename__ = 'revoked_tokens'
+
+    jti = db.Column(db.String(36), nullable=False, unique=True)
+    token_type = db.Column(db.String(10), nullable=False)
+    user_id = db.Column(db.String(36), nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def to_dict(self):
+        """Convert RevokedToken object to dictionary."""
+        return {
+            'id': self.id,
+            'jti': self.jti,
+            'token_type': self.token_type,
+            'user_id': self.user_id,
+            'expires_at': self.expires_at.isoformat()
+        }
@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+import uuid
+from sqlalchemy.types import LargeBinary, String, TypeDecorator
+
+# Column types are fixed when the models are imported, before any app config
+# is loaded, hence an environment variable: 'string' (default) or 'binary'.
+# Migrations create string ids; binary ids are for databases created with
+# db.create_all().
+ID_STORAGES = ('string', 'binary')
+ID_STORAGE = os.getenv('HBNB_ID_STORAGE', 'string')
+if ID_STORAGE not in ID_STORAGES:
+    raise ValueError(f"HBNB_ID_STORAGE must be one of {', '.join(ID_STORAGES)}, not {ID_STORAGE!r}")
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7():
+    """Return a time-ordered UUID version 7 (RFC 9562).
+
+    The first 48 bits hold the Unix time in milliseconds; the 12 bits of
+    rand_a are used as a counter seeded randomly each millisecond, so ids
+    generated by this process are strictly increasing.
+    """
+    global _last_ms, _counter
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms <= _last_ms:
+            ms = _last_ms
+            _counter += 1
+            if _counter > 0xFFF:
+                ms += 1
+                _counter = int.from_bytes(os.urandom(2), 'big') & 0x7FF
+        else:
+            _counter = int.from_bytes(os.urandom(2), 'big') & 0x7FF
+        _last_ms = ms
+        counter = _counter
+    rand_b = int.from_bytes(os.urandom(8), 'big') & ((1 << 62) - 1)
+    return uuid.UUID(int=(ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | rand_b)
+
+
+def new_id():
+    """Generate the canonical string form of a new primary key."""
+    return str(uuid7())
+
+
+class GUID(TypeDecorator):
+    """UUID stored as CHAR(36) text or as 16 raw bytes, always exposed as a string.
+
+    Binary storage halves the size of every primary key, foreign key and
+    index entry. With string storage values are passed through unchanged.
+    Strings that are not UUIDs are stored as their UTF-8 bytes so that a
+    lookup by a malformed id simply matches nothing.
+    """
+
+    impl = String(36)
+    cache_ok = True
+
+    def __init__(self, binary=None):
+        super().__init__()
+        self.binary = ID_STORAGE == 'binary' if binary is None else binary
+
+    def load_dialect_impl(self, dialect):
+        return dialect.type_descriptor(LargeBinary(16) if self.binary else String(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not self.binary:
+            return value
+        if isinstance(value, bytes):
+            return value
+        try:
+            return uuid.UUID(str(value)).bytes
+        except ValueError:
+            return str(value).encode('utf-8')
+
+    def process_result_value(self, value, dialect):
+        if value is None or not self.binary:
+            return value
+        value = bytes(value)
+        if len(value) != 16:
+            return value.decode('utf-8')
+        return str(uuid.UUID(bytes=value))
+
+    def process_literal_param(self, value, dialect):
+        return value if value is None else str(value)
+
+    @property
+    def python_type(self):
+        return str
@@ -1,5 +1,5 @@
 from app import db, bcrypt
-from app import db, bcrypt
+from app.metrics import bcrypt_duration
 from .basemodel import BaseModel
 import re
 from sqlalchemy.orm import validates
@@ -17,7 +17,8 @@ class User(BaseModel):
     def verify_password(self, password):
         """Verify if the given password matches the stored hash."""
         """Verifies if the provided password matches the hashed password."""
-        return bcrypt.check_password_hash(self.password, password)
+        with bcrypt_duration.time(operation='verify'):
+            return bcrypt.check_password_hash(self.password, password)
 
     @validates('email')
     def validate_email(self, key, email):
@@ -38,7 +39,8 @@ class User(BaseModel):
         return value
     def hash_password(self, password):
         """Hashes the password before storing it."""
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        with bcrypt_duration.time(operation='hash'):
+            self.password = bcrypt.generate_password_hash(password).decode('utf-8')
 
     @validates('email')
     def validate_email(self, key, email):
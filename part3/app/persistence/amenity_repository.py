@@ -1,3 +1,4 @@
+from sqlalchemy import or_
 from app.persistence.repository import SQLAlchemyRepository
 from app.models.amenity import Amenity
 
@@ -10,3 +11,14 @@ class AmenityRepository(SQLAlchemyRepository):
     def get_amenity_by_name(self, name):
         """Retrieve an amenity by its name."""
         return self.model.query.filter_by(name=name).first()
+
+    def get_amenities_by_id_or_name(self, keys):
+        """Retrieve the amenities whose id or name is one of the given keys."""
+        return self.model.query.filter(
+            or_(self.model.id.in_(keys), self.model.name.in_(keys))
+        ).all()
+
+    def get_existing_ids(self, amenity_ids):
+        """Return the subset of the given ids that belong to an amenity."""
+        return {amenity_id for amenity_id, in self.model.query.with_entities(self.model.id)
+                .filter(self.model.id.in_(list(amenity_ids)))}
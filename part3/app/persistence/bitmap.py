@@ -0,0 +1,399 @@
+import threading
+import time
+from sqlalchemy import event, inspect, select
+
+# Roaring uses 4096 with 2-byte array entries; a Python set costs far more
+# per value, so chunks switch to an 8 KiB bitset much earlier.
+ARRAY_MAX = 256
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+
+def _bits(values):
+    """Pack integers below 65536 into a Python int used as a bitset."""
+    buffer = bytearray(1 << (CHUNK_BITS - 3))
+    for value in values:
+        buffer[value >> 3] |= 1 << (value & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def _unpack(word):
+    """Return the positions of the set bits of a Python int, in increasing order."""
+    positions = []
+    if word.bit_count() <= 32:
+        while word:
+            low = word & -word
+            positions.append(low.bit_length() - 1)
+            word ^= low
+        return positions
+    digits = bin(word)[:1:-1]
+    position = digits.find('1')
+    while position >= 0:
+        positions.append(position)
+        position = digits.find('1', position + 1)
+    return positions
+
+
+class RoaringBitmap:
+    """Compressed set of non-negative integers, in the style of Roaring bitmaps.
+
+    Values are split by their high 16 bits into chunks. A sparse chunk is
+    kept as a set of its low 16 bits (the "array container"); once it holds
+    more than ARRAY_MAX values it becomes a 65536-bit bitset stored in a
+    Python int, so AND/OR between dense chunks run as single big-integer
+    operations in C.
+    """
+
+    __slots__ = ('_chunks',)
+
+    def __init__(self, values=()):
+        chunks = {}
+        for value in values:
+            chunks.setdefault(value >> CHUNK_BITS, set()).add(value & CHUNK_MASK)
+        self._chunks = {key: _bits(lows) if len(lows) > ARRAY_MAX else lows
+                        for key, lows in chunks.items()}
+
+    @classmethod
+    def _from_chunks(cls, chunks):
+        bitmap = cls()
+        bitmap._chunks = chunks
+        return bitmap
+
+    def add(self, value):
+        key, low = value >> CHUNK_BITS, value & CHUNK_MASK
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            self._chunks[key] = {low}
+        elif isinstance(chunk, set):
+            chunk.add(low)
+            if len(chunk) > ARRAY_MAX:
+                self._chunks[key] = _bits(chunk)
+        else:
+            self._chunks[key] = chunk | (1 << low)
+
+    def discard(self, value):
+        key, low = value >> CHUNK_BITS, value & CHUNK_MASK
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            return
+        if isinstance(chunk, set):
+            chunk.discard(low)
+        else:
+            chunk &= ~(1 << low)
+            if chunk.bit_count() <= ARRAY_MAX:
+                chunk = set(_unpack(chunk))
+            self._chunks[key] = chunk
+        if not chunk:
+            del self._chunks[key]
+
+    def __contains__(self, value):
+        chunk = self._chunks.get(value >> CHUNK_BITS)
+        if chunk is None:
+            return False
+        low = value & CHUNK_MASK
+        return low in chunk if isinstance(chunk, set) else bool(chunk >> low & 1)
+
+    def __len__(self):
+        return sum(len(chunk) if isinstance(chunk, set) else chunk.bit_count()
+                   for chunk in self._chunks.values())
+
+    def __bool__(self):
+        return bool(self._chunks)
+
+    def __iter__(self):
+        for key in sorted(self._chunks):
+            chunk = self._chunks[key]
+            lows = sorted(chunk) if isinstance(chunk, set) else _unpack(chunk)
+            base = key << CHUNK_BITS
+            for low in lows:
+                yield base | low
+
+    def __eq__(self, other):
+        return isinstance(other, RoaringBitmap) and list(self) == list(other)
+
+    def __repr__(self):
+        return f"RoaringBitmap(<{len(self)} values>)"
+
+    def copy(self):
+        return self._from_chunks({key: set(chunk) if isinstance(chunk, set) else chunk
+                                  for key, chunk in self._chunks.items()})
+
+    def __and__(self, other):
+        chunks = {}
+        small, large = sorted((self._chunks, other._chunks), key=len)
+        for key, left in small.items():
+            right = large.get(key)
+            if right is None:
+                continue
+            if isinstance(left, set) and isinstance(right, set):
+                chunk = left & right
+            elif isinstance(left, set):
+                chunk = {low for low in left if right >> low & 1}
+            elif isinstance(right, set):
+                chunk = {low for low in right if left >> low & 1}
+            else:
+                # Kept as a bitset even when sparse: converting costs more than it saves
+                chunk = left & right
+            if chunk:
+                chunks[key] = chunk
+        return self._from_chunks(chunks)
+
+    def __or__(self, other):
+        chunks = {}
+        for key in self._chunks.keys() | other._chunks.keys():
+            left, right = self._chunks.get(key), other._chunks.get(key)
+            if left is None or right is None:
+                chunk = left if right is None else right
+                chunks[key] = set(chunk) if isinstance(chunk, set) else chunk
+                continue
+            if isinstance(left, set) and isinstance(right, set):
+                chunk = left | right
+                if len(chunk) > ARRAY_MAX:
+                    chunk = _bits(chunk)
+            else:
+                chunk = (_bits(left) if isinstance(left, set) else left) | \
+                        (_bits(right) if isinstance(right, set) else right)
+            chunks[key] = chunk
+        return self._from_chunks(chunks)
+
+
+def parse_amenity_filter(expression):
+    """Parse 'a|b,c' into [['a', 'b'], ['c']]: commas mean AND, '|' means OR."""
+    groups = []
+    for group in expression.split(','):
+        terms = [term.strip() for term in group.split('|') if term.strip()]
+        if not terms:
+            raise ValueError("Empty amenity in filter")
+        groups.append(terms)
+    return groups
+
+
+class AmenityBitmapIndex:
+    """One RoaringBitmap of place row numbers per amenity.
+
+    Places get dense row numbers in the order the index first sees them.
+    The index is loaded from place_amenity on first use and follows the
+    amenity changes committed through the ORM in this process. To pick up
+    writes made by other workers or by bulk SQL (which should also call
+    defer() or the explicit update methods), a background thread reloads it
+    once it is older than AMENITY_BITMAP_REBUILD_INTERVAL seconds, while
+    queries keep using the current bitmaps.
+    """
+
+    def __init__(self):
+        self.rebuild_interval = 60
+        self._app = None
+        self._db = None
+        self._bitmaps = {}
+        self._rows = {}
+        self._place_ids = []
+        self._built_at = None
+        self._rebuilding = False
+        self._replay = None
+        self._lock = threading.RLock()
+
+    def init_app(self, app, db):
+        """Read the rebuild interval and follow ORM commits."""
+        self.rebuild_interval = app.config.get('AMENITY_BITMAP_REBUILD_INTERVAL', self.rebuild_interval)
+        self._app = app
+        self._db = db
+        self.invalidate()
+        if not event.contains(db.session, 'after_flush', self._after_flush):
+            event.listen(db.session, 'after_flush', self._after_flush)
+            event.listen(db.session, 'after_commit', self._after_commit)
+            event.listen(db.session, 'after_soft_rollback', self._after_rollback)
+
+    def invalidate(self):
+        """Drop the index; it is reloaded on next use."""
+        with self._lock:
+            self._bitmaps, self._rows, self._place_ids = {}, {}, []
+            self._built_at = None
+
+    def rebuild(self):
+        """Reload every bitmap from the place_amenity table.
+
+        The new bitmaps are built aside; changes applied while the rows
+        were read are replayed on them before they replace the current ones.
+        """
+        from app.models.place_amenity import place_amenity
+        with self._lock:
+            self._replay = []
+        try:
+            rows = self._db.session.execute(
+                select(place_amenity.c.place_id, place_amenity.c.amenity_id)
+            ).all()
+        except BaseException:
+            with self._lock:
+                self._replay = None
+            raise
+        fresh = AmenityBitmapIndex()
+        fresh._built_at = 0
+        for place_id, amenity_id in rows:
+            fresh._add(place_id, amenity_id)
+        with self._lock:
+            for change, args in self._replay:
+                getattr(fresh, change)(*args)
+            self._bitmaps, self._rows, self._place_ids = fresh._bitmaps, fresh._rows, fresh._place_ids
+            self._built_at = time.monotonic()
+            self._replay = None
+
+    def _rebuild_in_background(self):
+        try:
+            with self._app.app_context():
+                self.rebuild()
+        finally:
+            self._rebuilding = False
+
+    def _ensure_fresh(self):
+        if self._built_at is None:
+            self.rebuild()
+        elif time.monotonic() - self._built_at > self.rebuild_interval and self._app is not None:
+            with self._lock:
+                if self._rebuilding:
+                    return
+                self._rebuilding = True
+            threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+
+    def _record(self, change, *args):
+        """Keep a change for the rebuild in progress, if any, to replay."""
+        if self._replay is not None:
+            self._replay.append((change, args))
+
+    def _row(self, place_id):
+        row = self._rows.get(place_id)
+        if row is None:
+            row = self._rows[place_id] = len(self._place_ids)
+            self._place_ids.append(place_id)
+        return row
+
+    def _add(self, place_id, amenity_id):
+        self._bitmaps.setdefault(amenity_id, RoaringBitmap()).add(self._row(place_id))
+
+    # Explicit maintenance, for writes that bypass the ORM
+
+    def add(self, place_id, amenity_ids):
+        """Record that a place has the given amenities."""
+        with self._lock:
+            self._record('add', place_id, amenity_ids)
+            if self._built_at is not None:
+                for amenity_id in amenity_ids:
+                    self._add(place_id, amenity_id)
+
+    def remove(self, place_id, amenity_ids):
+        """Record that a place lost the given amenities."""
+        with self._lock:
+            self._record('remove', place_id, amenity_ids)
+            row = self._rows.get(place_id)
+            if row is None:
+                return
+            for amenity_id in amenity_ids:
+                bitmap = self._bitmaps.get(amenity_id)
+                if bitmap is not None:
+                    bitmap.discard(row)
+
+    def set_place(self, place_id, amenity_ids):
+        """Replace the amenities of a place (an empty set removes it)."""
+        with self._lock:
+            self._record('set_place', place_id, amenity_ids)
+            if self._built_at is None:
+                return
+            row = self._rows.get(place_id)
+            if row is not None:
+                for bitmap in self._bitmaps.values():
+                    bitmap.discard(row)
+            for amenity_id in amenity_ids:
+                self._add(place_id, amenity_id)
+
+    def defer(self, session, place_id, amenity_ids=None, added=(), removed=()):
+        """Apply an amenity change made with bulk SQL once the session commits.
+
+        amenity_ids replaces the whole set of the place; added and removed
+        adjust it.
+        """
+        pending = session.info.setdefault('amenity_bitmap_pending', {'places': {}, 'amenities': set()})
+        pending.setdefault('bulk', []).append((place_id, amenity_ids, tuple(added), tuple(removed)))
+
+    def remove_amenity(self, amenity_id):
+        """Forget an amenity entirely."""
+        with self._lock:
+            self._record('remove_amenity', amenity_id)
+            self._bitmaps.pop(amenity_id, None)
+
+    # Queries
+
+    def bitmap(self, amenity_id):
+        """Row numbers of the places having an amenity."""
+        self._ensure_fresh()
+        with self._lock:
+            return self._bitmaps.get(amenity_id, RoaringBitmap()).copy()
+
+    def cardinality(self, amenity_id):
+        """Number of places having an amenity."""
+        self._ensure_fresh()
+        with self._lock:
+            bitmap = self._bitmaps.get(amenity_id)
+            return len(bitmap) if bitmap is not None else 0
+
+    def evaluate(self, groups):
+        """Return the ids of the places matching AND-of-OR groups of amenity ids."""
+        self._ensure_fresh()
+        with self._lock:
+            result = None
+            for group in groups:
+                matched = RoaringBitmap()
+                for amenity_id in group:
+                    bitmap = self._bitmaps.get(amenity_id)
+                    if bitmap is not None:
+                        matched = matched | bitmap
+                result = matched if result is None else result & matched
+                if not result:
+                    return []
+            return [self._place_ids[row] for row in result or ()]
+
+    def counts(self, place_ids):
+        """Return {amenity_id: number of the given places having it}, zero counts left out."""
+        self._ensure_fresh()
+        with self._lock:
+            rows = RoaringBitmap(self._rows[place_id] for place_id in place_ids if place_id in self._rows)
+            counts = {}
+            if rows:
+                for amenity_id, bitmap in self._bitmaps.items():
+                    count = len(bitmap & rows)
+                    if count:
+                        counts[amenity_id] = count
+            return counts
+
+    # ORM commits
+
+    def _after_flush(self, session, flush_context):
+        from app.models.amenity import Amenity
+        from app.models.place import Place
+        pending = session.info.setdefault('amenity_bitmap_pending', {'places': {}, 'amenities': set()})
+        for obj in list(session.new) + list(session.dirty):
+            if isinstance(obj, Place) and inspect(obj).attrs.amenities.history.has_changes():
+                pending['places'][obj.id] = {amenity.id for amenity in obj.amenities}
+        for obj in session.deleted:
+            if isinstance(obj, Place):
+                pending['places'][obj.id] = set()
+            elif isinstance(obj, Amenity):
+                pending['amenities'].add(obj.id)
+
+    def _after_commit(self, session):
+        if session.in_nested_transaction():
+            return  # a released savepoint; wait for the enclosing commit
+        pending = session.info.pop('amenity_bitmap_pending', None)
+        if not pending:
+            return
+        for place_id, amenity_ids in pending['places'].items():
+            self.set_place(place_id, amenity_ids)
+        for amenity_id in pending['amenities']:
+            self.remove_amenity(amenity_id)
+        for place_id, amenity_ids, added, removed in pending.get('bulk', ()):
+            if amenity_ids is not None:
+                self.set_place(place_id, amenity_ids)
+            self.add(place_id, added)
+            self.remove(place_id, removed)
+
+    def _after_rollback(self, session, previous_transaction):
+        if not session.in_transaction():
+            session.info.pop('amenity_bitmap_pending', None)
@@ -0,0 +1,361 @@
+import math
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from sqlalchemy import Float, bindparam, event, false, text
+from sqlalchemy.exc import OperationalError
+from app.persistence import unit_of_work
+
+# Same constants as the bm25() function of SQLite FTS5
+BM25_K1 = 1.2
+BM25_B = 0.75
+FTS5_SHADOW_SUFFIXES = ('', '_data', '_idx', '_content', '_docsize', '_config')
+
+_WORD = re.compile(r'[^\W_]+')
+_indexes = []
+
+
+def tokenize(value):
+    """Split text into lowercase words without diacritics, like the FTS5 unicode61 tokenizer."""
+    if not value:
+        return []
+    value = unicodedata.normalize('NFKD', value.lower())
+    value = ''.join(char for char in value if not unicodedata.combining(char))
+    return _WORD.findall(value)
+
+
+def init_app(app, db):
+    """Bind every full-text index declared by the repositories to the app."""
+    for index in _indexes:
+        index.init_app(app, db)
+
+
+def include_name(name, type_, parent_names):
+    """Alembic filter hiding the FTS5 tables, which autogenerate cannot describe."""
+    return not any(index.owns_table(name) for index in _indexes)
+
+
+def match_expression(terms):
+    """Build an FTS5 MATCH expression requiring every term (each one quoted)."""
+    return ' '.join(f'"{term}"' for term in terms)
+
+
+def fts5_available(connection):
+    """Tell whether the SQLite library behind a connection was built with FTS5."""
+    try:
+        connection.execute(text("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)"))
+        connection.execute(text("DROP TABLE temp.fts5_probe"))
+        return True
+    except OperationalError:
+        return False
+
+
+class InvertedIndex:
+    """In-process inverted index ranking documents with the FTS5 flavour of BM25.
+
+    Documents are dicts of column -> text. A query matches the documents
+    containing every term, scores are negative (lower is better) and equal
+    to what bm25() returns for the same corpus and column weights.
+    """
+
+    def __init__(self, columns, weights=None):
+        self.columns = tuple(columns)
+        self.weights = tuple(weights or (1.0,) * len(self.columns))
+        self._postings = defaultdict(dict)
+        self._terms = {}
+        self._lengths = {}
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._lengths
+
+    def add(self, doc_id, values):
+        """Index a document, replacing any previous version."""
+        self.remove(doc_id)
+        length = 0
+        terms = set()
+        for position, column in enumerate(self.columns):
+            tokens = tokenize(values.get(column))
+            length += len(tokens)
+            terms.update(tokens)
+            for token in tokens:
+                counts = self._postings[token].setdefault(doc_id, [0] * len(self.columns))
+                counts[position] += 1
+        self._terms[doc_id] = terms
+        self._lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id):
+        """Drop a document from the index."""
+        if doc_id not in self._lengths:
+            return
+        self._total_length -= self._lengths.pop(doc_id)
+        for token in self._terms.pop(doc_id):
+            postings = self._postings[token]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[token]
+
+    def clear(self):
+        self._postings.clear()
+        self._terms.clear()
+        self._lengths.clear()
+        self._total_length = 0
+
+    def search(self, terms, limit=20, after=None):
+        """Return up to `limit` (doc_id, score) pairs matching every term, best first.
+
+        `after` is the (score, doc_id) of the last result of the previous page;
+        a `limit` of None returns every match.
+        """
+        if not terms or not self._lengths:
+            return []
+        postings = [self._postings.get(term, {}) for term in dict.fromkeys(terms)]
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        n_docs = len(self._lengths)
+        avgdl = self._total_length / n_docs
+        idfs = []
+        for posting in postings:
+            idf = math.log((n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            idfs.append(idf if idf > 0 else 1e-6)
+        results = []
+        for doc_id in candidates:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[doc_id] / avgdl)
+            score = 0.0
+            for idf, posting in zip(idfs, postings):
+                freq = sum(w * n for w, n in zip(self.weights, posting[doc_id]))
+                score += idf * freq * (BM25_K1 + 1) / (freq + norm)
+            results.append((-score, doc_id))
+        if after is not None:
+            results = [result for result in results if result > tuple(after)]
+        results.sort()
+        return [(doc_id, score) for score, doc_id in results[:limit]]
+
+
+class FullTextIndex:
+    """Full-text index over text columns of a model.
+
+    On SQLite the index is an external-content FTS5 table named
+    <table>_fts, created next to the model table (create_all or migration)
+    and kept in sync by triggers, so bulk loads and deletes are covered.
+    Other databases, or SQLite builds without FTS5, fall back to an
+    InvertedIndex loaded lazily from the table and updated on commit.
+
+    SQLite may renumber rowids on VACUUM: call rebuild() afterwards. A
+    batch migration that recreates the table drops the triggers: call
+    create() again at the end of it.
+    """
+
+    def __init__(self, model, columns, weights=None):
+        self.model = model
+        self.table = model.__table__
+        self.columns = tuple(columns)
+        self.weights = tuple(weights or (1.0,) * len(self.columns))
+        self.fts_table = f"{self.table.name}_fts"
+        # Each index keeps its own pending changes in session.info
+        self._pending_key = f"fulltext_pending:{self.fts_table}"
+        self._db = None
+        self._backend = None
+        self._fallback = InvertedIndex(self.columns, self.weights)
+        self._loaded = False
+        self._lock = threading.Lock()
+        event.listen(self.table, 'after_create', self._after_create)
+        event.listen(self.table, 'before_drop', self._before_drop)
+        _indexes.append(self)
+
+    def init_app(self, app, db):
+        """Bind the index to the app database and track commits for the fallback."""
+        self._db = db
+        self._backend = None
+        self._loaded = False
+        self._fallback.clear()
+        if not event.contains(db.session, 'after_flush', self._after_flush):
+            event.listen(db.session, 'after_flush', self._after_flush)
+            event.listen(db.session, 'after_commit', self._after_commit)
+            event.listen(db.session, 'after_soft_rollback', self._after_rollback)
+
+    # DDL
+
+    def create(self, connection):
+        """Create the FTS5 table and its sync triggers, then index existing rows."""
+        if connection.dialect.name != 'sqlite' or not fts5_available(connection):
+            return False
+        table, fts = self.table.name, self.fts_table
+        columns = ', '.join(self.columns)
+        new = ', '.join(f"new.{column}" for column in self.columns)
+        old = ', '.join(f"old.{column}" for column in self.columns)
+        statements = [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({columns}, "
+            f"content='{table}', content_rowid='rowid')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.rowid, {new}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.rowid, {old}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.rowid, {old}); "
+            f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.rowid, {new}); END",
+            f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+        ]
+        for statement in statements:
+            connection.execute(text(statement))
+        return True
+
+    def drop(self, connection):
+        """Drop the FTS5 table and its triggers."""
+        if connection.dialect.name != 'sqlite':
+            return
+        for suffix in ('ai', 'ad', 'au'):
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {self.fts_table}_{suffix}"))
+        connection.execute(text(f"DROP TABLE IF EXISTS {self.fts_table}"))
+
+    def _after_create(self, target, connection, **kw):
+        self.create(connection)
+
+    def _before_drop(self, target, connection, **kw):
+        self.drop(connection)
+
+    def owns_table(self, name):
+        """Tell whether a table name belongs to the FTS5 index (for schema comparison)."""
+        return name in {self.fts_table + suffix for suffix in FTS5_SHADOW_SUFFIXES}
+
+    # Search
+
+    def backend(self, session=None):
+        """'fts5' when the database has the FTS5 table, 'python' otherwise."""
+        if self._backend is None:
+            found = False
+            if self._db.engine.dialect.name == 'sqlite':
+                connection = (session or self._db.session).connection()
+                found = connection.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {'name': self.fts_table}
+                ).first() is not None
+            self._backend = 'fts5' if found else 'python'
+        return self._backend
+
+    def search(self, query, limit=20, after=None):
+        """Return up to `limit` (object, score) pairs for a keyword query, best first.
+
+        Scores are BM25 values where lower is better; `after` is the
+        (score, id) of the last result of the previous page.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        if self.backend() == 'fts5':
+            return self._search_fts5(terms, limit, after)
+        self._ensure_loaded()
+        with self._lock:
+            hits = self._fallback.search(terms, limit, after)
+        objects = {obj.id: obj for obj in self.model.query.filter(
+            self.model.id.in_([doc_id for doc_id, _ in hits]))}
+        return [(objects[doc_id], score) for doc_id, score in hits if doc_id in objects]
+
+    def count(self, query):
+        """Number of rows matching every keyword of the query, read from the index alone."""
+        terms = tokenize(query)
+        if not terms:
+            return 0
+        if self.backend() == 'fts5':
+            return self._db.session.execute(
+                text(f"SELECT count(*) FROM {self.fts_table} WHERE {self.fts_table} MATCH :match"),
+                {'match': match_expression(terms)}
+            ).scalar()
+        self._ensure_loaded()
+        with self._lock:
+            return len(self._fallback.search(terms, limit=None))
+
+    def matching(self, query):
+        """SQL criterion keeping the rows that match every keyword of the query."""
+        terms = tokenize(query)
+        if not terms:
+            return false()
+        if self.backend() == 'fts5':
+            return text(
+                f"{self.table.name}.rowid IN (SELECT rowid FROM {self.fts_table} "
+                f"WHERE {self.fts_table} MATCH :{self.fts_table}_match)"
+            ).bindparams(bindparam(f"{self.fts_table}_match", match_expression(terms)))
+        self._ensure_loaded()
+        with self._lock:
+            hits = self._fallback.search(terms, limit=None)
+        return self.model.id.in_([doc_id for doc_id, _ in hits])
+
+    def _search_fts5(self, terms, limit, after):
+        weights = ', '.join(repr(float(weight)) for weight in self.weights)
+        score = f"bm25({self.fts_table}, {weights})"
+        sql = (f"SELECT {self.table.name}.id, {score} AS score FROM {self.fts_table} "
+               f"JOIN {self.table.name} ON {self.table.name}.rowid = {self.fts_table}.rowid "
+               f"WHERE {self.fts_table} MATCH :match")
+        params = {'match': match_expression(terms), 'limit': limit}
+        if after is not None:
+            sql += f" AND ({score} > :score OR ({score} = :score AND {self.table.name}.id > :id))"
+            params.update(score=after[0], id=after[1])
+        sql += f" ORDER BY score, {self.table.name}.id LIMIT :limit"
+        # Typed like the id column, so binary ids are encoded and decoded
+        id_type = self.table.c.id.type
+        statement = text(sql)
+        if after is not None:
+            statement = statement.bindparams(bindparam('id', type_=id_type))
+        statement = statement.columns(id=id_type, score=Float())
+        session = self._db.session
+        hits = session.execute(statement, params).all()
+        objects = {obj.id: obj for obj in self.model.query.filter(
+            self.model.id.in_([row.id for row in hits]))}
+        return [(objects[row.id], row.score) for row in hits if row.id in objects]
+
+    def rebuild(self):
+        """Reindex every row (after VACUUM on SQLite, or to reload the fallback)."""
+        if self.backend() == 'fts5':
+            self._db.session.execute(text(f"INSERT INTO {self.fts_table}({self.fts_table}) VALUES ('rebuild')"))
+            unit_of_work.commit()
+            return
+        with self._lock:
+            self._loaded = False
+        self._ensure_loaded()
+
+    # Fallback maintenance
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded:
+                return
+            self._fallback.clear()
+            columns = [self.table.c.id] + [self.table.c[column] for column in self.columns]
+            for row in self._db.session.execute(self.table.select().with_only_columns(*columns)):
+                self._fallback.add(row.id, row._mapping)
+            self._loaded = True
+
+    def _after_flush(self, session, flush_context):
+        if self._db is None or self.backend(session) != 'python':
+            return
+        pending = session.info.setdefault(self._pending_key, {})
+        for obj in list(session.new) + list(session.dirty):
+            if isinstance(obj, self.model):
+                pending[obj.id] = {column: getattr(obj, column) for column in self.columns}
+        for obj in session.deleted:
+            if isinstance(obj, self.model):
+                pending[obj.id] = None
+
+    def _after_commit(self, session):
+        if session.in_nested_transaction():
+            return  # a released savepoint; wait for the enclosing commit
+        pending = session.info.pop(self._pending_key, None)
+        if not pending:
+            return
+        with self._lock:
+            if not self._loaded:
+                return
+            for doc_id, values in pending.items():
+                if values is None:
+                    self._fallback.remove(doc_id)
+                else:
+                    self._fallback.add(doc_id, values)
+
+    def _after_rollback(self, session, previous_transaction):
+        if not session.in_transaction():
+            session.info.pop(self._pending_key, None)
@@ -1,5 +1,24 @@
+import bisect
+from sqlalchemy import and_, delete, exists, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import aliased
 from app.persistence.repository import SQLAlchemyRepository
 from app.models.place import Place
+from app.models.place_amenity import place_amenity
+from app.models.amenity import Amenity
+from app.models.review import Review
+from app.models.user import User
+from app import db
+from app.persistence.bitmap import AmenityBitmapIndex
+from app.persistence.fulltext import FullTextIndex
+from app.persistence import unit_of_work
+
+# Matches in the title weigh twice as much as matches in the description
+place_fulltext = FullTextIndex(Place, ('title', 'description'), weights=(2.0, 1.0))
+amenity_index = AmenityBitmapIndex()
+
+# Lower bounds of the price histogram buckets; the last one is open-ended
+PRICE_BUCKETS = (0, 50, 100, 200, 500)
 
 class PlaceRepository(SQLAlchemyRepository):
     """Repository for handling Place-related database operations."""
@@ -11,13 +30,206 @@ class PlaceRepository(SQLAlchemyRepository):
         """Retrieve all places owned by a specific user."""
         return self.model.query.filter_by(owner_id=owner_id).all()
 
+    def get_review_target(self, place_id, user_id):
+        """Return (owner id of the place, whether user_id exists) in one SELECT.
+
+        Returns None if the place does not exist.
+        """
+        user_exists = exists().where(User.id == user_id)
+        return db.session.execute(
+            select(self.model.owner_id, user_exists.label('user_exists')).where(self.model.id == place_id)
+        ).first()
+
+    def search(self, query, limit=20, after=None):
+        """Rank places matching every keyword of the query (BM25, lower scores first)."""
+        return place_fulltext.search(query, limit, after)
+
+    def facets(self, query):
+        """Count the places matching a keyword query per amenity, price bucket and rating.
+
+        A single SELECT reads the price and average rating of every match;
+        amenity counts come from intersecting the amenity bitmaps with them.
+        Places are put in the rating bucket of their rounded-down average,
+        or in the None bucket when they have no review.
+        """
+        ratings = self._average_ratings().subquery()
+        rows = db.session.execute(
+            select(self.model.id, self.model.price, ratings.c.rating)
+            .outerjoin(ratings, ratings.c.place_id == self.model.id)
+            .where(place_fulltext.matching(query))
+        ).all()
+        prices = [0] * len(PRICE_BUCKETS)
+        rating_counts = dict.fromkeys([5, 4, 3, 2, 1, None], 0)
+        for _, price, rating in rows:
+            prices[bisect.bisect_right(PRICE_BUCKETS, price) - 1] += 1
+            rating_counts[int(rating) if rating is not None else None] += 1
+        bounds = PRICE_BUCKETS[1:] + (None,)
+        return {
+            'total': len(rows),
+            'amenities': amenity_index.counts([row.id for row in rows]),
+            'price': [{'min': low, 'max': high, 'count': count}
+                      for low, high, count in zip(PRICE_BUCKETS, bounds, prices)],
+            'rating': [{'rating': rating, 'count': count} for rating, count in rating_counts.items()],
+        }
+
+    def get_owner_summary(self, owner_id, limit=20, after=None):
+        """Page through the places of an owner with their review count, average rating and latest review.
+
+        One SELECT: the counts and averages are correlated subqueries served
+        by the (place_id, rating) index, and the latest review is joined on
+        the id picked by a third one. `after` is the id of the last place of
+        the previous page.
+        """
+        latest = aliased(Review)
+        reviews_of_place = Review.place_id == self.model.id
+        review_count = select(func.count()).where(reviews_of_place).scalar_subquery()
+        average_rating = select(func.avg(Review.rating)).where(reviews_of_place).scalar_subquery()
+        latest_id = select(Review.id).where(reviews_of_place) \
+            .order_by(Review.created_at.desc(), Review.id.desc()).limit(1).scalar_subquery()
+        query = select(
+            self.model.id, self.model.title, self.model.price,
+            review_count.label('review_count'), average_rating.label('average_rating'),
+            latest.id.label('latest_review_id'), latest.text.label('latest_review_text'),
+            latest.rating.label('latest_review_rating'), latest.created_at.label('latest_review_created_at'),
+        ).outerjoin(latest, latest.id == latest_id) \
+            .where(self.model.owner_id == owner_id).order_by(self.model.id).limit(limit)
+        if after is not None:
+            query = query.where(self.model.id > after)
+        return db.session.execute(query).all()
+
     def get_places_by_price_range(self, min_price, max_price):
         """Retrieve places within a specified price range."""
         return self.model.query.filter(self.model.price >= min_price, self.model.price <= max_price).all()
 
+    def get_column_values(self):
+        """Return (price, latitude, longitude, average rating) rows for every place, for statistics."""
+        ratings = self._average_ratings().subquery()
+        return db.session.execute(
+            select(self.model.price, self.model.latitude, self.model.longitude, ratings.c.rating)
+            .outerjoin(ratings, ratings.c.place_id == self.model.id)
+        ).all()
+
+    def _average_ratings(self):
+        return select(Review.place_id, func.avg(Review.rating).label('rating')).group_by(Review.place_id)
+
+    # Search criteria: each is a SQL condition on places, so that the
+    # filters of a search compose into a single paged SELECT.
+
+    def price_range_filter(self, min_price=None, max_price=None):
+        """Places priced within a range, served by the price index."""
+        conditions = []
+        if min_price is not None:
+            conditions.append(self.model.price >= min_price)
+        if max_price is not None:
+            conditions.append(self.model.price <= max_price)
+        return and_(*conditions)
+
+    def box_filter(self, min_latitude, max_latitude, min_longitude, max_longitude):
+        """Places within a bounding box, served by the latitude index."""
+        return and_(self.model.latitude.between(min_latitude, max_latitude),
+                    self.model.longitude.between(min_longitude, max_longitude))
+
+    def min_rating_filter(self, min_rating):
+        """Places whose average rating is at least min_rating, as a subquery on the reviews."""
+        return self.model.id.in_(select(Review.place_id).group_by(Review.place_id)
+                                 .having(func.avg(Review.rating) >= min_rating))
+
+    def keywords_filter(self, query):
+        """Places matching every keyword of the query."""
+        return place_fulltext.matching(query)
+
+    def amenities_filter(self, groups):
+        """Places having at least one amenity of every group, as EXISTS on place_amenity."""
+        return and_(*(exists().where(place_amenity.c.place_id == self.model.id,
+                                     place_amenity.c.amenity_id.in_(group)) for group in groups))
+
+    def _places_page_query(self, criteria, limit, after, among):
+        query = select(self.model).where(*criteria).order_by(self.model.id).limit(limit)
+        if after is not None:
+            query = query.where(self.model.id > after)
+        if among is not None:
+            query = query.where(self.model.id.in_(among))
+        return query
+
+    def get_places_page(self, criteria=(), limit=20, after=None, among=None):
+        """Retrieve up to `limit` places matching every criterion, ordered by id.
+
+        `after` is the id of the last place of the previous page; `among`
+        restricts the page to a bounded batch of candidate ids.
+        """
+        return db.session.scalars(self._places_page_query(criteria, limit, after, among)).all()
+
+    def explain_places_page(self, criteria=(), limit=20, after=None, among=None):
+        """The database's plan for the SELECT of get_places_page with the same arguments."""
+        return self.explain(self._places_page_query(criteria, limit, after, among))
+
     def get_places_with_amenity(self, amenity_id):
         """Retrieve places that have a specific amenity."""
-        return self.model.query.filter(self.model.amenities.any(id=amenity_id)).all()
+        return self.model.query.join(
+            place_amenity, place_amenity.c.place_id == self.model.id
+        ).filter(place_amenity.c.amenity_id == amenity_id).all()
+
+    def get_places_with_amenities(self, groups, limit=20, after=None):
+        """Retrieve a page of the places matching AND-of-OR groups of amenity ids, e.g. [[wifi, fiber], [pool]].
+
+        Places are ordered by id and `after` is the id of the last place of
+        the previous page; only the ids of the page are sent to the database.
+        """
+        place_ids = sorted(amenity_index.evaluate(groups))
+        start = 0 if after is None else bisect.bisect_right(place_ids, after)
+        page = place_ids[start:start + limit]
+        if not page:
+            return []
+        return self.model.query.filter(self.model.id.in_(page)).order_by(self.model.id).all()
+
+    def _insert_missing_amenities(self, place_id, amenity_ids):
+        """INSERT every (place, amenity) pair at once, skipping the existing ones."""
+        rows = [{'place_id': place_id, 'amenity_id': amenity_id} for amenity_id in amenity_ids]
+        if not rows:
+            return
+        dialect = db.engine.dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            module = sqlite if dialect == 'sqlite' else postgresql
+            statement = module.insert(place_amenity).on_conflict_do_nothing()
+        else:
+            statement = insert(place_amenity).prefix_with('IGNORE')
+        db.session.execute(statement, rows)
+
+    def _amenities_changed(self, place_id):
+        """Expire the amenity collections the bulk SQL made stale in this session."""
+        for obj in list(db.session.identity_map.values()):
+            if isinstance(obj, self.model) and obj.id == place_id:
+                db.session.expire(obj, ['amenities'])
+            elif isinstance(obj, Amenity):
+                db.session.expire(obj, ['places'])
+
+    def attach_amenities(self, place_id, amenity_ids):
+        """Add amenities to a place with one INSERT ... ON CONFLICT DO NOTHING."""
+        amenity_ids = list(dict.fromkeys(amenity_ids))
+        self._insert_missing_amenities(place_id, amenity_ids)
+        self._amenities_changed(place_id)
+        amenity_index.defer(db.session(), place_id, added=amenity_ids)
+        unit_of_work.commit()
+
+    def detach_amenities(self, place_id, amenity_ids):
+        """Remove amenities from a place with one DELETE."""
+        amenity_ids = list(dict.fromkeys(amenity_ids))
+        if amenity_ids:
+            db.session.execute(delete(place_amenity).where(
+                place_amenity.c.place_id == place_id, place_amenity.c.amenity_id.in_(amenity_ids)))
+        self._amenities_changed(place_id)
+        amenity_index.defer(db.session(), place_id, removed=amenity_ids)
+        unit_of_work.commit()
+
+    def set_amenities(self, place_id, amenity_ids):
+        """Replace the amenities of a place: one INSERT for the missing ones, one DELETE for the others."""
+        amenity_ids = list(dict.fromkeys(amenity_ids))
+        self._insert_missing_amenities(place_id, amenity_ids)
+        db.session.execute(delete(place_amenity).where(
+            place_amenity.c.place_id == place_id, place_amenity.c.amenity_id.not_in(amenity_ids)))
+        self._amenities_changed(place_id)
+        amenity_index.defer(db.session(), place_id, amenity_ids=amenity_ids)
+        unit_of_work.commit()
 
     def add_amenity_to_place(self, place_id, amenity):
         """Add an amenity to a place."""
@@ -27,7 +239,7 @@ class PlaceRepository(SQLAlchemyRepository):
 
         if amenity not in place.amenities:
             place.amenities.append(amenity)
-            self.save(place)
+            unit_of_work.commit()
 
     def remove_amenity_from_place(self, place_id, amenity):
         """Remove an amenity from a place."""
@@ -37,4 +249,4 @@ class PlaceRepository(SQLAlchemyRepository):
 
         if amenity in place.amenities:
             place.amenities.remove(amenity)
-            self.save(place)
+            unit_of_work.commit()
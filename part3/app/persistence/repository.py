@@ -1,6 +1,20 @@
 from abc import ABC, abstractmethod
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.engine import Engine
 from app import db  # Assuming you have set up SQLAlchemy in your Flask app
 from app.models import User, Place, Review, Amenity  # Import your models
+from app.persistence import unit_of_work
+
+# Statement prefix asking the database for the plan of a query instead of its rows
+EXPLAIN_PREFIXES = {'sqlite': 'EXPLAIN QUERY PLAN '}
+
+
+@event.listens_for(Engine, 'before_cursor_execute', retval=True)
+def _explain_statement(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and context.execution_options.get('explain_query_plan'):
+        statement = EXPLAIN_PREFIXES.get(conn.dialect.name, 'EXPLAIN ') + statement
+    return statement, parameters
+
 
 class Repository(ABC):
     @abstractmethod
@@ -33,7 +47,7 @@ class SQLAlchemyRepository(Repository):
 
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
+        unit_of_work.commit()
 
     def get(self, obj_id):
         session = db.session
@@ -47,19 +61,57 @@ class SQLAlchemyRepository(Repository):
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
+            unit_of_work.commit()
 
     def delete(self, obj_id):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            unit_of_work.commit()
 
     def get_by_attribute(self, attr_name, attr_value):
         return self.model.query.filter(getattr(self.model, attr_name) == attr_value).first()
 
+    def relationship_count(self, name):
+        """Correlated COUNT(*) subquery of a relationship of the model, to use in a SELECT.
+
+        Works for one-to-many relationships and for many-to-many ones
+        (counted on the association table) without loading the collection.
+        """
+        relationship = inspect(self.model).relationships.get(name)
+        if relationship is None or not relationship.uselist:
+            raise ValueError(f"{self.model.__name__} has no collection named {name}")
+        target = relationship.secondary if relationship.secondary is not None else relationship.mapper.local_table
+        return select(func.count()).select_from(target).where(relationship.primaryjoin) \
+            .correlate(self.model).scalar_subquery()
+
+    def get_with_counts(self, obj_id, relationships):
+        """Load an object and the size of some of its collections in one query.
+
+        Returns (object, {relationship name: count}), or None if not found.
+        """
+        columns = [self.relationship_count(name).label(name) for name in relationships]
+        row = db.session.execute(select(self.model, *columns).where(self.model.id == obj_id)).first()
+        if row is None:
+            return None
+        return row[0], dict(zip(relationships, row[1:]))
+
+    def explain(self, query):
+        """The plan the database runs for a SELECT, one line per step.
+
+        The statement is sent exactly as it would be, with its parameters,
+        prefixed with EXPLAIN (EXPLAIN QUERY PLAN on SQLite).
+        """
+        conn = db.session.connection(bind_arguments={'mapper': self.model})
+        result = conn.execute(query, execution_options={'explain_query_plan': True})
+        try:
+            rows = result.cursor.fetchall()
+        finally:
+            result.close()
+        if conn.dialect.name == 'sqlite':
+            return [row[3] for row in rows]
+        return [' '.join(str(value) for value in row if value is not None) for row in rows]
 
-"""
 
 class InMemoryRepository(Repository):
     def __init__(self):
@@ -77,7 +129,8 @@ class InMemoryRepository(Repository):
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
-            obj.update(data)
+            for key, value in data.items():
+                setattr(obj, key, value)
 
     def delete(self, obj_id):
         if obj_id in self._storage:
@@ -85,5 +138,3 @@ class InMemoryRepository(Repository):
 
     def get_by_attribute(self, attr_name, attr_value):
         return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
-        
-"""
@@ -1,12 +1,53 @@
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.persistence import unit_of_work
 from app.persistence.repository import SQLAlchemyRepository
+from app.persistence.fulltext import FullTextIndex
 from app.models.review import Review
 
+review_fulltext = FullTextIndex(Review, ('text',))
+
+# sort name -> (column, descending)
+REVIEW_SORTS = {
+    'newest': (Review.created_at, True),
+    'oldest': (Review.created_at, False),
+    'highest': (Review.rating, True),
+    'lowest': (Review.rating, False),
+}
+
 class ReviewRepository(SQLAlchemyRepository):
     """Repository for handling Review-related database operations."""
 
     def __init__(self):
         super().__init__(Review)
 
+    def add_review(self, review):
+        """Insert a review with a single INSERT.
+
+        Duplicates are detected by the uq_reviews_place_user constraint
+        instead of being looked up first; a foreign key failure means the
+        place or the user was deleted since the caller checked them. The
+        review is not expired on commit, so serializing it does not reload it.
+        """
+        session = db.session()
+        session.add(review)
+        expire_on_commit, session.expire_on_commit = session.expire_on_commit, False
+        try:
+            unit_of_work.commit()
+        except IntegrityError as e:
+            # Inside a unit of work the enclosing block rolls everything back
+            if not unit_of_work.in_transaction():
+                session.rollback()
+            message = str(e.orig)
+            if 'uq_reviews_place_user' in message or 'reviews.place_id, reviews.user_id' in message:
+                raise ValueError("You have already reviewed this place")
+            if 'foreign key' in message.lower():
+                raise ValueError("Place or user no longer exists")
+            raise
+        finally:
+            session.expire_on_commit = expire_on_commit
+
     def get_reviews_by_place(self, place_id):
         """Retrieve all reviews for a specific place."""
         return self.model.query.filter_by(place_id=place_id).all()
@@ -14,3 +55,31 @@ class ReviewRepository(SQLAlchemyRepository):
     def get_reviews_by_user(self, user_id):
         """Retrieve all reviews written by a specific user."""
         return self.model.query.filter_by(user_id=user_id).all()
+
+    def search_reviews(self, place_id, min_rating=None, max_rating=None, query=None,
+                       sort='newest', limit=20, after=None):
+        """Filter, sort and paginate the reviews of a place in SQL.
+
+        `after` is the (sort value, id) of the last review of the previous page.
+        """
+        if sort not in REVIEW_SORTS:
+            raise ValueError(f"sort must be one of {', '.join(REVIEW_SORTS)}")
+        column, descending = REVIEW_SORTS[sort]
+        reviews = self.model.query.filter(self.model.place_id == place_id)
+        if min_rating is not None:
+            reviews = reviews.filter(self.model.rating >= min_rating)
+        if max_rating is not None:
+            reviews = reviews.filter(self.model.rating <= max_rating)
+        if query:
+            reviews = reviews.filter(review_fulltext.matching(query))
+        if after is not None:
+            value, last_id = after
+            if descending:
+                reviews = reviews.filter(or_(column < value, and_(column == value, self.model.id < last_id)))
+            else:
+                reviews = reviews.filter(or_(column > value, and_(column == value, self.model.id > last_id)))
+        if descending:
+            reviews = reviews.order_by(column.desc(), self.model.id.desc())
+        else:
+            reviews = reviews.order_by(column.asc(), self.model.id.asc())
+        return reviews.limit(limit).all()
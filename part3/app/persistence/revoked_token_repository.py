@@ -0,0 +1,57 @@
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.persistence.repository import SQLAlchemyRepository
+from app.persistence import unit_of_work
+from app.persistence.routing import use_primary
+from app.models.revoked_token import RevokedToken
+
+class RevokedTokenRepository(SQLAlchemyRepository):
+    """Repository for handling revoked JWT identifiers (jti)."""
+
+    def __init__(self):
+        super().__init__(RevokedToken)
+
+    def is_revoked(self, jti):
+        """Check the store for a revoked jti (always on the primary)."""
+        with use_primary():
+            return db.session.query(
+                self.model.query.filter_by(jti=jti).exists()
+            ).scalar()
+
+    def revoke(self, jti, token_type, user_id, expires_at):
+        """Persist a revoked jti, ignoring tokens that are already revoked.
+
+        The unique constraint on jti rejects a second revocation, so two
+        concurrent logouts with the same token both succeed.
+        """
+        try:
+            self.add(RevokedToken(
+                jti=jti,
+                token_type=token_type,
+                user_id=user_id,
+                expires_at=expires_at
+            ))
+        except IntegrityError as e:
+            # Inside a unit of work the enclosing block rolls everything back
+            if not unit_of_work.in_transaction():
+                db.session.rollback()
+            if 'jti' not in str(e.orig):
+                raise
+
+    def iter_active_jtis(self, batch_size=1000):
+        """Stream the jti of every revoked token that has not expired yet."""
+        with use_primary():
+            query = db.session.query(self.model.jti).filter(
+                self.model.expires_at > datetime.utcnow()
+            )
+            for (jti,) in query.yield_per(batch_size):
+                yield jti
+
+    def purge_expired(self):
+        """Delete revoked tokens that would be rejected as expired anyway."""
+        deleted = self.model.query.filter(
+            self.model.expires_at <= datetime.utcnow()
+        ).delete(synchronize_session=False)
+        unit_of_work.commit()
+        return deleted
@@ -0,0 +1,58 @@
+from contextlib import contextmanager
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = 'replica'
+READ_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+
+class RoutingSession(Session):
+    """Session sending the reads of GET requests to the replica bind.
+
+    Reads are routed to the engine configured as SQLALCHEMY_BINDS['replica']
+    when the current request is a GET (or inside use_replica()). Flushes,
+    DML statements and every read that follows a write in the same session
+    go to the primary, so a request always sees its own writes. Without a
+    replica bind the session behaves exactly like the default one.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """Pick the replica engine for eligible reads, the primary otherwise."""
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None or REPLICA_BIND not in self._db.engines:
+            return engine
+        if self._flushing or getattr(clause, 'is_dml', False):
+            self.info['wrote'] = True
+        if engine is self._db.engine and self._reads_from_replica():
+            return self._db.engines[REPLICA_BIND]
+        return engine
+
+    def _reads_from_replica(self):
+        if self.info.get('wrote'):
+            return False
+        route = self.info.get('route')
+        if route is not None:
+            return route == REPLICA_BIND
+        return has_request_context() and request.method in READ_METHODS
+
+
+@contextmanager
+def _route(target):
+    from app import db
+    session = db.session()
+    previous = session.info.get('route')
+    session.info['route'] = target
+    try:
+        yield session
+    finally:
+        session.info['route'] = previous
+
+
+def use_primary():
+    """Send the reads of the enclosed block to the primary database."""
+    return _route('primary')
+
+
+def use_replica():
+    """Send the reads of the enclosed block to the replica, unless the session already wrote."""
+    return _route(REPLICA_BIND)
@@ -0,0 +1,43 @@
+from sqlalchemy import event
+
+
+def apply_pragmas(engine, pragmas):
+    """Run the given PRAGMA statements on every new connection of a SQLite engine."""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def begin_before_savepoints(engine):
+    """Make savepoints nest inside a real transaction on a SQLite engine.
+
+    pysqlite only opens a transaction before INSERT/UPDATE/DELETE; a
+    SAVEPOINT issued before any of them starts one that its RELEASE then
+    commits, outside the enclosing session transaction.
+    """
+    if engine.dialect.name != 'sqlite' or event.contains(engine, 'savepoint', _begin):
+        return
+    event.listen(engine, 'savepoint', _begin)
+
+
+def _begin(conn, name):
+    dbapi_connection = conn.connection.driver_connection
+    if not dbapi_connection.in_transaction:
+        dbapi_connection.execute('BEGIN')
+
+
+def init_app(app, db):
+    """Apply SQLITE_PRAGMAS to every SQLite engine of the app."""
+    pragmas = app.config.get('SQLITE_PRAGMAS', {})
+    with app.app_context():
+        for engine in db.engines.values():
+            apply_pragmas(engine, pragmas)
+            begin_before_savepoints(engine)
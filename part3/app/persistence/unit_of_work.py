@@ -0,0 +1,79 @@
+import copy
+from contextlib import contextmanager
+from app import db
+
+_DEPTH = 'unit_of_work_depth'
+
+
+def in_transaction():
+    """True inside a transaction() block of the current session."""
+    return bool(db.session().info.get(_DEPTH))
+
+
+def commit():
+    """Commit the session, or only flush it inside a transaction() block.
+
+    Repositories call this instead of db.session.commit(): on its own each
+    write still commits, while a unit of work commits once at its end.
+    Flushing keeps ids assigned and constraint errors raised where they
+    happen.
+    """
+    session = db.session()
+    if session.info.get(_DEPTH):
+        session.flush()
+    else:
+        session.commit()
+
+
+def _pending_changes(session):
+    """Copy the changes that indexes and caches collected for after_commit.
+
+    They live in session.info under keys containing '_pending'; a savepoint
+    that rolls back must drop what was collected inside it.
+    """
+    return {key: copy.deepcopy(value) for key, value in session.info.items() if '_pending' in key}
+
+
+def _rollback_savepoint(session, savepoint, pending):
+    savepoint.rollback()
+    for key in [key for key in session.info if '_pending' in key]:
+        del session.info[key]
+    session.info.update(pending)
+
+
+@contextmanager
+def transaction():
+    """Group writes into one commit at the end of the block, or roll them all back.
+
+    Blocks nest: an inner block runs in a SAVEPOINT, so an error leaving it
+    only undoes its own writes and the outer block may catch it and go on.
+    Only the outermost block commits.
+    """
+    session = db.session()
+    depth = session.info.get(_DEPTH, 0)
+    savepoint = pending = None
+    if depth:
+        savepoint = session.begin_nested()
+        pending = _pending_changes(session)
+    session.info[_DEPTH] = depth + 1
+    try:
+        yield session
+    except BaseException:
+        if savepoint is not None:
+            _rollback_savepoint(session, savepoint, pending)
+        else:
+            session.rollback()
+        raise
+    finally:
+        session.info[_DEPTH] = depth
+    try:
+        if savepoint is not None:
+            savepoint.commit()
+        else:
+            session.commit()
+    except BaseException:
+        if savepoint is not None:
+            _rollback_savepoint(session, savepoint, pending)
+        else:
+            session.rollback()
+        raise
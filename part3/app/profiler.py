@@ -0,0 +1,71 @@
+"""Statistical sampling profiler over every thread of the process.
+
+A background thread snapshots the stack of every other thread with
+sys._current_frames() at a fixed interval and counts identical stacks.
+The result is in the collapsed-stack format read by flamegraph.pl and
+speedscope: one "frame;frame;frame count" line per distinct stack.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class ProfilerBusyError(RuntimeError):
+    pass
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Collect collapsed stacks of all threads; one session at a time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def sample(self, stacks, ignored):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident in ignored:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(ident, f"thread-{ident}"))
+            stacks[';'.join(reversed(labels))] += 1
+
+    def profile(self, seconds, interval=0.005):
+        """Sample every thread (except the caller) for `seconds`; returns a Counter of stacks."""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profiling session is already running")
+        try:
+            stacks = Counter()
+            caller = threading.get_ident()
+            done = threading.Event()
+
+            def run():
+                ignored = {caller, threading.get_ident()}
+                deadline = time.monotonic() + seconds
+                while time.monotonic() < deadline:
+                    self.sample(stacks, ignored)
+                    time.sleep(interval)
+                done.set()
+
+            threading.Thread(target=run, name='hbnb-profiler', daemon=True).start()
+            done.wait()
+            return stacks
+        finally:
+            self._lock.release()
+
+
+def collapsed(stacks):
+    """Render stacks in the collapsed format, most frequent first."""
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+profiler = SamplingProfiler()
@@ -1,3 +1,5 @@
 from .facade import HBnBFacade
+from .revocation import TokenRevocationList
 
 facade = HBnBFacade()
+revocation_list = TokenRevocationList()
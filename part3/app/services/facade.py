@@ -4,18 +4,30 @@ from app.persistence.user_repository import UserRepository
 from app.persistence.place_repository import PlaceRepository
 from app.persistence.review_repository import ReviewRepository
 from app.persistence.amenity_repository import AmenityRepository
+from app.persistence.bitmap import parse_amenity_filter
+from app.services.place_search import PlaceSearchService
+from app.services.summary_cache import OwnerSummaryCache
 from app import db, bcrypt
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
 from app.models.review import Review
+from app.tracing import trace_public_methods
+from app.persistence import unit_of_work
 
+@trace_public_methods
 class HBnBFacade:
     def __init__(self):
         self.user_repository = UserRepository()
         self.place_repository = PlaceRepository()
         self.review_repository = ReviewRepository()
         self.amenity_repository = AmenityRepository()
+        self.place_search = PlaceSearchService(self.place_repository)
+        self.summary_cache = OwnerSummaryCache()
+
+    def transaction(self):
+        """Unit of work: `with facade.transaction():` commits every write of the block once, at its end."""
+        return unit_of_work.transaction()
     
     # USER
     def create_user(self, user_data):
@@ -27,7 +39,7 @@ class HBnBFacade:
         user = User(**user_data)
         user.hash_password(password)
         db.session.add(user)
-        db.session.commit()
+        unit_of_work.commit()
         return user
         
     def get_users(self):
@@ -38,6 +50,10 @@ class HBnBFacade:
         """Retrieves a specific user by ID."""
         return self.user_repository.get(user_id)
 
+    def get_user_with_counts(self, user_id):
+        """Retrieves a user with the number of their places and reviews; None if not found."""
+        return self.user_repository.get_with_counts(user_id, ('places', 'reviews'))
+
     def get_user_by_email(self, email):
         """Retrieves a user by email."""
         return self.user_repository.get_by_attribute('email', email)
@@ -55,7 +71,7 @@ class HBnBFacade:
 
         amenity = Amenity(**amenity_data)
         db.session.add(amenity)
-        db.session.commit()
+        unit_of_work.commit()
         return amenity
 
     def get_amenity(self, amenity_id):
@@ -84,7 +100,7 @@ class HBnBFacade:
 
         place = Place(**place_data)
         db.session.add(place)
-        db.session.commit()
+        unit_of_work.commit()
         return place
 
     def get_places(self):
@@ -95,26 +111,133 @@ class HBnBFacade:
         """Retrieve all places from the database."""
         return self.place_repository.get_all()
 
+    def get_places_with_amenities(self, expression, limit=20, after=None):
+        """Retrieves a page of the places matching an amenity filter such as 'WiFi|Fiber,Pool'.
+
+        Commas combine groups with AND, '|' combines amenities with OR;
+        amenities are given by id or by name. Places are ordered by id and
+        `after` is the id of the last place of the previous page.
+        """
+        return self.place_repository.get_places_with_amenities(
+            self._resolve_amenity_filter(expression), limit, after)
+
+    def _resolve_amenity_filter(self, expression):
+        """Turns an amenity filter into AND-of-OR groups of amenity ids."""
+        groups = parse_amenity_filter(expression)
+        keys = {key for group in groups for key in group}
+        found = {}
+        for amenity in self.amenity_repository.get_amenities_by_id_or_name(list(keys)):
+            found[amenity.id] = found[amenity.name] = amenity.id
+        unknown = sorted(keys - found.keys())
+        if unknown:
+            raise ValueError(f"Unknown amenities: {', '.join(unknown)}")
+        return [[found[key] for key in group] for group in groups]
+
+    def find_places(self, amenities=None, **filters):
+        """Retrieves one page of the places matching combined filters; returns (places, plan).
+
+        Filters are min_price, max_price, latitude/longitude/radius (km),
+        amenities (an amenity filter expression), min_rating and query;
+        limit and after (the id of the last place of the previous page) page
+        the results; explain adds the database's query plan to the plan.
+        """
+        if amenities:
+            filters['amenities'] = self._resolve_amenity_filter(amenities)
+        return self.place_search.search(**filters)
+
+    def add_amenities_to_place(self, place, amenities):
+        """Adds amenities to a place and saves it."""
+        for amenity in amenities:
+            place.add_amenity(amenity)
+        unit_of_work.commit()
+
+    def _check_amenities(self, amenity_ids):
+        """Raises ValueError for the first amenity id that does not exist (one query)."""
+        existing = self.amenity_repository.get_existing_ids(amenity_ids)
+        for amenity_id in amenity_ids:
+            if amenity_id not in existing:
+                raise ValueError(f"Amenity {amenity_id} not found")
+
+    def attach_amenities(self, place_id, amenity_ids):
+        """Adds amenities to a place with set-based SQL; existing links are kept."""
+        self._check_amenities(amenity_ids)
+        self.place_repository.attach_amenities(place_id, amenity_ids)
+
+    def set_place_amenities(self, place_id, amenity_ids):
+        """Makes the given amenities the exact amenities of a place."""
+        self._check_amenities(amenity_ids)
+        self.place_repository.set_amenities(place_id, amenity_ids)
+
+    def detach_amenities(self, place_id, amenity_ids):
+        """Removes amenities from a place in one statement."""
+        self.place_repository.detach_amenities(place_id, amenity_ids)
+
     def get_place_by_id(self, place_id):
         """Retrieves a specific place."""
         return self.place_repository.get(place_id)
+
+    def get_place(self, place_id):
+        """Retrieves a specific place."""
+        return self.place_repository.get(place_id)
     
     def update_place(self, place_id, place_data):
         """Updates a place's details in the database."""
         self.place_repository.update(place_id, place_data)
 
+    def delete_place(self, place_id):
+        """Deletes a place along with its reviews."""
+        self.place_repository.delete(place_id)
+
+    def search_places(self, query, limit=20, after=None):
+        """Search places by keywords; returns (place, score) pairs, best first."""
+        return self.place_repository.search(query, limit, after)
+
+    def get_owner_place_summary(self, owner_id, limit=20, after=None):
+        """Page of an owner's places with review count, average rating and latest review (cached)."""
+        key = (owner_id, limit, after)
+        page = self.summary_cache.get(key)
+        if page is not None:
+            return page
+        page = []
+        for row in self.place_repository.get_owner_summary(owner_id, limit, after):
+            latest = None
+            if row.latest_review_id is not None:
+                latest = {'id': row.latest_review_id, 'text': row.latest_review_text,
+                          'rating': row.latest_review_rating,
+                          'created_at': row.latest_review_created_at.isoformat()}
+            page.append({'id': row.id, 'title': row.title, 'price': row.price,
+                         'review_count': row.review_count, 'average_rating': row.average_rating,
+                         'latest_review': latest})
+        self.summary_cache.set(key, owner_id, [place['id'] for place in page], page)
+        return page
+
+    def get_place_facets(self, query):
+        """Counts per amenity, price bucket and rating of the places matching a query."""
+        facets = self.place_repository.facets(query)
+        counts = facets['amenities']
+        amenities = self.amenity_repository.get_amenities_by_id_or_name(list(counts))
+        facets['amenities'] = sorted(
+            ({'id': amenity.id, 'name': amenity.name, 'count': counts[amenity.id]} for amenity in amenities),
+            key=lambda facet: (-facet['count'], facet['name']))
+        return facets
+
     # REVIEWS
     def create_review(self, review_data):
-        """Creates a new review and associates it with a user and place."""
-        user = self.user_repository.get(review_data['user_id'])
-        place = self.place_repository.get(review_data['place_id'])
-
-        if not user or not place:
-            raise ValueError("Invalid User or Place ID")
+        """Creates a new review in one transaction of two statements.
 
+        One SELECT reads the place owner and checks that the user exists,
+        so unknown users are rejected even with foreign keys off; the INSERT
+        then relies on the unique constraint to reject duplicate reviews.
+        """
+        target = self.place_repository.get_review_target(review_data['place_id'], review_data['user_id'])
+        if target is None:
+            raise ValueError("Place not found")
+        if not target.user_exists:
+            raise ValueError("User not found")
+        if target.owner_id == review_data['user_id']:
+            raise ValueError("You cannot review your own place")
         review = Review(**review_data)
-        db.session.add(review)
-        db.session.commit()
+        self.review_repository.add_review(review)
         return review
 
     def get_review(self, review_id):
@@ -133,6 +256,10 @@ class HBnBFacade:
         """Retrieves all reviews for a specific place."""
         return self.review_repository.get_reviews_by_place(place_id)
 
+    def search_reviews(self, place_id, **filters):
+        """Filter, sort and paginate the reviews of a place (see ReviewRepository.search_reviews)."""
+        return self.review_repository.search_reviews(place_id, **filters)
+
     def update_review(self, review_id, review_data):
         """Updates a review's details."""
         self.review_repository.update(review_id, review_data)
@@ -0,0 +1,296 @@
+import bisect
+import math
+import threading
+import time
+from app.persistence.place_repository import amenity_index, place_fulltext
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def distance_km(latitude1, longitude1, latitude2, longitude2):
+    """Great-circle distance between two points (haversine)."""
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(longitude2 - longitude1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class Histogram:
+    """Equi-depth histogram of a column: its values at evenly spaced ranks."""
+
+    def __init__(self, values, buckets=100):
+        values = sorted(values)
+        self.count = len(values)
+        self.sampled = len(values) > buckets + 1
+        if self.sampled:
+            values = [values[i * (len(values) - 1) // buckets] for i in range(buckets + 1)]
+        self.bounds = values
+
+    def fraction(self, low=None, high=None):
+        """Estimated share of the values within [low, high]."""
+        if not self.bounds:
+            return 0.0
+        start = 0 if low is None else bisect.bisect_left(self.bounds, low)
+        end = len(self.bounds) if high is None else bisect.bisect_right(self.bounds, high)
+        # A range falling between two sampled bounds still holds about half a bucket
+        matched = max(end - start, 0) + (0.5 if self.sampled else 0)
+        return min(1.0, matched / len(self.bounds))
+
+
+class PlaceStatistics:
+    """Histograms of the place prices, coordinates and average ratings.
+
+    Like ANALYZE, they are recomputed in one pass over the places. The first
+    use computes them; afterwards, once they are older than
+    PLACE_STATISTICS_REFRESH_INTERVAL seconds, a background thread
+    recomputes them while searches keep using the previous ones. Estimates
+    only need to be roughly right to decide whether the amenity bitmaps drive.
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.refresh_interval = 60
+        self.total = 0
+        self.price = self.latitude = self.longitude = self.rating = Histogram(())
+        self._app = None
+        self._refreshed_at = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Read the refresh interval; background refreshes run in this app's context."""
+        self.refresh_interval = app.config.get('PLACE_STATISTICS_REFRESH_INTERVAL', self.refresh_interval)
+        self._app = app
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop the statistics; they are recomputed on next use."""
+        self._refreshed_at = None
+
+    def refresh(self):
+        """Recompute every histogram from the places table."""
+        rows = self.repository.get_column_values()
+        with self._lock:
+            self.total = len(rows)
+            self.price = Histogram(row.price for row in rows)
+            self.latitude = Histogram(row.latitude for row in rows)
+            self.longitude = Histogram(row.longitude for row in rows)
+            self.rating = Histogram(row.rating for row in rows if row.rating is not None)
+            self._refreshed_at = time.monotonic()
+
+    def _refresh_in_background(self):
+        try:
+            with self._app.app_context():
+                self.refresh()
+        finally:
+            self._refreshing = False
+
+    def ensure_fresh(self):
+        if self._refreshed_at is None:
+            self.refresh()
+        elif time.monotonic() - self._refreshed_at > self.refresh_interval and self._app is not None:
+            with self._lock:
+                if self._refreshing:
+                    return self
+                self._refreshing = True
+            threading.Thread(target=self._refresh_in_background, daemon=True).start()
+        return self
+
+
+class PriceRange:
+    name = 'price'
+
+    def __init__(self, min_price, max_price):
+        self.min_price, self.max_price = min_price, max_price
+
+    def estimate(self, stats):
+        return stats.total * stats.price.fraction(self.min_price, self.max_price)
+
+    def criterion(self, repository):
+        return repository.price_range_filter(self.min_price, self.max_price)
+
+
+class Radius:
+    """Places within radius km of a point: a bounding box, then the exact distance."""
+    name = 'radius'
+
+    def __init__(self, latitude, longitude, radius):
+        self.latitude, self.longitude, self.radius = latitude, longitude, radius
+        delta = radius / KM_PER_DEGREE
+        self.min_latitude, self.max_latitude = max(-90.0, latitude - delta), min(90.0, latitude + delta)
+        cos = math.cos(math.radians(latitude))
+        delta_longitude = delta / cos if cos > 1e-9 else 360.0
+        if longitude - delta_longitude < -180 or longitude + delta_longitude > 180 or \
+                self.max_latitude == 90 or self.min_latitude == -90:
+            # Crosses the antimeridian or reaches a pole: keep every longitude
+            self.min_longitude, self.max_longitude = -180.0, 180.0
+        else:
+            self.min_longitude, self.max_longitude = longitude - delta_longitude, longitude + delta_longitude
+
+    def estimate(self, stats):
+        return stats.total * stats.latitude.fraction(self.min_latitude, self.max_latitude) * \
+            stats.longitude.fraction(self.min_longitude, self.max_longitude)
+
+    def criterion(self, repository):
+        return repository.box_filter(self.min_latitude, self.max_latitude,
+                                     self.min_longitude, self.max_longitude)
+
+    def check(self, place):
+        return distance_km(self.latitude, self.longitude, place.latitude, place.longitude) <= self.radius
+
+
+class Amenities:
+    name = 'amenities'
+
+    def __init__(self, groups):
+        self.groups = groups
+
+    def estimate(self, stats):
+        return min(min(stats.total, sum(amenity_index.cardinality(amenity_id) for amenity_id in group))
+                   for group in self.groups)
+
+    def criterion(self, repository):
+        return repository.amenities_filter(self.groups)
+
+    def candidates(self):
+        """Sorted ids of the matching places, read from the bitmaps when this predicate drives."""
+        return sorted(amenity_index.evaluate(self.groups))
+
+
+class MinRating:
+    name = 'rating'
+
+    def __init__(self, min_rating):
+        self.min_rating = min_rating
+
+    def estimate(self, stats):
+        return stats.rating.count * stats.rating.fraction(self.min_rating)
+
+    def criterion(self, repository):
+        return repository.min_rating_filter(self.min_rating)
+
+
+class Keywords:
+    name = 'keywords'
+
+    def __init__(self, query):
+        self.query = query
+
+    def estimate(self, stats):
+        # Exact and cheap: the full-text index counts its own matches
+        return place_fulltext.count(self.query)
+
+    def criterion(self, repository):
+        return repository.keywords_filter(self.query)
+
+
+def _elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+class PlaceSearchService:
+    """Runs combined place filters as one SELECT paged by id.
+
+    Each predicate estimates how many places it keeps from the statistics.
+    When the amenity filter keeps the fewest, the bitmaps drive: their ids
+    are sent in batches of CANDIDATE_BATCH and the other predicates filter
+    them. Otherwise every predicate is a SQL criterion and the database
+    picks the access path; explain then reports the database's own plan.
+    """
+
+    CANDIDATE_BATCH = 500
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.statistics = PlaceStatistics(repository)
+
+    def init_app(self, app):
+        """Read the statistics refresh interval."""
+        self.statistics.init_app(app)
+
+    def predicates(self, min_price=None, max_price=None, latitude=None, longitude=None, radius=None,
+                   amenities=None, min_rating=None, query=None):
+        """Build the predicates of a search; amenities are AND-of-OR groups of ids."""
+        predicates = []
+        if min_price is not None or max_price is not None:
+            predicates.append(PriceRange(min_price, max_price))
+        if radius is not None:
+            predicates.append(Radius(latitude, longitude, radius))
+        if amenities:
+            predicates.append(Amenities(amenities))
+        if min_rating is not None:
+            predicates.append(MinRating(min_rating))
+        if query:
+            predicates.append(Keywords(query))
+        return predicates
+
+    def _batch(self, candidates, after):
+        start = 0 if after is None else bisect.bisect_right(candidates, after)
+        return candidates[start:start + self.CANDIDATE_BATCH]
+
+    def _scan(self, criteria, candidates, after, batch):
+        """Yield the places matching the criteria in id order, one bounded SELECT at a time."""
+        while True:
+            among = None
+            if candidates is not None:
+                among = self._batch(candidates, after)
+                if not among:
+                    return
+            places = self.repository.get_places_page(criteria, batch, after, among)
+            yield from places
+            if among is not None and len(places) < batch:
+                after = among[-1]
+            elif len(places) < batch:
+                return
+            else:
+                after = places[-1].id
+
+    def search(self, limit=20, after=None, explain=False, **filters):
+        """Return (places, plan): one page of up to `limit` places after the id `after`.
+
+        The plan lists the estimates and the steps that ran with their
+        timings; with explain, the fetch step also holds the database's plan
+        for its first SELECT.
+        """
+        started = time.perf_counter()
+        predicates = self.predicates(**filters)
+        plan = {'estimates': [], 'driver': 'database', 'steps': []}
+        ordered = []
+        if predicates:
+            stats = self.statistics.ensure_fresh()
+            estimated = sorted(((predicate.estimate(stats), index, predicate)
+                                for index, predicate in enumerate(predicates)), key=lambda item: item[:2])
+            plan['estimates'] = [{'predicate': predicate.name, 'estimated_rows': round(estimate, 1)}
+                                 for estimate, _, predicate in estimated]
+            ordered = [predicate for _, _, predicate in estimated]
+
+        candidates = None
+        if ordered and hasattr(ordered[0], 'candidates'):
+            start = time.perf_counter()
+            driver = ordered.pop(0)
+            candidates = driver.candidates()
+            plan['driver'] = driver.name
+            plan['steps'].append({'step': driver.name, 'access': 'amenity bitmaps',
+                                  'rows': len(candidates), 'ms': _elapsed_ms(start)})
+
+        start = time.perf_counter()
+        criteria = [predicate.criterion(self.repository) for predicate in ordered]
+        checks = [predicate for predicate in predicates if hasattr(predicate, 'check')]
+        places = []
+        for place in self._scan(criteria, candidates, after, limit):
+            if all(check.check(place) for check in checks):
+                places.append(place)
+                if len(places) == limit:
+                    break
+        fetch = {'step': 'fetch', 'access': 'paged select' if predicates else 'table scan',
+                 'filters': [predicate.name for predicate in ordered],
+                 'rows': len(places), 'ms': _elapsed_ms(start)}
+        plan['steps'].append(fetch)
+        if explain:
+            among = None if candidates is None else self._batch(candidates, after)
+            fetch['query_plan'] = [] if among == [] else \
+                self.repository.explain_places_page(criteria, limit, after, among)
+        plan['total_ms'] = _elapsed_ms(started)
+        return places, plan
@@ -0,0 +1,115 @@
+import threading
+import time
+from datetime import datetime
+from app import jwt
+from app.metrics import record_cache
+from app.persistence.revoked_token_repository import RevokedTokenRepository
+from app.services.bloom_filter import BloomFilter
+
+class TokenRevocationList:
+    """Revoked JWT store fronted by an in-memory Bloom filter.
+
+    Tokens that are not in the filter are accepted without touching the
+    database; only filter hits (revoked tokens and rare false positives)
+    are confirmed against the store. The filter is rebuilt from the store
+    every REVOCATION_REBUILD_INTERVAL seconds so that revocations made by
+    other workers are picked up; after the first build this runs in one
+    background thread while requests keep using the previous filter.
+    """
+
+    def __init__(self):
+        self.repository = RevokedTokenRepository()
+        self.capacity = 100000
+        self.error_rate = 0.001
+        self.rebuild_interval = 60
+        self._filter = None
+        self._built_at = 0.0
+        self._replays = []
+        self._app = None
+        self._rebuilding = False
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def init_app(self, app):
+        """Read the filter settings and register the JWT blocklist loader; rebuilds run in this app's context."""
+        self.capacity = app.config.get('REVOCATION_BLOOM_CAPACITY', self.capacity)
+        self.error_rate = app.config.get('REVOCATION_BLOOM_ERROR_RATE', self.error_rate)
+        self.rebuild_interval = app.config.get('REVOCATION_REBUILD_INTERVAL', self.rebuild_interval)
+        self._filter = None
+        self._built_at = 0.0
+        self._app = app
+        jwt.token_in_blocklist_loader(self._check_token)
+
+    def _check_token(self, jwt_header, jwt_payload):
+        return self.is_revoked(jwt_payload['jti'])
+
+    def rebuild(self):
+        """Reload every unexpired revoked jti from the store into a new filter.
+
+        Tokens revoked while the store is read are replayed on the new
+        filter before it replaces the current one.
+        """
+        replay = []
+        with self._lock:
+            self._replays.append(replay)
+        try:
+            jtis = list(self.repository.iter_active_jtis())
+            bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+            for jti in jtis:
+                bloom.add(jti)
+            with self._lock:
+                for jti in replay:
+                    bloom.add(jti)
+                self._filter = bloom
+                self._built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._replays.remove(replay)
+
+    def _rebuild_in_background(self):
+        try:
+            with self._app.app_context():
+                self.rebuild()
+        finally:
+            self._rebuilding = False
+
+    def _current_filter(self):
+        if self._filter is None:
+            with self._build_lock:
+                if self._filter is None:
+                    self.rebuild()
+        elif time.monotonic() - self._built_at > self.rebuild_interval and self._app is not None:
+            with self._lock:
+                if self._rebuilding:
+                    return self._filter
+                self._rebuilding = True
+            threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+        return self._filter
+
+    def is_revoked(self, jti):
+        """Return True if the jti has been revoked."""
+        if jti not in self._current_filter():
+            record_cache('revocation_bloom', hit=True)
+            return False
+        record_cache('revocation_bloom', hit=False)
+        return self.repository.is_revoked(jti)
+
+    def revoke(self, jwt_payload):
+        """Revoke a decoded token until its own expiry."""
+        jti = jwt_payload['jti']
+        identity = jwt_payload.get('sub') or {}
+        self.repository.revoke(
+            jti=jti,
+            token_type=jwt_payload.get('type', 'access'),
+            user_id=identity.get('id') if isinstance(identity, dict) else identity,
+            expires_at=datetime.utcfromtimestamp(jwt_payload['exp'])
+        )
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+            for replay in self._replays:
+                replay.append(jti)
+
+    def purge_expired(self):
+        """Drop revoked tokens that have expired from the store."""
+        return self.repository.purge_expired()
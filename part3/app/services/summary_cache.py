@@ -0,0 +1,81 @@
+import threading
+import time
+from sqlalchemy import event
+from app.metrics import record_cache
+
+class OwnerSummaryCache:
+    """Per-owner TTL cache of the place summary pages.
+
+    Entries expire after OWNER_SUMMARY_CACHE_TTL seconds. Committed review
+    writes drop the pages showing the reviewed place, and committed place
+    writes drop every page of the place owner, so this worker never serves
+    stale aggregates; other workers catch up within the TTL.
+    """
+
+    def __init__(self):
+        self.ttl = 30
+        self.max_entries = 1024
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app, db):
+        """Read the cache settings and follow ORM commits."""
+        self.ttl = app.config.get('OWNER_SUMMARY_CACHE_TTL', self.ttl)
+        self.max_entries = app.config.get('OWNER_SUMMARY_CACHE_SIZE', self.max_entries)
+        self.clear()
+        if not event.contains(db.session, 'after_flush', self._after_flush):
+            event.listen(db.session, 'after_flush', self._after_flush)
+            event.listen(db.session, 'after_commit', self._after_commit)
+            event.listen(db.session, 'after_soft_rollback', self._after_rollback)
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+
+    def get(self, key):
+        """Return the cached page for key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+        record_cache('owner_summary', hit=entry is not None)
+        return entry[3] if entry is not None else None
+
+    def set(self, key, owner_id, place_ids, page):
+        """Cache a page of the owner's summary listing the given places."""
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + self.ttl, owner_id, frozenset(place_ids), page)
+
+    def invalidate(self, owner_ids=(), place_ids=()):
+        """Drop the pages of the given owners and the pages showing the given places."""
+        owner_ids, place_ids = set(owner_ids), set(place_ids)
+        with self._lock:
+            for key, (_, owner_id, places, _) in list(self._entries.items()):
+                if owner_id in owner_ids or not places.isdisjoint(place_ids):
+                    del self._entries[key]
+
+    # ORM commits
+
+    def _after_flush(self, session, flush_context):
+        from app.models.place import Place
+        from app.models.review import Review
+        pending = session.info.setdefault('owner_summary_pending', {'owners': set(), 'places': set()})
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            if isinstance(obj, Review):
+                pending['places'].add(obj.place_id)
+            elif isinstance(obj, Place):
+                pending['owners'].add(obj.owner_id)
+
+    def _after_commit(self, session):
+        if session.in_nested_transaction():
+            return  # a released savepoint; wait for the enclosing commit
+        pending = session.info.pop('owner_summary_pending', None)
+        if pending:
+            self.invalidate(pending['owners'], pending['places'])
+
+    def _after_rollback(self, session, previous_transaction):
+        if not session.in_transaction():
+            session.info.pop('owner_summary_pending', None)
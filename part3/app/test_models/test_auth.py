@@ -0,0 +1,182 @@
+import threading
+import time
+import unittest
+import uuid
+
+from sqlalchemy import event
+from app import create_app, db
+from app.models.revoked_token import RevokedToken
+from app.models.user import User
+from app.services import revocation_list
+from app.services.bloom_filter import BloomFilter
+from config import TestingConfig
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        """Toutes les clés ajoutées doivent être trouvées."""
+        bloom = BloomFilter(1000, 0.01)
+        keys = [str(uuid.uuid4()) for _ in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        self.assertEqual(len(bloom), 1000)
+
+    def test_false_positive_rate(self):
+        """Le taux de faux positifs reste proche du taux configuré."""
+        bloom = BloomFilter(1000, 0.01)
+        for _ in range(1000):
+            bloom.add(str(uuid.uuid4()))
+        false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_invalid_parameters(self):
+        """Une capacité ou un taux d'erreur invalide est refusé."""
+        with self.assertRaises(ValueError):
+            BloomFilter(0)
+        with self.assertRaises(ValueError):
+            BloomFilter(10, 1.5)
+
+
+class TestTokenRevocation(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        user = User(first_name='Dora', last_name='Explorer', email='dora@example.com')
+        user.hash_password('backpack')
+        db.session.add(user)
+        db.session.commit()
+        response = self.client.post('/api/v1/auth/login',
+                                    json={'email': 'dora@example.com', 'password': 'backpack'})
+        self.tokens = response.get_json()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def auth(self, token):
+        return {'Authorization': f'Bearer {token}'}
+
+    def test_login_returns_refresh_token(self):
+        """La connexion renvoie un access token et un refresh token."""
+        self.assertIn('access_token', self.tokens)
+        self.assertIn('refresh_token', self.tokens)
+
+    def test_refresh(self):
+        """Un refresh token permet d'obtenir un nouvel access token."""
+        response = self.client.post('/api/v1/auth/refresh', headers=self.auth(self.tokens['refresh_token']))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access_token', response.get_json())
+
+        response = self.client.post('/api/v1/auth/refresh', headers=self.auth(self.tokens['access_token']))
+        self.assertEqual(response.status_code, 422)
+
+    def test_logout_revokes_access_token(self):
+        """Un access token révoqué est refusé."""
+        response = self.client.post('/api/v1/auth/logout', headers=self.auth(self.tokens['access_token']))
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post('/api/v1/auth/logout', headers=self.auth(self.tokens['access_token']))
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_revokes_refresh_token(self):
+        """Un refresh token révoqué ne permet plus de rafraîchir."""
+        self.client.post('/api/v1/auth/logout', headers=self.auth(self.tokens['refresh_token']))
+        response = self.client.post('/api/v1/auth/refresh', headers=self.auth(self.tokens['refresh_token']))
+        self.assertEqual(response.status_code, 401)
+
+    def test_revocation_survives_rebuild(self):
+        """Le filtre reconstruit depuis la base contient les jti révoqués."""
+        self.client.post('/api/v1/auth/logout', headers=self.auth(self.tokens['access_token']))
+        revocation_list.rebuild()
+        response = self.client.post('/api/v1/auth/logout', headers=self.auth(self.tokens['access_token']))
+        self.assertEqual(response.status_code, 401)
+
+    def test_revoke_during_rebuild(self):
+        """Un jti révoqué pendant la lecture de la base est présent dans le filtre reconstruit."""
+        revocation_list.rebuild()
+        payload = {'jti': str(uuid.uuid4()), 'type': 'access', 'sub': {'id': 'x'},
+                   'exp': int(time.time()) + 900}
+        repository = revocation_list.repository
+        read = repository.iter_active_jtis
+
+        def read_then_revoke():
+            jtis = list(read())
+            revocation_list.revoke(payload)
+            return iter(jtis)
+
+        repository.iter_active_jtis = read_then_revoke
+        try:
+            revocation_list.rebuild()
+        finally:
+            del repository.iter_active_jtis
+        self.assertIn(payload['jti'], revocation_list._filter)
+        self.assertEqual(revocation_list._replays, [])
+
+    def test_single_background_rebuild(self):
+        """Un filtre périmé est reconstruit une seule fois, en arrière-plan, sans bloquer les requêtes."""
+        revocation_list.rebuild()
+        repository = revocation_list.repository
+        read = repository.iter_active_jtis
+        started, release, reads = threading.Event(), threading.Event(), []
+
+        def slow_read():
+            reads.append(1)
+            started.set()
+            release.wait(5)
+            return read()
+
+        payload = {'jti': str(uuid.uuid4()), 'type': 'access', 'sub': {'id': 'x'},
+                   'exp': int(time.time()) + 900}
+        repository.iter_active_jtis = slow_read
+        try:
+            revocation_list._built_at -= revocation_list.rebuild_interval + 1
+            self.assertFalse(revocation_list.is_revoked(str(uuid.uuid4())))
+            self.assertTrue(started.wait(5))
+            for _ in range(10):
+                self.assertFalse(revocation_list.is_revoked(str(uuid.uuid4())))
+            revocation_list.revoke(payload)
+            self.assertTrue(revocation_list.is_revoked(payload['jti']))
+            release.set()
+            deadline = time.monotonic() + 5
+            while revocation_list._rebuilding and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            release.set()
+            del repository.iter_active_jtis
+        self.assertEqual(len(reads), 1)
+        self.assertFalse(revocation_list._rebuilding)
+        self.assertIn(payload['jti'], revocation_list._filter)
+
+    def test_revoke_idempotent(self):
+        """Révoquer deux fois le même jti ne lève pas d'erreur et ne crée qu'une ligne."""
+        payload = {'jti': str(uuid.uuid4()), 'type': 'refresh', 'sub': {'id': 'x'},
+                   'exp': int(time.time()) + 900}
+        revocation_list.revoke(payload)
+        revocation_list.revoke(payload)
+        self.assertEqual(RevokedToken.query.filter_by(jti=payload['jti']).count(), 1)
+        self.assertTrue(revocation_list.is_revoked(payload['jti']))
+
+    def test_non_revoked_check_without_query(self):
+        """Un jti non révoqué est validé sans requête SQL."""
+        revocation_list.rebuild()
+        statements = []
+
+        def count(*args):
+            statements.append(args[2])
+
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            for _ in range(100):
+                self.assertFalse(revocation_list.is_revoked(str(uuid.uuid4())))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+        self.assertLessEqual(len(statements), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import random
+import time
+import unittest
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.place_amenity import place_amenity
+from app.models.user import User
+from app.persistence.bitmap import ARRAY_MAX, RoaringBitmap, parse_amenity_filter
+from app.persistence.place_repository import PlaceRepository, amenity_index
+from app.services import facade
+from config import TestingConfig
+
+class TestRoaringBitmap(unittest.TestCase):
+
+    def test_matches_set_semantics(self):
+        """Les opérations donnent le même résultat que sur des ensembles Python."""
+        rng = random.Random(7)
+        for size in (10, ARRAY_MAX + 1, 20000):
+            left = set(rng.sample(range(300000), size))
+            right = set(rng.sample(range(300000), size))
+            a, b = RoaringBitmap(left), RoaringBitmap(right)
+            self.assertEqual(list(a & b), sorted(left & right))
+            self.assertEqual(list(a | b), sorted(left | right))
+            self.assertEqual(len(a), size)
+
+    def test_add_discard(self):
+        """Les ajouts et retraits passent d'un conteneur à l'autre sans perte."""
+        bitmap = RoaringBitmap()
+        values = list(range(0, 2 * (ARRAY_MAX + 10), 2))
+        for value in values:
+            bitmap.add(value)
+        self.assertIn(values[-1], bitmap)
+        for value in values[:20]:
+            bitmap.discard(value)
+        self.assertEqual(list(bitmap), values[20:])
+        self.assertNotIn(values[0], bitmap)
+
+    def test_parse_filter(self):
+        """Les virgules signifient ET, les barres verticales OU."""
+        self.assertEqual(parse_amenity_filter('WiFi|Fiber, Pool'), [['WiFi', 'Fiber'], ['Pool']])
+        with self.assertRaises(ValueError):
+            parse_amenity_filter('WiFi,,Pool')
+
+
+class TestAmenityFilter(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        owner = User(first_name='Ana', last_name='Host', email='ana@example.com', password='x')
+        self.amenities = {name: Amenity(name=name) for name in ('WiFi', 'Pool', 'Air conditioning')}
+        db.session.add(owner)
+        db.session.add_all(self.amenities.values())
+        db.session.flush()
+        self.places = {}
+        for title, names in (('Villa', ['WiFi', 'Pool', 'Air conditioning']),
+                             ('Flat', ['WiFi']), ('Cabin', ['Pool']), ('Tent', [])):
+            place = Place(title=title, price=10, latitude=0, longitude=0, owner_id=owner.id)
+            place.amenities = [self.amenities[name] for name in names]
+            db.session.add(place)
+            self.places[title] = place
+        db.session.commit()
+        self.owner_headers = {'Authorization': 'Bearer ' + create_access_token(
+            identity={'id': owner.id, 'is_admin': False})}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def titles(self, expression):
+        response = self.client.get('/api/v1/places/', query_string={'amenities': expression})
+        self.assertEqual(response.status_code, 200)
+        return sorted(place['title'] for place in response.get_json())
+
+    def test_and_or(self):
+        """Les filtres ET/OU se combinent, par nom ou par id."""
+        self.assertEqual(self.titles('WiFi,Pool,Air conditioning'), ['Villa'])
+        self.assertEqual(self.titles('WiFi|Pool'), ['Cabin', 'Flat', 'Villa'])
+        self.assertEqual(self.titles(f"{self.amenities['Pool'].id},WiFi|Air conditioning"), ['Villa'])
+        response = self.client.get('/api/v1/places/')
+        self.assertEqual(len(response.get_json()), 4)
+
+    def test_unknown_amenity(self):
+        """Une amenity inconnue est refusée."""
+        response = self.client.get('/api/v1/places/?amenities=WiFi,Sauna')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Sauna', response.get_json()['error'])
+
+    def test_follows_commits(self):
+        """L'index suit les ajouts, retraits, suppressions et ignore les rollbacks."""
+        self.assertEqual(self.titles('WiFi,Pool'), ['Villa'])
+        repository = PlaceRepository()
+        repository.add_amenity_to_place(self.places['Flat'].id, self.amenities['Pool'])
+        self.assertEqual(self.titles('WiFi,Pool'), ['Flat', 'Villa'])
+        repository.remove_amenity_from_place(self.places['Villa'].id, self.amenities['WiFi'])
+        self.assertEqual(self.titles('WiFi,Pool'), ['Flat'])
+        self.places['Tent'].amenities.append(self.amenities['WiFi'])
+        db.session.flush()
+        db.session.rollback()
+        self.assertEqual(self.titles('WiFi'), ['Flat'])
+        facade.delete_place(self.places['Flat'].id)
+        self.assertEqual(self.titles('WiFi|Pool'), ['Cabin', 'Villa'])
+
+    def test_add_amenities_endpoint(self):
+        """L'ajout d'amenities via l'API est enregistré et indexé."""
+        self.assertEqual(self.titles('Air conditioning'), ['Villa'])
+        response = self.client.post(f"/api/v1/places/{self.places['Tent'].id}/amenities",
+                                    json=[{'id': self.amenities['Air conditioning'].id}],
+                                    headers=self.owner_headers)
+        self.assertEqual(response.status_code, 200)
+        db.session.remove()
+        self.assertEqual(self.titles('Air conditioning'), ['Tent', 'Villa'])
+        amenity_index.invalidate()
+        self.assertEqual(self.titles('Air conditioning'), ['Tent', 'Villa'])
+
+    def test_paged_amenity_filter(self):
+        """Le filtre d'amenities du facade renvoie des pages ordonnées par id."""
+        expected = sorted(place.id for place in self.places.values() if place.title != 'Tent')
+        first = facade.get_places_with_amenities('WiFi|Pool', limit=2)
+        second = facade.get_places_with_amenities('WiFi|Pool', limit=2, after=first[-1].id)
+        self.assertEqual([place.id for place in first + second], expected)
+
+    def test_background_rebuild(self):
+        """Un index périmé est rechargé en arrière-plan, hors de la requête."""
+        self.assertEqual(self.titles('Air conditioning'), ['Villa'])
+        db.session.execute(place_amenity.insert(), {'place_id': self.places['Tent'].id,
+                                                    'amenity_id': self.amenities['Air conditioning'].id})
+        db.session.commit()
+        amenity_index._built_at -= amenity_index.rebuild_interval + 1
+        self.titles('Air conditioning')
+        deadline = time.monotonic() + 5
+        while amenity_index._rebuilding and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.titles('Air conditioning'), ['Tent', 'Villa'])
+
+    def test_changes_during_rebuild_replayed(self):
+        """Les changements appliqués pendant la lecture d'un rechargement ne sont pas perdus."""
+        tent, pool = self.places['Tent'].id, self.amenities['Pool'].id
+
+        def concurrent_commit(conn, cursor, statement, *args):
+            if 'FROM place_amenity' in statement:
+                amenity_index.add(tent, [pool])
+
+        event.listen(db.engine, 'before_cursor_execute', concurrent_commit, once=True)
+        amenity_index.rebuild()
+        self.assertIn(tent, amenity_index.evaluate([[pool]]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import gzip
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from app import create_app, db
+from app.cli.data import prefetch
+from app.models import User, Place, Review, Amenity
+from config import TestingConfig
+
+class TestDataExportImport(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.runner = self.app.test_cli_runner()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+        owner = User(first_name='Alice', last_name='Smith', email='alice@example.com', is_admin=True)
+        owner.hash_password('secret')
+        guest = User(first_name='Bob', last_name='Jones', email='bob@example.com')
+        guest.hash_password('secret')
+        wifi = Amenity(name='Wi-Fi')
+        place = Place(title='Loft', description='Sea view', price=80, latitude=43.3, longitude=5.4, owner=owner)
+        place.amenities.append(wifi)
+        review = Review(text='Great stay', rating=5, place=place, user=guest)
+        db.session.add_all([owner, guest, wifi, place, review])
+        db.session.commit()
+        self.place_id = place.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        self.tmpdir.cleanup()
+
+    def test_export_then_restore(self):
+        """Un export restauré redonne les mêmes données."""
+        result = self.runner.invoke(args=['data', 'export', self.tmpdir.name])
+        self.assertEqual(result.exit_code, 0, result.output)
+        with open(os.path.join(self.tmpdir.name, 'manifest.json')) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest['tables']['users']['rows'], 2)
+        self.assertEqual(manifest['tables']['place_amenity']['rows'], 1)
+
+        result = self.runner.invoke(args=['data', 'import', self.tmpdir.name])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn('not empty', result.output)
+
+        result = self.runner.invoke(args=['data', 'import', self.tmpdir.name, '--replace', '--chunk-size', '1'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        db.session.expire_all()
+
+        place = db.session.get(Place, self.place_id)
+        self.assertEqual(place.title, 'Loft')
+        self.assertEqual(place.owner.email, 'alice@example.com')
+        self.assertEqual([a.name for a in place.amenities], ['Wi-Fi'])
+        self.assertEqual(place.reviews[0].user.email, 'bob@example.com')
+        self.assertIsNotNone(place.created_at)
+        self.assertTrue(User.query.filter_by(email='alice@example.com').first().verify_password('secret'))
+        self.assertEqual(Review.query.count(), 1)
+
+    def test_orphan_rows_roll_back_replace(self):
+        """Une ligne orpheline fait échouer l'import, qui annule aussi la suppression."""
+        result = self.runner.invoke(args=['data', 'export', self.tmpdir.name])
+        self.assertEqual(result.exit_code, 0, result.output)
+        path = os.path.join(self.tmpdir.name, 'reviews.jsonl.gz')
+        with open(os.path.join(self.tmpdir.name, 'manifest.json')) as f:
+            columns = json.load(f)['tables']['reviews']['columns']
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            row = json.loads(f.readline())
+        row[columns.index('place_id')] = 'missing-place'
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps(row) + "\n")
+
+        result = self.runner.invoke(args=['data', 'import', self.tmpdir.name, '--replace'])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn('reviews -> places', result.output)
+        db.session.expire_all()
+        self.assertEqual(User.query.count(), 2)
+        self.assertEqual(Review.query.one().place_id, self.place_id)
+
+    def test_prefetch_stops_with_consumer(self):
+        """Le thread de lecture s'arrête et ferme l'itérateur quand le consommateur s'arrête."""
+        closed = threading.Event()
+
+        def items():
+            try:
+                yield from range(100)
+            finally:
+                closed.set()
+
+        chunks = prefetch(items(), depth=1)
+        self.assertEqual(next(chunks), 0)
+        chunks.close()
+        self.assertTrue(closed.is_set())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from sqlalchemy import func
+from app import create_app, db
+from app.cli.seed import SyntheticDataGenerator
+from app.models import User, Place, Review, Amenity, place_amenity
+from config import TestingConfig
+
+class TestSyntheticDataGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_generated_volumes(self):
+        """Le générateur insère les volumes demandés."""
+        counts = SyntheticDataGenerator.from_scale('tiny').generate(db.engine, chunk_size=64)
+        self.assertEqual(User.query.count(), 100)
+        self.assertEqual(Amenity.query.count(), 20)
+        self.assertEqual(Place.query.count(), 200)
+        self.assertEqual(counts['reviews'], Review.query.count())
+        self.assertAlmostEqual(Review.query.count(), 1000, delta=100)
+        self.assertEqual(counts['place_amenity'], db.session.query(place_amenity).count())
+
+    def test_reviews_constraints(self):
+        """Pas de doublon (place, user) ni d'avis du propriétaire."""
+        SyntheticDataGenerator.from_scale('tiny').generate(db.engine)
+        duplicates = db.session.query(Review.place_id, Review.user_id).group_by(
+            Review.place_id, Review.user_id).having(func.count() > 1).count()
+        self.assertEqual(duplicates, 0)
+        own_reviews = Review.query.join(Place, Place.id == Review.place_id).filter(
+            Place.owner_id == Review.user_id).count()
+        self.assertEqual(own_reviews, 0)
+
+    def test_deterministic(self):
+        """Une même graine produit les mêmes lignes."""
+        first = SyntheticDataGenerator(users=20, amenities=5, places=30, reviews=50, seed=7)
+        second = SyntheticDataGenerator(users=20, amenities=5, places=30, reviews=50, seed=7)
+        other = SyntheticDataGenerator(users=20, amenities=5, places=30, reviews=50, seed=8)
+        self.assertEqual(list(first.iter_places()), list(second.iter_places()))
+        self.assertEqual(list(first.iter_reviews()), list(second.iter_reviews()))
+        self.assertNotEqual(list(first.iter_places()), list(other.iter_places()))
+
+    def test_seed_command(self):
+        """La commande flask seed remplit la base."""
+        runner = self.app.test_cli_runner()
+        result = runner.invoke(args=['seed', '--users', '10', '--places', '15', '--reviews', '20'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(User.query.count(), 10)
+        self.assertEqual(Place.query.count(), 15)
+
+if __name__ == '__main__':
+    unittest.main()
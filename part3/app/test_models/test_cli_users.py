@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import unittest
+
+from app import create_app, db
+from app.models.user import User
+from config import TestingConfig
+
+class TestUserImportCommand(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.runner = self.app.test_cli_runner()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        existing = User(first_name='Ada', last_name='Lovelace', email='ada@example.com')
+        existing.hash_password('engine')
+        db.session.add(existing)
+        db.session.commit()
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        self.tmpdir.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_import_csv(self):
+        """Import CSV : doublons et lignes invalides sont ignorés."""
+        path = self.write('users.csv', (
+            "first_name,last_name,email,password,is_admin\n"
+            "Grace,Hopper,grace@example.com,cobol,true\n"
+            "Alan,Turing,alan@example.com,enigma,\n"
+            "Alan,Turing,alan@example.com,enigma,\n"
+            "Ada,Lovelace,ada@example.com,engine,\n"
+            "Bad,Email,not-an-email,secret,\n"
+            "No,Password,nopass@example.com,,\n"
+        ))
+        result = self.runner.invoke(args=['users', 'import', path, '--chunk-size', '2', '--workers', '1'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Done: 2 imported, 2 duplicates, 2 rejected', result.output)
+
+        self.assertEqual(User.query.count(), 3)
+        grace = User.query.filter_by(email='grace@example.com').first()
+        self.assertTrue(grace.is_admin)
+        self.assertTrue(grace.verify_password('cobol'))
+        self.assertFalse(User.query.filter_by(email='alan@example.com').first().is_admin)
+
+    def test_import_jsonl_with_process_pool(self):
+        """Import JSONL avec hachage dans un pool de processus."""
+        lines = [json.dumps({'first_name': f'User{i}', 'last_name': 'Test',
+                             'email': f'user{i}@example.com', 'password': f'pw{i}'})
+                 for i in range(6)]
+        path = self.write('users.jsonl', "\n".join(lines) + "\n")
+        result = self.runner.invoke(args=['users', 'import', path, '--workers', '2'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(User.query.count(), 7)
+        self.assertTrue(User.query.filter_by(email='user5@example.com').first().verify_password('pw5'))
+
+    def test_import_jsonl_malformed_lines(self):
+        """Les lignes JSON invalides ou qui ne sont pas des objets sont rejetées, sans arrêter l'import."""
+        path = self.write('users.jsonl', "\n".join([
+            json.dumps({'first_name': 'Grace', 'last_name': 'Hopper',
+                        'email': 'grace@example.com', 'password': 'cobol'}),
+            '{"first_name": "Broken"',
+            '["not", "an", "object"]',
+            '42',
+            json.dumps({'first_name': 'Alan', 'last_name': 'Turing',
+                        'email': 'alan@example.com', 'password': 'enigma'}),
+        ]) + "\n")
+        result = self.runner.invoke(args=['users', 'import', path, '--workers', '1'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Done: 2 imported, 0 duplicates, 3 rejected', result.output)
+        self.assertIn('line 2: Invalid JSON', result.output)
+        self.assertIn('line 3: Record must be a JSON object', result.output)
+        self.assertEqual(User.query.count(), 3)
+
+    def test_import_jsonl_wrong_types(self):
+        """Un email, un mot de passe ou un nom qui n'est pas une chaîne rejette la ligne, sans arrêter l'import."""
+        records = [
+            {'first_name': 'Bad', 'last_name': 'Email', 'email': 5, 'password': 'x'},
+            {'first_name': 'Bad', 'last_name': 'Password', 'email': 'pw@example.com', 'password': 12345},
+            {'first_name': ['Bad'], 'last_name': 'Name', 'email': 'name@example.com', 'password': 'x'},
+            {'first_name': 'Grace', 'last_name': 'Hopper', 'email': 'grace@example.com', 'password': 'cobol'},
+        ]
+        path = self.write('users.jsonl', "\n".join(json.dumps(record) for record in records) + "\n")
+        result = self.runner.invoke(args=['users', 'import', path, '--workers', '1'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Done: 1 imported, 0 duplicates, 3 rejected', result.output)
+        self.assertIn('line 1: email must be a string', result.output)
+        self.assertIn('line 2: password must be a string', result.output)
+        self.assertTrue(User.query.filter_by(email='grace@example.com').first().verify_password('cobol'))
+
+    def test_import_prehashed(self):
+        """Les mots de passe déjà hachés sont conservés tels quels."""
+        user = User(first_name='Tmp', last_name='Tmp', email='tmp@example.com')
+        user.hash_password('hashed-elsewhere')
+        path = self.write('users.jsonl', json.dumps({
+            'first_name': 'Linus', 'last_name': 'Torvalds',
+            'email': 'linus@example.com', 'password': user.password
+        }) + "\n")
+        result = self.runner.invoke(args=['users', 'import', path, '--prehashed'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        linus = User.query.filter_by(email='linus@example.com').first()
+        self.assertTrue(linus.verify_password('hashed-elsewhere'))
+
+if __name__ == '__main__':
+    unittest.main()
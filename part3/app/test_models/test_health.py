@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+from app import create_app, db
+from config import TestingConfig
+
+class TestHealth(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+        class PoolConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(self.tmpdir.name, 'health.db')
+            SQLALCHEMY_ENGINE_OPTIONS = {'pool_size': 2, 'max_overflow': 0, 'pool_timeout': 1}
+
+        self.app = create_app(PoolConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+        self.tmpdir.cleanup()
+
+    def test_live(self):
+        """La sonde de vie répond toujours."""
+        response = self.client.get('/health/live')
+        self.assertEqual(response.status_code, 200)
+
+    def test_ready_reports_pool(self):
+        """La sonde de disponibilité décrit le pool."""
+        response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, 200)
+        pool = response.get_json()['pools']['default']
+        self.assertEqual(pool['class'], 'QueuePool')
+        self.assertEqual(pool['size'], 2)
+        self.assertEqual(pool['capacity'], 2)
+
+    def test_ready_rejects_exhausted_pool(self):
+        """Un pool épuisé rend le service indisponible (503)."""
+        held = [db.engine.connect(), db.engine.connect()]
+        try:
+            response = self.client.get('/health/ready')
+            self.assertEqual(response.status_code, 503)
+            data = response.get_json()
+            self.assertEqual(data['status'], 'unavailable')
+            self.assertEqual(data['pools']['default']['utilization'], 1.0)
+        finally:
+            for conn in held:
+                conn.close()
+        self.assertEqual(self.client.get('/health/ready').status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
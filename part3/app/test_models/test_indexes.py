@@ -0,0 +1,81 @@
+import unittest
+
+from sqlalchemy import event
+from app import create_app, db
+from app.persistence.place_repository import PlaceRepository
+from app.persistence.review_repository import ReviewRepository
+from app.services import facade
+from config import TestingConfig
+
+class TestQueryIndexes(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def query_plans(self, func, *args):
+        """Run func and return the EXPLAIN QUERY PLAN of every SELECT it issued."""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT'):
+                statements.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            func(*args)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        self.assertTrue(statements)
+        connection = db.session.connection().connection
+        return [
+            [row[3] for row in connection.execute('EXPLAIN QUERY PLAN ' + statement, parameters)]
+            for statement, parameters in statements
+        ]
+
+    def assertUsesIndex(self, func, *args):
+        for plan in self.query_plans(func, *args):
+            scans = [step for step in plan if step.startswith('SCAN')]
+            self.assertEqual(scans, [], plan)
+            self.assertTrue(any('INDEX' in step or 'PRIMARY KEY' in step for step in plan), plan)
+
+    def test_reviews_by_place(self):
+        """Les reviews d'un lieu sont lues via un index."""
+        self.assertUsesIndex(ReviewRepository().get_reviews_by_place, 'place')
+
+    def test_reviews_by_user(self):
+        """Les reviews d'un utilisateur sont lues via un index."""
+        self.assertUsesIndex(ReviewRepository().get_reviews_by_user, 'user')
+
+    def test_reviews_by_place_and_rating(self):
+        """Le filtre de note d'un lieu est servi par l'index (place_id, rating)."""
+        plans = self.query_plans(ReviewRepository().search_reviews, 'place', 1, 2)
+        self.assertIn('ix_reviews_place_id_rating', plans[0][0])
+
+    def test_review_by_place_and_user(self):
+        """La review d'un utilisateur sur un lieu est lue via l'index unique."""
+        self.assertUsesIndex(facade.get_review_by_place_and_user, 'place', 'user')
+
+    def test_places_by_owner(self):
+        """Les lieux d'un propriétaire sont lus via un index."""
+        self.assertUsesIndex(PlaceRepository().get_places_by_owner, 'owner')
+
+    def test_places_by_price_and_box(self):
+        """Les chemins d'accès de la recherche de lieux utilisent les index prix et latitude."""
+        repository = PlaceRepository()
+        self.assertUsesIndex(repository.get_places_page, [repository.price_range_filter(10, 20)])
+        self.assertUsesIndex(repository.get_places_page, [repository.box_filter(48, 49, 2, 3)])
+
+    def test_places_with_amenity(self):
+        """Les lieux ayant une amenity sont lus via un index."""
+        self.assertUsesIndex(PlaceRepository().get_places_with_amenity, 'amenity')
+
+if __name__ == '__main__':
+    unittest.main()
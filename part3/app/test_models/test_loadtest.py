@@ -0,0 +1,69 @@
+import random
+import unittest
+
+import loadtest
+from loadtest import Recorder, VirtualUser, compare, percentile
+
+class TestPercentile(unittest.TestCase):
+
+    def test_nearest_rank(self):
+        """Le rang le plus proche est ceil(p/100 * n), sans décalage d'un rang."""
+        values = list(range(1, 11))
+        self.assertEqual(percentile(values, 50), 5)
+        self.assertEqual(percentile(values, 95), 10)
+        self.assertEqual(percentile(list(range(1, 101)), 99), 99)
+        self.assertEqual(percentile(list(range(1, 21)), 95), 19)
+        self.assertEqual(percentile(values, 100), 10)
+        self.assertEqual(percentile(values, 0), 1)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertEqual(percentile([], 50), 0.0)
+
+class TestCompare(unittest.TestCase):
+
+    def entry(self, p50=10, p95=20, p99=30, rps=100, errors=0):
+        return {'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99, 'requests': 1000,
+                'errors': errors, 'throughput_rps': rps}
+
+    def test_within_threshold(self):
+        """Aucune régression sous le seuil."""
+        baseline = {'endpoints': {'GET /places/': self.entry()}}
+        report = {'endpoints': {'GET /places/': self.entry(p95=23, rps=85)}}
+        self.assertEqual(compare(report, baseline, 0.2), [])
+
+    def test_regressions(self):
+        """Latence, débit, erreurs et endpoints manquants sont signalés."""
+        baseline = {'endpoints': {'GET /places/': self.entry(), 'POST /reviews/': self.entry()}}
+        report = {'endpoints': {'GET /places/': self.entry(p95=25, rps=70, errors=2)}}
+        regressions = compare(report, baseline, 0.2)
+        self.assertEqual(len(regressions), 4)
+        self.assertTrue(regressions[0].startswith('GET /places/ p95_ms: 25 > 20'))
+        self.assertTrue(regressions[1].startswith('GET /places/ throughput'))
+        self.assertTrue(regressions[2].startswith('GET /places/ errors'))
+        self.assertEqual(regressions[3], 'POST /reviews/: missing from this run')
+
+    def test_zero_baseline_latency_ignored(self):
+        """Une latence de référence nulle ne produit pas de régression."""
+        baseline = {'endpoints': {'GET /places/': self.entry(p50=0)}}
+        report = {'endpoints': {'GET /places/': self.entry(p50=5)}}
+        self.assertEqual(compare(report, baseline, 0.2), [])
+
+class TestTokenRefresh(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.base_url = loadtest.serve_in_process()
+
+    def test_access_token_renewed(self):
+        """Un jeton d'accès trop ancien est renouvelé avant le scénario suivant."""
+        recorder = Recorder()
+        vu = VirtualUser(self.base_url, recorder, ['unknown-place'], random.Random(0))
+        token = vu.client.token
+        vu.token_refreshed_at -= loadtest.TOKEN_REFRESH_AFTER + 1
+        vu.run_scenario('browse_places')
+        self.assertNotEqual(vu.client.token, token)
+        self.assertNotIn('POST /auth/refresh', recorder.samples)
+        status, _ = vu.client.request('GET', f'/api/v1/users/{vu.user_id}', None)
+        self.assertEqual(status, 200)
+
+if __name__ == '__main__':
+    unittest.main()
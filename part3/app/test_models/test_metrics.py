@@ -0,0 +1,80 @@
+import threading
+import unittest
+
+from app import create_app, db
+from app.metrics import Counter, Histogram, MetricsRegistry
+from config import TestingConfig
+
+class TestMetricTypes(unittest.TestCase):
+
+    def test_counter_thread_safe(self):
+        """Les incréments concurrents ne sont pas perdus."""
+        counter = Counter('test_total', 'Test counter', ('worker',))
+
+        def work():
+            for _ in range(10000):
+                counter.inc(worker='a')
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counter.value(worker='a'), 80000)
+
+    def test_counter_requires_labels(self):
+        """Un label manquant est refusé."""
+        counter = Counter('test_total', 'Test counter', ('worker',))
+        with self.assertRaises(ValueError):
+            counter.inc()
+
+    def test_histogram_exposition(self):
+        """Les buckets d'un histogramme sont cumulatifs."""
+        registry = MetricsRegistry()
+        histogram = registry.register(Histogram('test_seconds', 'Test histogram', buckets=(0.1, 1.0)))
+        for value in (0.05, 0.5, 0.5, 3.0):
+            histogram.observe(value)
+        text = registry.render()
+        self.assertIn('# TYPE test_seconds histogram', text)
+        self.assertIn('test_seconds_bucket{le="0.1"} 1.0', text)
+        self.assertIn('test_seconds_bucket{le="1.0"} 3.0', text)
+        self.assertIn('test_seconds_bucket{le="+Inf"} 4.0', text)
+        self.assertIn('test_seconds_sum 4.05', text)
+        self.assertIn('test_seconds_count 4.0', text)
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_metrics_endpoint(self):
+        """/metrics expose les compteurs HTTP, bcrypt et pool."""
+        self.client.post('/api/v1/users/', json={
+            'first_name': 'Eve', 'last_name': 'Metrics', 'email': 'eve@example.com', 'password': 'secret'
+        })
+        self.client.get('/api/v1/users/')
+        self.client.get('/api/v1/users/does-not-exist')
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        text = response.get_data(as_text=True)
+        self.assertIn('hbnb_http_requests_total{method="GET",route="/api/v1/users/",status="200"}', text)
+        self.assertIn('hbnb_http_requests_total{method="GET",route="/api/v1/users/<user_id>",status="404"}', text)
+        self.assertIn('hbnb_http_request_duration_seconds_bucket{method="POST",route="/api/v1/users/",le="+Inf"}', text)
+        self.assertIn('hbnb_http_requests_in_flight 1.0', text)
+        self.assertIn('hbnb_bcrypt_duration_seconds_count{operation="hash"}', text)
+        self.assertIn('hbnb_db_pool_connection_hold_seconds_count', text)
+
+if __name__ == '__main__':
+    unittest.main()
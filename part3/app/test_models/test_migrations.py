@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import inspect
+from app import create_app, db
+from app.models.types import ID_STORAGE
+from app.persistence import fulltext
+from config import TestingConfig
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'migrations')
+
+@unittest.skipIf(ID_STORAGE == 'binary', "les migrations créent des identifiants texte")
+class TestMigrations(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+        class MigrationConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(self.tmpdir.name, 'migrations.db')
+
+        self.app = create_app(MigrationConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+        self.tmpdir.cleanup()
+
+    def test_upgrade_matches_models(self):
+        """Les migrations produisent exactement le schéma des modèles."""
+        upgrade(directory=MIGRATIONS)
+        with db.engine.connect() as conn:
+            context = MigrationContext.configure(conn, opts={'include_name': fulltext.include_name})
+            diff = compare_metadata(context, db.metadata)
+        self.assertEqual(diff, [])
+        indexes = {index['name'] for index in inspect(db.engine).get_indexes('reviews')}
+        self.assertIn('ix_reviews_user_id', indexes)
+        tables = inspect(db.engine).get_table_names()
+        self.assertIn('places_fts', tables)
+        self.assertIn('reviews_fts', tables)
+
+    def test_upgrade_from_initial_schema(self):
+        """Une base au schéma initial reçoit ensuite les contraintes et les index."""
+        upgrade(directory=MIGRATIONS, revision='929b38cb1aaa')
+        self.assertEqual(inspect(db.engine).get_indexes('reviews'), [])
+        self.assertEqual(inspect(db.engine).get_unique_constraints('reviews'), [])
+        self.assertNotIn('revoked_tokens', inspect(db.engine).get_table_names())
+        upgrade(directory=MIGRATIONS)
+        unique = [constraint['name'] for constraint in inspect(db.engine).get_unique_constraints('reviews')]
+        self.assertEqual(unique, ['uq_reviews_place_user'])
+        checks = {constraint['name'] for constraint in inspect(db.engine).get_check_constraints('places')}
+        self.assertEqual(checks, {'ck_places_price', 'ck_places_latitude', 'ck_places_longitude'})
+
+    def test_downgrade_to_base(self):
+        """Le retour à la base supprime toutes les tables."""
+        upgrade(directory=MIGRATIONS)
+        downgrade(directory=MIGRATIONS, revision='base')
+        self.assertEqual(inspect(db.engine).get_table_names(), ['alembic_version'])
+
+if __name__ == '__main__':
+    unittest.main()
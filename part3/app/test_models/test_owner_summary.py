@@ -0,0 +1,111 @@
+import unittest
+
+from sqlalchemy import event
+from app import create_app, db
+from app.api.v1.pagination import encode_cursor
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.services import facade
+from config import TestingConfig
+
+class TestOwnerSummary(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.owner = User(first_name='Ana', last_name='Host', email='ana@example.com', password='x')
+        self.guests = [User(first_name='Guest', last_name=str(i), email=f'guest{i}@example.com', password='x')
+                       for i in range(3)]
+        db.session.add_all([self.owner] + self.guests)
+        db.session.flush()
+        self.places = []
+        for i in range(3):
+            place = Place(title=f'Place {i}', price=50 + i, latitude=0, longitude=0, owner_id=self.owner.id)
+            db.session.add(place)
+            self.places.append(place)
+        db.session.flush()
+        for guest, rating in zip(self.guests[:2], (4, 1)):
+            db.session.add(Review(text=f'rated {rating}', rating=rating, place_id=self.places[0].id,
+                                  user_id=guest.id))
+            db.session.flush()
+        db.session.commit()
+        self.url = f'/api/v1/users/{self.owner.id}/places/summary'
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def get(self, **params):
+        response = self.client.get(self.url, query_string=params)
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def count_selects(self, func):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT'):
+                statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            func()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        return len(statements)
+
+    def test_aggregates(self):
+        """Le résumé donne le nombre de reviews, la moyenne et la dernière review."""
+        results = {place['title']: place for place in self.get()['results']}
+        self.assertEqual(results['Place 0']['review_count'], 2)
+        self.assertEqual(results['Place 0']['average_rating'], 2.5)
+        self.assertEqual(results['Place 0']['latest_review']['text'], 'rated 1')
+        self.assertEqual(results['Place 1']['review_count'], 0)
+        self.assertIsNone(results['Place 1']['average_rating'])
+        self.assertIsNone(results['Place 1']['latest_review'])
+
+    def test_single_query(self):
+        """Une page est calculée en une seule requête SQL, puis servie depuis le cache."""
+        summary = lambda: facade.get_owner_place_summary(self.owner.id)
+        self.assertEqual(self.count_selects(summary), 1)
+        self.assertEqual(self.count_selects(summary), 0)
+
+    def test_pagination(self):
+        """Les curseurs parcourent tous les lieux du propriétaire."""
+        first = self.get(limit=2)
+        self.assertEqual(len(first['results']), 2)
+        second = self.get(limit=2, cursor=first['next_cursor'])
+        self.assertEqual(len(second['results']), 1)
+        self.assertIsNone(second['next_cursor'])
+        self.assertEqual(self.client.get(self.url + '?cursor=garbage').status_code, 400)
+        for values in ([{'a': 1}], [[1]], [5], [None]):
+            response = self.client.get(self.url, query_string={'cursor': encode_cursor(values)})
+            self.assertEqual(response.status_code, 400, values)
+        self.assertEqual(self.client.get('/api/v1/users/unknown/places/summary').status_code, 404)
+
+    def test_review_writes_invalidate(self):
+        """Une nouvelle review ou un nouveau lieu invalide le cache du propriétaire."""
+        self.get()
+        facade.create_review({'text': 'great', 'rating': 5, 'place_id': self.places[1].id,
+                              'user_id': self.guests[2].id})
+        results = {place['title']: place for place in self.get()['results']}
+        self.assertEqual(results['Place 1']['review_count'], 1)
+        self.assertEqual(results['Place 1']['latest_review']['text'], 'great')
+        facade.create_place({'title': 'Place 3', 'price': 10, 'latitude': 0, 'longitude': 0,
+                             'owner_id': self.owner.id})
+        self.assertEqual(len(self.get()['results']), 4)
+
+    def test_ttl(self):
+        """Les entrées expirent après le TTL."""
+        facade.summary_cache.ttl = -1
+        summary = lambda: facade.get_owner_place_summary(self.owner.id)
+        self.assertEqual(self.count_selects(summary), 1)
+        self.assertEqual(self.count_selects(summary), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.place_repository import PlaceRepository, amenity_index
+from app.services import facade
+from config import TestingConfig
+
+class TestPlaceAmenities(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        owner = User(first_name='Ana', last_name='Host', email='ana@example.com', password='x')
+        other = User(first_name='Bob', last_name='Guest', email='bob@example.com', password='x')
+        self.amenities = {name: Amenity(name=name) for name in ('WiFi', 'Pool', 'Sauna')}
+        db.session.add_all([owner, other] + list(self.amenities.values()))
+        db.session.flush()
+        self.place = Place(title='Flat', price=50, latitude=0, longitude=0, owner_id=owner.id)
+        self.place.amenities = [self.amenities['WiFi']]
+        db.session.add(self.place)
+        db.session.commit()
+        self.ids = {name: amenity.id for name, amenity in self.amenities.items()}
+        self.url = f'/api/v1/places/{self.place.id}/amenities'
+        self.owner_headers = {'Authorization': 'Bearer ' + create_access_token(
+            identity={'id': owner.id, 'is_admin': False})}
+        self.other_headers = {'Authorization': 'Bearer ' + create_access_token(
+            identity={'id': other.id, 'is_admin': False})}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def names(self):
+        return sorted(amenity.name for amenity in self.place.amenities)
+
+    def indexed(self, name):
+        return amenity_index.evaluate([[self.ids[name]]]) == [self.place.id]
+
+    def payload(self, *names):
+        return [{'id': self.ids[name]} for name in names]
+
+    def statements(self, func, *args):
+        recorded = []
+        record = lambda conn, cursor, statement, *rest: recorded.append(statement.split()[0].upper())
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            func(*args)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        return recorded
+
+    def test_set_based_statements(self):
+        """Le remplacement coûte un INSERT et un DELETE, quel que soit le nombre d'amenities."""
+        self.assertTrue(self.indexed('WiFi'))
+        statements = self.statements(PlaceRepository().set_amenities, self.place.id,
+                                     [self.ids['Pool'], self.ids['Sauna'], self.ids['Pool']])
+        self.assertEqual(statements, ['INSERT', 'DELETE'])
+        self.assertEqual(self.names(), ['Pool', 'Sauna'])
+        self.assertFalse(self.indexed('WiFi'))
+        self.assertTrue(self.indexed('Sauna'))
+        statements = self.statements(PlaceRepository().attach_amenities, self.place.id,
+                                     [self.ids['Pool'], self.ids['WiFi']])
+        self.assertEqual(statements, ['INSERT'])
+        self.assertEqual(self.names(), ['Pool', 'Sauna', 'WiFi'])
+
+    def test_endpoints(self):
+        """PUT remplace, DELETE retire et POST ajoute les amenities du lieu."""
+        response = self.client.put(self.url, json=self.payload('Pool', 'Sauna'), headers=self.owner_headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.names(), ['Pool', 'Sauna'])
+        response = self.client.delete(self.url, json=self.payload('Pool', 'WiFi'), headers=self.owner_headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.names(), ['Sauna'])
+        self.assertFalse(self.indexed('Pool'))
+        response = self.client.post(self.url, json=self.payload('WiFi', 'Sauna'), headers=self.owner_headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.names(), ['Sauna', 'WiFi'])
+        self.assertTrue(self.indexed('WiFi'))
+
+    def test_rejected_requests(self):
+        """Les amenities inconnues, les non-propriétaires et les corps invalides sont refusés."""
+        response = self.client.put(self.url, json=[{'id': 'unknown'}], headers=self.owner_headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error'], 'Amenity unknown not found')
+        response = self.client.put(self.url, json=self.payload('Pool'), headers=self.other_headers)
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post(self.url, json=self.payload('Pool'), headers=self.other_headers)
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post(self.url, json=self.payload('Pool'))
+        self.assertEqual(response.status_code, 401)
+        response = self.client.delete(self.url, json={'id': 'x'}, headers=self.owner_headers)
+        self.assertEqual(response.status_code, 400)
+        response = self.client.put('/api/v1/places/unknown/amenities', json=[], headers=self.owner_headers)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.names(), ['WiFi'])
+
+    def test_unit_of_work_rollback(self):
+        """Un rollback annule les changements en base et dans l'index."""
+        with self.assertRaises(ValueError):
+            with facade.transaction():
+                facade.set_place_amenities(self.place.id, [self.ids['Pool']])
+                facade.attach_amenities(self.place.id, ['unknown'])
+        self.assertEqual(self.names(), ['WiFi'])
+        self.assertTrue(self.indexed('WiFi'))
+        self.assertFalse(self.indexed('Pool'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import time
+import unittest
+
+from sqlalchemy import text
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.services import facade
+from app.services.place_search import Histogram, Radius, distance_km
+from config import TestingConfig
+
+# title, price, latitude, longitude, amenities, ratings
+PLACES = [
+    ('Paris loft', 120, 48.8566, 2.3522, ['WiFi', 'Pool'], [5, 4]),
+    ('Paris studio', 60, 48.8600, 2.3400, ['WiFi'], [3]),
+    ('Versailles house', 200, 48.8049, 2.1204, ['Pool'], [4]),
+    ('Lyon flat', 80, 45.7640, 4.8357, ['WiFi'], [2]),
+    ('New York loft', 300, 40.7128, -74.0060, ['WiFi', 'Pool'], [5]),
+    ('Fiji hut', 90, -17.7134, 179.9, [], []),
+    ('Samoa hut', 95, -13.8, -179.9, [], [1]),
+]
+
+class TestHistogram(unittest.TestCase):
+
+    def test_fraction(self):
+        """Les histogrammes estiment la part des valeurs dans un intervalle."""
+        exact = Histogram([1, 2, 3, 4])
+        self.assertEqual(exact.fraction(2, 3), 0.5)
+        self.assertEqual(exact.fraction(None, 10), 1.0)
+        sampled = Histogram(range(10000))
+        self.assertAlmostEqual(sampled.fraction(0, 999), 0.1, delta=0.02)
+        self.assertGreater(sampled.fraction(10, 11), 0)
+
+    def test_radius(self):
+        """Le rayon filtre par distance exacte, y compris au-delà de l'antiméridien."""
+        self.assertAlmostEqual(distance_km(48.8566, 2.3522, 45.7640, 4.8357), 392, delta=2)
+        radius = Radius(-17, 180, 500)
+        self.assertEqual((radius.min_longitude, radius.max_longitude), (-180.0, 180.0))
+
+
+class TestPlaceSearchService(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        owner = User(first_name='Ana', last_name='Host', email='ana@example.com', password='x')
+        guests = [User(first_name='Guest', last_name=str(i), email=f'guest{i}@example.com', password='x')
+                  for i in range(2)]
+        amenities = {name: Amenity(name=name) for name in ('WiFi', 'Pool')}
+        db.session.add_all([owner] + guests + list(amenities.values()))
+        db.session.flush()
+        for title, price, latitude, longitude, names, ratings in PLACES:
+            place = Place(title=title, description=f'{title} for rent', price=price,
+                          latitude=latitude, longitude=longitude, owner_id=owner.id)
+            place.amenities = [amenities[name] for name in names]
+            db.session.add(place)
+            db.session.flush()
+            for guest, rating in zip(guests, ratings):
+                db.session.add(Review(text='ok', rating=rating, place_id=place.id, user_id=guest.id))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def get(self, **params):
+        response = self.client.get('/api/v1/places/', query_string=params)
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return response.get_json()
+
+    def titles(self, **params):
+        return sorted(place['title'] for place in self.get(**params))
+
+    def test_combined_filters(self):
+        """Les filtres combinés donnent les mêmes lieux qu'un filtrage naïf."""
+        self.assertEqual(self.titles(lat=48.8566, lon=2.3522, radius=30),
+                         ['Paris loft', 'Paris studio', 'Versailles house'])
+        self.assertEqual(self.titles(lat=48.8566, lon=2.3522, radius=30, amenities='WiFi', max_price=100),
+                         ['Paris studio'])
+        self.assertEqual(self.titles(min_rating=4, amenities='Pool'),
+                         ['New York loft', 'Paris loft', 'Versailles house'])
+        self.assertEqual(self.titles(q='loft', min_price=150), ['New York loft'])
+        self.assertEqual(self.titles(lat=-15, lon=180, radius=500), ['Fiji hut', 'Samoa hut'])
+        self.assertEqual(self.titles(q='castle', amenities='WiFi'), [])
+        self.assertEqual(len(self.get()), len(PLACES))
+
+    def test_most_selective_driver(self):
+        """Les bitmaps pilotent quand le filtre d'amenities est le plus sélectif, sinon la base choisit."""
+        result = self.get(q='studio', amenities='WiFi', min_price=0, explain=1)
+        plan = result['plan']
+        self.assertEqual([place['title'] for place in result['results']], ['Paris studio'])
+        self.assertEqual(plan['driver'], 'database')
+        self.assertEqual([step['step'] for step in plan['steps']], ['fetch'])
+        self.assertEqual(plan['steps'][0]['filters'], ['keywords', 'amenities', 'price'])
+        self.assertEqual(plan['steps'][0]['rows'], 1)
+        estimates = [estimate['estimated_rows'] for estimate in plan['estimates']]
+        self.assertEqual(estimates, sorted(estimates))
+        self.assertIn('total_ms', plan)
+
+        plan = self.get(amenities='Pool', min_price=0, explain=1)['plan']
+        self.assertEqual(plan['driver'], 'amenities')
+        self.assertEqual([(step['step'], step['rows']) for step in plan['steps']], [('amenities', 3), ('fetch', 3)])
+        self.assertEqual(plan['steps'][1]['filters'], ['price'])
+
+    def test_explain_reports_database_plan(self):
+        """Le plan renvoyé est celui que la base exécute pour la requête."""
+        plan = self.get(min_price=10, max_price=11, min_rating=5, explain=1)['plan']
+        repository = facade.place_repository
+        criteria = [repository.price_range_filter(10, 11), repository.min_rating_filter(5)]
+        statement = repository._places_page_query(criteria, 20, None, None) \
+            .compile(db.engine, compile_kwargs={'literal_binds': True})
+        expected = [row[3] for row in db.session.execute(text(f'EXPLAIN QUERY PLAN {statement}'))]
+        self.assertEqual(plan['steps'][-1]['query_plan'], expected)
+        self.assertNotIn('query_plan', facade.find_places(min_price=10)[1]['steps'][-1])
+
+    def test_pagination(self):
+        """Les recherches filtrées sont paginées par id, y compris avec le filtre de distance."""
+        for params in ({'min_price': 0}, {'amenities': 'WiFi|Pool'}, {'lat': 48.8566, 'lon': 2.3522, 'radius': 30}):
+            expected = self.titles(**params)
+            seen, cursor = [], None
+            while True:
+                response = self.client.get('/api/v1/places/', query_string=dict(params, limit=2, cursor=cursor))
+                self.assertEqual(response.status_code, 200)
+                page = response.get_json()
+                self.assertLessEqual(len(page), 2)
+                seen += [place['title'] for place in page]
+                cursor = response.headers.get('X-Next-Cursor')
+                if cursor is None:
+                    break
+            self.assertEqual(sorted(seen), expected, params)
+        response = self.client.get('/api/v1/places/', query_string={'min_price': 0, 'cursor': 'bad'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_amenity_driver_batches(self):
+        """Quand les bitmaps pilotent, les ids candidats sont envoyés par lots bornés."""
+        facade.place_search.CANDIDATE_BATCH = 2
+        try:
+            self.assertEqual(self.titles(amenities='WiFi', min_price=0),
+                             ['Lyon flat', 'New York loft', 'Paris loft', 'Paris studio'])
+        finally:
+            del facade.place_search.CANDIDATE_BATCH
+
+    def test_statistics_refresh(self):
+        """Les statistiques sont recalculées après invalidation."""
+        facade.place_search.statistics.ensure_fresh()
+        self.assertEqual(facade.place_search.statistics.total, len(PLACES))
+        facade.delete_place(self.get(q='studio')[0]['id'])
+        self.assertEqual(facade.place_search.statistics.total, len(PLACES))
+        facade.place_search.statistics.invalidate()
+        self.assertEqual(facade.place_search.statistics.ensure_fresh().total, len(PLACES) - 1)
+
+    def test_statistics_background_refresh(self):
+        """Des statistiques périmées sont recalculées en arrière-plan, hors de la requête."""
+        statistics = facade.place_search.statistics
+        statistics.ensure_fresh()
+        facade.delete_place(self.get(q='studio')[0]['id'])
+        statistics._refreshed_at -= statistics.refresh_interval + 1
+        statistics.ensure_fresh()
+        deadline = time.monotonic() + 5
+        while statistics._refreshing and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(statistics.total, len(PLACES) - 1)
+
+    def test_invalid_filters(self):
+        """Les filtres invalides sont refusés."""
+        for params in ({'min_price': 'cheap'}, {'lat': 48, 'lon': 2}, {'lat': 95, 'lon': 2, 'radius': 1},
+                       {'lat': 48, 'lon': 2, 'radius': 0}, {'min_rating': 6}, {'amenities': 'Sauna'}):
+            response = self.client.get('/api/v1/places/', query_string=params)
+            self.assertEqual(response.status_code, 400, params)
+
+if __name__ == '__main__':
+    unittest.main()
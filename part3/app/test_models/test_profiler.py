@@ -0,0 +1,70 @@
+import threading
+import time
+import unittest
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.profiler import SamplingProfiler, ProfilerBusyError
+from config import TestingConfig
+
+def busy_worker(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+class TestSamplingProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.admin_token = create_access_token(identity={'id': 'admin', 'is_admin': True})
+        self.user_token = create_access_token(identity={'id': 'user', 'is_admin': False})
+        self.stop = threading.Event()
+        self.worker = threading.Thread(target=busy_worker, args=(self.stop,), name='busy')
+        self.worker.start()
+
+    def tearDown(self):
+        self.stop.set()
+        self.worker.join()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_profile_endpoint(self):
+        """Le profil contient la pile du thread occupé au format collapsed."""
+        response = self.client.get('/api/v1/admin/profile?seconds=0.3&interval_ms=2',
+                                   headers={'Authorization': f'Bearer {self.admin_token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response.headers['X-Profile-Samples']), 0)
+        lines = response.get_data(as_text=True).splitlines()
+        busy = [line for line in lines if line.startswith('busy;')]
+        self.assertTrue(busy)
+        self.assertIn('busy_worker (test_profiler.py:', busy[0])
+        self.assertTrue(busy[0].rsplit(' ', 1)[1].isdigit())
+
+    def test_profile_requires_admin(self):
+        """Seul un admin peut lancer le profiler."""
+        response = self.client.get('/api/v1/admin/profile?seconds=0.1',
+                                   headers={'Authorization': f'Bearer {self.user_token}'})
+        self.assertEqual(response.status_code, 403)
+
+    def test_profile_invalid_duration(self):
+        """Une durée hors bornes est refusée."""
+        response = self.client.get('/api/v1/admin/profile?seconds=3600',
+                                   headers={'Authorization': f'Bearer {self.admin_token}'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_single_session(self):
+        """Deux sessions simultanées sont refusées."""
+        profiler = SamplingProfiler()
+        thread = threading.Thread(target=profiler.profile, args=(0.3,))
+        thread.start()
+        time.sleep(0.05)
+        with self.assertRaises(ProfilerBusyError):
+            profiler.profile(0.1)
+        thread.join()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from sqlalchemy import event, inspect
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.place_repository import PlaceRepository
+from app.persistence.user_repository import UserRepository
+from config import TestingConfig
+
+class TestRelationshipCounts(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.owner = User(first_name='Ana', last_name='Host', email='ana@example.com', password='x')
+        guest = User(first_name='Bob', last_name='Guest', email='bob@example.com', password='x')
+        db.session.add_all([self.owner, guest])
+        db.session.flush()
+        self.places = [Place(title=f'Place {i}', price=10, latitude=0, longitude=0, owner_id=self.owner.id)
+                       for i in range(3)]
+        self.places[0].amenities = [Amenity(name='WiFi'), Amenity(name='Pool')]
+        db.session.add_all(self.places)
+        db.session.flush()
+        db.session.add(Review(text='ok', rating=4, place_id=self.places[0].id, user_id=guest.id))
+        db.session.add(Review(text='ok', rating=3, place_id=self.places[1].id, user_id=self.owner.id))
+        db.session.commit()
+        self.owner_id, self.guest_id = self.owner.id, guest.id
+        self.place_id = self.places[0].id
+        db.session.expunge_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_counts_without_loading(self):
+        """Les compteurs sont lus en une requête, sans charger les collections."""
+        statements = []
+        record = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            user, counts = UserRepository().get_with_counts(self.owner_id, ('places', 'reviews'))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        self.assertEqual(counts, {'places': 3, 'reviews': 1})
+        self.assertEqual(len(statements), 1)
+        self.assertIn('places', inspect(user).unloaded)
+        self.assertIn('reviews', inspect(user).unloaded)
+
+    def test_many_to_many(self):
+        """Les relations plusieurs-à-plusieurs sont comptées sur la table d'association."""
+        place, counts = PlaceRepository().get_with_counts(self.place_id, ('amenities', 'reviews'))
+        self.assertEqual(counts, {'amenities': 2, 'reviews': 1})
+        with self.assertRaises(ValueError):
+            PlaceRepository().relationship_count('owner')
+        self.assertIsNone(UserRepository().get_with_counts('unknown', ('places',)))
+
+    def test_api_include_counts(self):
+        """GET /users/<id>?include=counts ajoute les compteurs."""
+        response = self.client.get(f'/api/v1/users/{self.guest_id}?include=counts')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['counts'], {'places': 0, 'reviews': 1})
+        self.assertNotIn('counts', self.client.get(f'/api/v1/users/{self.guest_id}').get_json())
+        self.assertEqual(self.client.get(f'/api/v1/users/{self.guest_id}?include=friends').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/users/unknown?include=counts').status_code, 404)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.services import revocation_list
+from config import TestingConfig
+
+class TestReviewCreation(unittest.TestCase):
+
+    config = TestingConfig
+
+    def setUp(self):
+        self.app = create_app(self.config)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        owner = User(first_name='Ana', last_name='Host', email='ana@example.com', password='x')
+        guest = User(first_name='Bob', last_name='Guest', email='bob@example.com', password='x')
+        db.session.add_all([owner, guest])
+        db.session.flush()
+        place = Place(title='Flat', price=50, latitude=0, longitude=0, owner_id=owner.id)
+        db.session.add(place)
+        db.session.commit()
+        self.owner_id, self.guest_id, self.place_id = owner.id, guest.id, place.id
+        token = create_access_token(identity={'id': guest.id, 'is_admin': False})
+        self.headers = {'Authorization': f'Bearer {token}'}
+        revocation_list.rebuild()
+        db.session.remove()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def post(self, **overrides):
+        review = dict({'text': 'Great', 'rating': 5, 'user_id': self.guest_id, 'place_id': self.place_id},
+                      **overrides)
+        return self.client.post('/api/v1/reviews/', json=review, headers=self.headers)
+
+    def test_two_statements(self):
+        """La création d'une review coûte au plus deux requêtes SQL."""
+        statements = []
+        record = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            response = self.post()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()['text'], 'Great')
+        self.assertLessEqual(len(statements), 2, statements)
+        self.assertEqual(Review.query.count(), 1)
+
+    def test_duplicate_rejected_by_constraint(self):
+        """Une seconde review du même utilisateur est refusée par la contrainte unique."""
+        self.assertEqual(self.post().status_code, 201)
+        response = self.post(text='Again')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error'], 'You have already reviewed this place')
+        self.assertEqual(Review.query.count(), 1)
+
+    def test_invalid_references(self):
+        """Un lieu ou un utilisateur inconnu, ou son propre lieu, sont refusés."""
+        cases = [({'place_id': 'unknown'}, 'Place not found'),
+                 ({'user_id': 'unknown'}, 'User not found'),
+                 ({'user_id': self.owner_id}, 'You cannot review your own place')]
+        for overrides, error in cases:
+            response = self.post(**overrides)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.get_json()['error'], error)
+        self.assertEqual(Review.query.count(), 0)
+
+
+class NoForeignKeysConfig(TestingConfig):
+    SQLITE_PRAGMAS = {}
+
+
+class TestReviewCreationWithoutForeignKeys(TestReviewCreation):
+    """Mêmes vérifications avec les clés étrangères SQLite désactivées."""
+
+    config = NoForeignKeysConfig
+
+    def test_foreign_keys_off(self):
+        """Les clés étrangères sont bien désactivées dans cette configuration."""
+        self.assertEqual(db.session.execute(db.text('PRAGMA foreign_keys')).scalar(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
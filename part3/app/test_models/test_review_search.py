@@ -0,0 +1,112 @@
+import unittest
+
+from app import create_app, db
+from app.api.v1.pagination import encode_cursor
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.review_repository import review_fulltext
+from config import TestingConfig
+
+REVIEWS = [
+    (5, 'Lovely stay, very quiet'),
+    (1, 'Terrible noise from the street all night'),
+    (2, 'Nice flat but the noise of the bar was a problem'),
+    (4, 'Some noise in the morning, otherwise great'),
+    (3, 'Average, the wifi was slow'),
+    (2, 'Dirty kitchen'),
+]
+
+class TestReviewSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        owner = User(first_name='Ana', last_name='Host', email='ana@example.com', password='x')
+        db.session.add(owner)
+        db.session.flush()
+        self.place = Place(title='Flat', price=50, latitude=0, longitude=0, owner_id=owner.id)
+        db.session.add(self.place)
+        db.session.flush()
+        for i, (rating, text) in enumerate(REVIEWS):
+            guest = User(first_name='Guest', last_name=str(i), email=f'guest{i}@example.com', password='x')
+            db.session.add(guest)
+            db.session.flush()
+            db.session.add(Review(text=text, rating=rating, place_id=self.place.id, user_id=guest.id))
+            db.session.commit()
+        self.url = f'/api/v1/places/{self.place.id}/reviews/'
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def get(self, **params):
+        response = self.client.get(self.url, query_string=params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def texts(self, **params):
+        return [review['text'] for review in self.get(**params).get_json()]
+
+    def test_defaults(self):
+        """Sans filtre, toutes les reviews sont renvoyées de la plus récente à la plus ancienne."""
+        response = self.get()
+        self.assertEqual(self.texts(), [text for _, text in reversed(REVIEWS)])
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+    def test_rating_and_text_filters(self):
+        """Les filtres de note et de texte se combinent."""
+        self.assertEqual(self.texts(max_rating=2, q='noise', sort='lowest'),
+                         ['Terrible noise from the street all night',
+                          'Nice flat but the noise of the bar was a problem'])
+        self.assertEqual(self.texts(min_rating=4, sort='highest'),
+                         ['Lovely stay, very quiet', 'Some noise in the morning, otherwise great'])
+
+    def test_python_fallback(self):
+        """L'index Python donne les mêmes résultats que FTS5."""
+        expected = self.texts(q='noise')
+        review_fulltext._backend = 'python'
+        self.assertEqual(self.texts(q='noise'), expected)
+        self.assertEqual(len(expected), 3)
+
+    def test_keyset_pagination(self):
+        """Chaque tri se parcourt page par page sans doublon ni oubli."""
+        for sort in ('newest', 'oldest', 'highest', 'lowest'):
+            expected = self.texts(sort=sort)
+            seen, cursor = [], None
+            while True:
+                params = {'sort': sort, 'limit': 2}
+                if cursor:
+                    params['cursor'] = cursor
+                response = self.get(**params)
+                seen += [review['text'] for review in response.get_json()]
+                cursor = response.headers.get('X-Next-Cursor')
+                if not cursor:
+                    break
+            self.assertEqual(seen, expected, sort)
+
+    def test_invalid_parameters(self):
+        """Les paramètres invalides sont refusés."""
+        for params in ({'min_rating': 9}, {'max_rating': 'x'}, {'sort': 'random'},
+                       {'limit': 0}, {'cursor': 'garbage'}):
+            response = self.client.get(self.url, query_string=params)
+            self.assertEqual(response.status_code, 400, params)
+        self.assertEqual(self.client.get('/api/v1/places/unknown/reviews/').status_code, 404)
+
+    def test_forged_cursors(self):
+        """Un curseur dont la note n'est pas un entier ou l'id pas une chaîne est refusé."""
+        for sort, values in (('highest', [{'a': 1}, 'x']), ('lowest', ['5', 'x']), ('highest', [4.5, 'x']),
+                             ('highest', [True, 'x']), ('lowest', [3, 7]), ('newest', [1, 'x']),
+                             ('oldest', ['2024-01-01T00:00:00', ['x']])):
+            response = self.client.get(self.url, query_string={'sort': sort, 'cursor': encode_cursor(values)})
+            self.assertEqual(response.status_code, 400, (sort, values))
+            self.assertEqual(response.get_json()['error'], 'Invalid cursor')
+        response = self.client.get(self.url, query_string={'sort': 'highest', 'cursor': encode_cursor([4, 'x'])})
+        self.assertEqual(response.status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.persistence.routing import REPLICA_BIND, RoutingSession, use_primary, use_replica
+from app.services import facade
+from config import TestingConfig
+
+class TestReadReplicaRouting(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.primary_path = os.path.join(self.tmpdir.name, 'primary.db')
+        self.replica_path = os.path.join(self.tmpdir.name, 'replica.db')
+
+        class ReplicaConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + self.primary_path
+            SQLALCHEMY_BINDS = {'replica': 'sqlite:///' + self.replica_path}
+
+        self.app = create_app(ReplicaConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.statements = {'primary': [], 'replica': []}
+        for name, engine in (('primary', db.engine), ('replica', db.engines['replica'])):
+            event.listen(engine, 'before_cursor_execute', self.recorder(name))
+        # Stand-in for replication: copy the primary into the replica on commit
+        self.replicating = True
+        event.listen(RoutingSession, 'after_commit', self.replicate)
+        db.create_all()
+        self.sync()
+        self.admin_token = create_access_token(identity={'id': 'admin', 'is_admin': True})
+
+    def tearDown(self):
+        event.remove(RoutingSession, 'after_commit', self.replicate)
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+        self.app_context.pop()
+        # Flask-SQLAlchemy keeps one MetaData per bind key across apps
+        db.metadatas.pop(REPLICA_BIND, None)
+        self.tmpdir.cleanup()
+
+    def recorder(self, name):
+        def record(conn, cursor, statement, parameters, context, executemany):
+            self.statements[name].append(statement)
+        return record
+
+    def sync(self):
+        source = sqlite3.connect(self.primary_path)
+        target = sqlite3.connect(self.replica_path)
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
+
+    def replicate(self, session):
+        if self.replicating:
+            self.sync()
+
+    def reset(self):
+        db.session.remove()
+        self.statements = {'primary': [], 'replica': []}
+
+    def test_get_reads_from_replica(self):
+        """Une requête GET lit sur le réplica, même s'il est en retard."""
+        facade.create_amenity({'name': 'Wifi'})
+        self.replicating = False
+        facade.create_amenity({'name': 'Pool'})
+        self.reset()
+        response = self.client.get('/api/v1/amenities/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([a['name'] for a in response.get_json()], ['Wifi'])
+        self.assertTrue(self.statements['replica'])
+        self.assertEqual(self.statements['primary'], [])
+
+    def test_writes_go_to_primary(self):
+        """Les écritures et les lectures des requêtes POST vont au primaire."""
+        self.reset()
+        response = self.client.post('/api/v1/amenities/', json={'name': 'Sauna'},
+                                    headers={'Authorization': f'Bearer {self.admin_token}'})
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(any(s.startswith('INSERT') for s in self.statements['primary']))
+        self.assertEqual(self.statements['replica'], [])
+        response = self.client.get(f"/api/v1/amenities/{response.get_json()['id']}")
+        self.assertEqual(response.status_code, 200)
+
+    def test_read_after_write(self):
+        """Après une écriture, la session lit sur le primaire."""
+        self.replicating = False
+        self.reset()
+        with self.app.test_request_context('/api/v1/amenities/', method='GET'):
+            amenity = facade.create_amenity({'name': 'Jacuzzi'})
+            amenity_id = amenity.id
+            self.statements['replica'] = []
+            db.session.expire_all()
+            self.assertIsNotNone(db.session.get(Amenity, amenity_id))
+            self.assertEqual(len(Amenity.query.all()), 1)
+        self.assertEqual(self.statements['replica'], [])
+
+    def test_explicit_routing(self):
+        """use_primary et use_replica forcent la destination des lectures."""
+        self.replicating = False
+        facade.create_amenity({'name': 'Parking'})
+        self.reset()
+        with self.app.test_request_context('/', method='GET'):
+            with use_primary():
+                self.assertEqual(len(facade.get_all_amenities()), 1)
+            self.assertEqual(len(facade.get_all_amenities()), 0)
+        self.reset()
+        with use_replica():
+            self.assertEqual(len(facade.get_all_amenities()), 0)
+        self.assertEqual(len(facade.get_all_amenities()), 1)
+
+if __name__ == '__main__':
+    unittest.main()
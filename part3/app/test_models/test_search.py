@@ -0,0 +1,199 @@
+import unittest
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.api.v1.pagination import encode_cursor
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.fulltext import InvertedIndex, tokenize
+from app.persistence.place_repository import place_fulltext
+from app.persistence.review_repository import review_fulltext
+from app.services import facade
+from config import TestingConfig
+
+PLACES = [
+    ('Sea view loft', 'Bright loft with a sea view and a balcony'),
+    ('Mountain cabin', 'Quiet cabin, no sea in sight'),
+    ('Loft downtown', 'Industrial loft near the station'),
+    ('Beach house', 'Steps from the sea, view on the dunes'),
+    ('Château', 'Un château avec vue sur la mer'),
+]
+
+class TestInvertedIndex(unittest.TestCase):
+
+    def test_tokenize(self):
+        """La tokenisation ignore la casse, la ponctuation et les accents."""
+        self.assertEqual(tokenize("Sea-view LOFT, château!"), ['sea', 'view', 'loft', 'chateau'])
+
+    def test_every_term_must_match(self):
+        """Un document doit contenir tous les mots de la requête."""
+        index = InvertedIndex(('title',))
+        index.add('a', {'title': 'sea view'})
+        index.add('b', {'title': 'sea'})
+        self.assertEqual([doc for doc, _ in index.search(['sea', 'view'])], ['a'])
+        index.remove('a')
+        self.assertEqual(index.search(['sea', 'view']), [])
+        self.assertEqual(len(index), 1)
+
+
+class TestPlaceSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.owner = User(first_name='Ana', last_name='Host', email='ana@example.com', password='x')
+        db.session.add(self.owner)
+        db.session.commit()
+        self.places = {}
+        for title, description in PLACES:
+            place = facade.create_place({'title': title, 'description': description, 'price': 80,
+                                         'latitude': 0, 'longitude': 0, 'owner_id': self.owner.id})
+            self.places[title] = place.id
+        self.token = create_access_token(identity={'id': self.owner.id, 'is_admin': False})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def search(self, query, **params):
+        response = self.client.get('/api/v1/places/search', query_string=dict(q=query, **params))
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def titles(self, query):
+        return [place['title'] for place in self.search(query)['results']]
+
+    def test_uses_fts5(self):
+        """SQLite utilise la table FTS5."""
+        self.assertEqual(place_fulltext.backend(), 'fts5')
+
+    def test_ranking(self):
+        """Les résultats sont classés par BM25, le titre pesant plus que la description."""
+        self.assertEqual(self.titles('sea view'), ['Sea view loft', 'Beach house'])
+        self.assertEqual(self.titles('loft')[0], 'Loft downtown')
+        self.assertEqual(self.titles('chateau'), ['Château'])
+        self.assertEqual(self.titles('submarine'), [])
+
+    def test_keyset_pagination(self):
+        """Les curseurs parcourent tous les résultats sans doublon."""
+        expected = self.titles('sea')
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 1}
+            if cursor:
+                params['cursor'] = cursor
+            page = self.search('sea', **params)
+            seen += [place['title'] for place in page['results']]
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(seen), 3)
+
+    def test_kept_in_sync(self):
+        """Les créations, modifications et suppressions sont indexées."""
+        facade.update_place(self.places['Mountain cabin'], {'title': 'Mountain loft'})
+        self.assertIn('Mountain loft', self.titles('loft'))
+        response = self.client.delete(f"/api/v1/places/{self.places['Loft downtown']}",
+                                      headers={'Authorization': f'Bearer {self.token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Loft downtown', self.titles('loft'))
+
+    def test_python_fallback_matches_fts5(self):
+        """L'index Python donne le même classement et les mêmes scores que FTS5."""
+        queries = ['sea', 'sea view', 'loft', 'view']
+        expected = {q: [(p.id, round(s, 9)) for p, s in facade.search_places(q)] for q in queries}
+        place_fulltext._backend = 'python'
+        actual = {q: [(p.id, round(s, 9)) for p, s in facade.search_places(q)] for q in queries}
+        self.assertEqual(actual, expected)
+
+    def test_python_fallback_sync(self):
+        """L'index Python suit les commits et ignore les rollbacks."""
+        place_fulltext._backend = 'python'
+        self.assertEqual(self.titles('balcony'), ['Sea view loft'])
+        facade.update_place(self.places['Beach house'], {'description': 'Balcony on the beach'})
+        self.assertEqual(len(self.titles('balcony')), 2)
+        place = db.session.get(Place, self.places['Château'])
+        place.description = 'Balcony'
+        db.session.flush()
+        db.session.rollback()
+        self.assertEqual(len(self.titles('balcony')), 2)
+        facade.delete_place(self.places['Sea view loft'])
+        self.assertEqual(self.titles('balcony'), ['Beach house'])
+
+    def test_python_fallback_separate_indexes(self):
+        """Un lieu et une review validés ensemble vont chacun dans leur propre index."""
+        place_fulltext._backend = review_fulltext._backend = 'python'
+        place_fulltext._ensure_loaded()
+        review_fulltext._ensure_loaded()
+        self.assertEqual(len(place_fulltext._fallback), len(PLACES))
+        self.assertEqual(len(review_fulltext._fallback), 0)
+        guest = User(first_name='Bob', last_name='Guest', email='bob@example.com', password='x')
+        db.session.add(guest)
+        db.session.flush()
+        db.session.add(Place(title='Harbour flat', description='Near the harbour', price=50,
+                             latitude=0, longitude=0, owner_id=self.owner.id))
+        db.session.add(Review(text='Lovely harbour', rating=5, place_id=self.places['Château'], user_id=guest.id))
+        db.session.commit()
+        self.assertEqual(len(place_fulltext._fallback), len(PLACES) + 1)
+        self.assertEqual(len(review_fulltext._fallback), 1)
+        self.assertEqual(self.titles('harbour'), ['Harbour flat'])
+
+    def test_facets(self):
+        """Les facettes comptent toutes les correspondances, pas seulement la page."""
+        wifi = facade.create_amenity({'name': 'WiFi'})
+        pool = facade.create_amenity({'name': 'Pool'})
+        for title, price, amenities in (('Sea view loft', 40, [wifi, pool]), ('Beach house', 250, [wifi]),
+                                        ('Mountain cabin', 600, [pool])):
+            place = facade.get_place(self.places[title])
+            facade.update_place(place.id, {'price': price})
+            facade.add_amenities_to_place(place, amenities)
+        for i, rating in enumerate((5, 4)):
+            guest = User(first_name='Guest', last_name=str(i), email=f'guest{i}@example.com', password='x')
+            db.session.add(guest)
+            db.session.flush()
+            db.session.add(Review(text='ok', rating=rating, place_id=self.places['Sea view loft'], user_id=guest.id))
+        db.session.commit()
+
+        page = self.search('sea', limit=1, facets=1)
+        self.assertEqual(len(page['results']), 1)
+        facets = page['facets']
+        self.assertEqual(facets['total'], 3)
+        self.assertEqual(facets['amenities'], [{'id': pool.id, 'name': 'Pool', 'count': 2},
+                                               {'id': wifi.id, 'name': 'WiFi', 'count': 2}])
+        self.assertEqual([bucket['count'] for bucket in facets['price']], [1, 0, 0, 1, 1])
+        self.assertEqual(facets['price'][-1], {'min': 500, 'max': None, 'count': 1})
+        self.assertEqual({bucket['rating']: bucket['count'] for bucket in facets['rating']},
+                         {5: 0, 4: 1, 3: 0, 2: 0, 1: 0, None: 2})
+        self.assertNotIn('facets', self.search('sea'))
+
+    def test_invalid_requests(self):
+        """Une requête vide ou un curseur invalide est refusé."""
+        self.assertEqual(self.client.get('/api/v1/places/search').status_code, 400)
+        response = self.client.get('/api/v1/places/search?q=sea&cursor=garbage')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/v1/places/search?q=sea&limit=1000')
+        self.assertEqual(response.status_code, 400)
+
+    def test_forged_cursors(self):
+        """Un curseur dont le score n'est pas un nombre ou l'id pas une chaîne est refusé, avec les deux index."""
+        forged = [[{'a': 1}, 'x'], ['x', 'y'], [1.5, 5], [True, 'x'], [1.5, None]]
+        for backend in ('fts5', 'python'):
+            place_fulltext._backend = backend
+            for values in forged:
+                response = self.client.get('/api/v1/places/search',
+                                           query_string={'q': 'sea', 'cursor': encode_cursor(values)})
+                self.assertEqual(response.status_code, 400, (backend, values))
+                self.assertEqual(response.get_json()['error'], 'Invalid cursor')
+            response = self.client.get('/api/v1/places/search',
+                                       query_string={'q': 'sea', 'cursor': encode_cursor([-1.5, 'x'])})
+            self.assertEqual(response.status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import text
+from app import create_app, db
+from config import TestingConfig
+
+class TestSQLitePragmas(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+        class FileConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(self.tmpdir.name, 'pragmas.db')
+
+        self.app = create_app(FileConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+        self.tmpdir.cleanup()
+
+    def pragma(self, name):
+        with db.engine.connect() as conn:
+            return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_profile_applied(self):
+        """Chaque connexion reçoit le profil SQLITE_PRAGMAS."""
+        self.assertEqual(self.pragma('journal_mode'), 'wal')
+        self.assertEqual(self.pragma('synchronous'), 1)
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('foreign_keys'), 1)
+
+    def test_empty_profile(self):
+        """Un profil vide laisse les valeurs par défaut de SQLite."""
+        db.engine.dispose()
+        self.app_context.pop()
+
+        class DefaultConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(self.tmpdir.name, 'default.db')
+            SQLITE_PRAGMAS = {}
+
+        self.app = create_app(DefaultConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.assertEqual(self.pragma('journal_mode'), 'delete')
+        self.assertEqual(self.pragma('foreign_keys'), 0)
+
+if __name__ == '__main__':
+    unittest.main()
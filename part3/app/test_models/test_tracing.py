@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+import unittest
+
+from app import create_app, db
+from app.models import User, Place
+from config import TestingConfig
+
+class TestTracing(unittest.TestCase):
+
+    def make_app(self, sample_rate, trusted_callers=()):
+        class TracingConfig(TestingConfig):
+            TRACE_SAMPLE_RATE = sample_rate
+            TRACE_EXPORT_PATH = self.export_path
+            TRACE_TRUSTED_CALLERS = list(trusted_callers)
+
+        self.app = create_app(TracingConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        owner = User(first_name='Tracy', last_name='Span', email='tracy@example.com')
+        owner.hash_password('secret')
+        place = Place(title='Traced loft', price=90, latitude=1.0, longitude=2.0, owner=owner)
+        db.session.add_all([owner, place])
+        db.session.commit()
+        self.place_id = place.id
+        db.session.remove()
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.export_path = os.path.join(self.tmpdir.name, 'traces.jsonl')
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        self.tmpdir.cleanup()
+
+    def read_spans(self):
+        with open(self.export_path) as f:
+            documents = [json.loads(line) for line in f]
+        return [span for document in documents
+                for span in document['resourceSpans'][0]['scopeSpans'][0]['spans']]
+
+    def test_place_detail_spans(self):
+        """Une requête échantillonnée exporte les spans façade, SQL et sérialisation."""
+        self.make_app(1.0)
+        response = self.client.get(f'/api/v1/places/{self.place_id}')
+        self.assertEqual(response.status_code, 200)
+
+        spans = self.read_spans()
+        by_name = {span['name']: span for span in spans}
+        root = by_name['GET /api/v1/places/<place_id>']
+        self.assertNotIn('parentSpanId', root)
+        self.assertEqual(len({span['traceId'] for span in spans}), 1)
+
+        facade_span = by_name['HBnBFacade.get_place_by_id']
+        serialize_span = by_name['Place.to_dict_list']
+        self.assertEqual(facade_span['parentSpanId'], root['spanId'])
+        self.assertEqual(serialize_span['parentSpanId'], root['spanId'])
+
+        sql_parents = {span['parentSpanId'] for span in spans if span['name'] == 'SELECT'}
+        self.assertIn(facade_span['spanId'], sql_parents)
+        self.assertIn(serialize_span['spanId'], sql_parents)
+        status = [a for a in root['attributes'] if a['key'] == 'http.response.status_code']
+        self.assertEqual(status[0]['value']['intValue'], '200')
+
+    def test_unsampled_requests_not_exported(self):
+        """Avec un taux nul, rien n'est exporté."""
+        self.make_app(0.0)
+        self.client.get(f'/api/v1/places/{self.place_id}')
+        self.assertFalse(os.path.exists(self.export_path))
+
+    def test_traceparent_forces_sampling(self):
+        """Un en-tête traceparent échantillonné venant d'un appelant de confiance est poursuivi."""
+        self.make_app(0.0, ['127.0.0.0/8'])
+        trace_id, parent_id = 'ab' * 16, 'cd' * 8
+        self.client.get('/api/v1/places/', headers={'traceparent': f'00-{trace_id}-{parent_id}-01'})
+        spans = self.read_spans()
+        self.assertTrue(all(span['traceId'] == trace_id for span in spans))
+        root = [span for span in spans if span['name'] == 'GET /api/v1/places/'][0]
+        self.assertEqual(root['parentSpanId'], parent_id)
+
+    def test_untrusted_traceparent_ignored(self):
+        """Le drapeau d'échantillonnage d'un appelant non autorisé est ignoré."""
+        self.make_app(0.0, ['10.0.0.0/8'])
+        headers = {'traceparent': f"00-{'ab' * 16}-{'cd' * 8}-01"}
+        self.client.get('/api/v1/places/', headers=headers)
+        self.client.get('/api/v1/places/', headers=headers, environ_base={'REMOTE_ADDR': '192.168.1.5'})
+        self.assertFalse(os.path.exists(self.export_path))
+        self.client.get('/api/v1/places/', headers=headers, environ_base={'REMOTE_ADDR': '10.1.2.3'})
+        self.assertTrue(os.path.exists(self.export_path))
+
+    def test_untrusted_traceparent_sampled_by_rate(self):
+        """Un appelant non autorisé échantillonné par le taux garde son identifiant de trace."""
+        self.make_app(1.0)
+        trace_id, parent_id = 'ab' * 16, 'cd' * 8
+        self.client.get('/api/v1/places/', headers={'traceparent': f'00-{trace_id}-{parent_id}-00'})
+        root = [span for span in self.read_spans() if span['name'] == 'GET /api/v1/places/'][0]
+        self.assertEqual(root['traceId'], trace_id)
+        self.assertEqual(root['parentSpanId'], parent_id)
+
+if __name__ == '__main__':
+    unittest.main()
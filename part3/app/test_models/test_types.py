@@ -0,0 +1,95 @@
+import os
+import subprocess
+import sys
+import time
+import unittest
+import uuid
+
+from sqlalchemy import Column, MetaData, Table, create_engine, insert, select
+from app.models.types import GUID, ID_STORAGE, uuid7
+
+PART3 = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class TestUUID7(unittest.TestCase):
+
+    def test_version_and_variant(self):
+        """Un uuid7 porte la version 7 et la variante RFC."""
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+
+    def test_timestamp(self):
+        """Les 48 premiers bits sont l'horodatage en millisecondes."""
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+        self.assertTrue(before <= value.int >> 80 <= after + 1)
+
+    def test_monotonic(self):
+        """Les identifiants générés sont strictement croissants."""
+        values = [str(uuid7()) for _ in range(10000)]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), len(values))
+
+class TestGUID(unittest.TestCase):
+
+    def roundtrip(self, binary, value):
+        engine = create_engine('sqlite://')
+        metadata = MetaData()
+        table = Table('records', metadata, Column('id', GUID(binary=binary), primary_key=True))
+        metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(insert(table), {'id': value})
+            stored = conn.exec_driver_sql('SELECT id FROM records').scalar()
+            loaded = conn.execute(select(table.c.id).where(table.c.id == value)).scalar()
+        return stored, loaded
+
+    def test_string_storage(self):
+        """En mode texte l'identifiant est stocké tel quel."""
+        value = str(uuid7())
+        self.assertEqual(self.roundtrip(False, value), (value, value))
+
+    def test_binary_storage(self):
+        """En mode binaire l'identifiant occupe 16 octets et reste une chaîne en Python."""
+        value = str(uuid7())
+        stored, loaded = self.roundtrip(True, value)
+        self.assertEqual(stored, uuid.UUID(value).bytes)
+        self.assertEqual(loaded, value)
+
+    def test_binary_malformed_id(self):
+        """Un identifiant mal formé ne provoque pas d'erreur en mode binaire."""
+        self.assertEqual(self.roundtrip(True, 'admin')[1], 'admin')
+
+
+@unittest.skipIf(ID_STORAGE == 'binary', "déjà exécuté en mode binaire")
+class TestBinaryIdStorage(unittest.TestCase):
+    """Les types de colonnes sont fixés à l'import : les modules sont relancés dans un sous-processus."""
+
+    def run_with_storage(self, storage, *modules):
+        return subprocess.run([sys.executable, '-m', 'unittest', *modules], cwd=PART3,
+                              env=dict(os.environ, HBNB_ID_STORAGE=storage),
+                              capture_output=True, text=True, timeout=300)
+
+    def assertPasses(self, *modules):
+        result = self.run_with_storage('binary', *modules)
+        self.assertEqual(result.returncode, 0, result.stderr[-3000:])
+
+    def test_search(self):
+        """La recherche plein texte fonctionne avec des identifiants binaires."""
+        self.assertPasses('app.test_models.test_search')
+
+    def test_api(self):
+        """Les tests de l'API passent avec des identifiants binaires."""
+        self.assertPasses('app.test_models.test_API_user', 'app.test_models.test_auth',
+                          'app.test_models.test_place_amenities', 'app.test_models.test_place_search',
+                          'app.test_models.test_review_create', 'app.test_models.test_review_search',
+                          'app.test_models.test_owner_summary')
+
+    def test_invalid_storage(self):
+        """Une valeur inconnue de HBNB_ID_STORAGE est refusée au démarrage."""
+        result = self.run_with_storage('binray', 'app.test_models.test_types')
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("HBNB_ID_STORAGE must be one of string, binary, not 'binray'", result.stderr)
+
+if __name__ == '__main__':
+    unittest.main()
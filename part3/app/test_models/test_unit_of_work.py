@@ -0,0 +1,119 @@
+import time
+import unittest
+
+from sqlalchemy import event
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.revoked_token import RevokedToken
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.place_repository import amenity_index, place_fulltext
+from app.services import facade, revocation_list
+from config import TestingConfig
+
+class TestUnitOfWork(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.commits = 0
+        event.listen(db.session, 'after_commit', self.count_commit)
+
+    def tearDown(self):
+        event.remove(db.session, 'after_commit', self.count_commit)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def count_commit(self, session):
+        if not session.in_nested_transaction():
+            self.commits += 1
+
+    def create_listing(self):
+        owner = facade.create_user({'first_name': 'Ana', 'last_name': 'Host',
+                                    'email': 'ana@example.com', 'password': 'secret'})
+        place = facade.create_place({'title': 'Flat', 'price': 50, 'latitude': 0, 'longitude': 0,
+                                     'owner_id': owner.id})
+        amenities = [facade.create_amenity({'name': name}) for name in ('WiFi', 'Pool')]
+        facade.add_amenities_to_place(place, amenities)
+        facade.update_place(place.id, {'price': 60})
+        return place
+
+    def test_commit_per_operation(self):
+        """Sans unité de travail, chaque écriture est validée séparément."""
+        self.create_listing()
+        self.assertEqual(self.commits, 6)
+
+    def test_single_commit(self):
+        """Dans une unité de travail, toutes les écritures sont validées une seule fois."""
+        with facade.transaction():
+            place = self.create_listing()
+            with facade.transaction():
+                place.save()
+            self.assertEqual(self.commits, 0)
+        self.assertEqual(self.commits, 1)
+        db.session.expire_all()
+        self.assertEqual(Place.query.one().price, 60)
+        self.assertEqual(len(Place.query.one().amenities), 2)
+        wifi = db.session.scalar(db.select(Amenity.id).where(Amenity.name == 'WiFi'))
+        self.assertEqual(amenity_index.evaluate([[wifi]]), [place.id])
+
+    def test_rollback(self):
+        """Une erreur annule toutes les écritures de l'unité de travail."""
+        with self.assertRaises(ValueError):
+            with facade.transaction():
+                self.create_listing()
+                facade.create_amenity({'name': 'WiFi'})
+        self.assertEqual(self.commits, 0)
+        self.assertEqual(User.query.count(), 0)
+        self.assertEqual(Amenity.query.count(), 0)
+
+    def test_maintenance_writes_join_the_unit_of_work(self):
+        """La purge des jetons révoqués et la reconstruction plein texte ne valident pas l'unité de travail."""
+        expired = {'jti': 'expired-jti', 'type': 'access', 'sub': {'id': 'x'}, 'exp': int(time.time()) - 60}
+        revocation_list.revoke(expired)
+        self.commits = 0
+        with self.assertRaises(ValueError):
+            with facade.transaction():
+                self.create_listing()
+                self.assertEqual(revocation_list.purge_expired(), 1)
+                place_fulltext.rebuild()
+                self.assertEqual(self.commits, 0)
+                raise ValueError("abort")
+        self.assertEqual(self.commits, 0)
+        self.assertEqual(User.query.count(), 0)
+        self.assertEqual(RevokedToken.query.count(), 1)
+
+    def test_inner_failure_rolls_back_to_savepoint(self):
+        """Une erreur interceptée dans un bloc imbriqué n'annule que ce bloc."""
+        amenity_index.rebuild()
+        with facade.transaction():
+            place = self.create_listing()
+            wifi, pool = (amenity.id for amenity in place.amenities)
+            try:
+                with facade.transaction():
+                    facade.set_place_amenities(place.id, [pool])
+                    facade.create_review({'text': 'ok', 'rating': 5, 'place_id': place.id, 'user_id': 'nope'})
+            except ValueError:
+                pass
+            facade.create_amenity({'name': 'Sauna'})
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(Amenity.query.count(), 3)
+        db.session.expire_all()
+        self.assertEqual(len(Place.query.one().amenities), 2)
+        self.assertEqual(amenity_index.evaluate([[wifi]]), [place.id])
+
+    def test_savepoint_released_inside_transaction(self):
+        """Un bloc imbriqué réussi reste annulable par le bloc extérieur."""
+        with self.assertRaises(RuntimeError):
+            with facade.transaction():
+                with facade.transaction():
+                    facade.create_amenity({'name': 'WiFi'})
+                raise RuntimeError
+        self.assertEqual(Amenity.query.count(), 0)
+        self.assertEqual(self.commits, 0)
+
+if __name__ == '__main__':
+    unittest.main()
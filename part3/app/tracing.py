@@ -0,0 +1,272 @@
+"""Lightweight request tracing exported as OpenTelemetry (OTLP/JSON) traces.
+
+A sampled request gets a root server span; facade calls, SQL statements
+and serializers traced with `traced` become its children. Finished traces
+are appended to TRACE_EXPORT_PATH, one OTLP/JSON document per line.
+Unsampled requests only cost a random() call and a context lookup.
+"""
+import functools
+import ipaddress
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import g, request
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+MAX_STATEMENT_LENGTH = 1000
+
+_current_span = ContextVar('hbnb_current_span', default=None)
+
+
+def _attribute(key, value):
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+class Trace:
+    """Spans of one sampled request."""
+
+    def __init__(self, trace_id=None):
+        self.trace_id = trace_id or os.urandom(16).hex()
+        self.spans = []
+
+
+class Span:
+    def __init__(self, trace, name, parent_id=None, kind=SPAN_KIND_INTERNAL, attributes=None):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.status = STATUS_OK
+        self.status_message = None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_error(self, message):
+        self.status = STATUS_ERROR
+        self.status_message = str(message)
+
+    def end(self):
+        self.end_ns = time.time_ns()
+        self.trace.spans.append(self)
+
+    def to_otlp(self):
+        span = {
+            'traceId': self.trace.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [_attribute(key, value) for key, value in self.attributes.items()],
+            'status': {'code': self.status},
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        if self.status_message:
+            span['status']['message'] = self.status_message
+        return span
+
+
+class FileSpanExporter:
+    """Append finished traces to a file as OTLP/JSON lines."""
+
+    def __init__(self, path, service_name='hbnb'):
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+
+    def export(self, trace):
+        document = {'resourceSpans': [{
+            'resource': {'attributes': [_attribute('service.name', self.service_name)]},
+            'scopeSpans': [{
+                'scope': {'name': 'hbnb.tracing'},
+                'spans': [span.to_otlp() for span in trace.spans],
+            }],
+        }]}
+        line = json.dumps(document, separators=(',', ':')) + '\n'
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+
+class Tracer:
+    def __init__(self):
+        self.sample_rate = 0.0
+        self.trusted_callers = []
+        self.exporter = None
+
+    def init_app(self, app, db):
+        """Read the sampling settings and install request and SQL hooks."""
+        from sqlalchemy import event
+
+        self.sample_rate = app.config.get('TRACE_SAMPLE_RATE', 0.0)
+        self.trusted_callers = [ipaddress.ip_network(caller, strict=False)
+                                for caller in app.config.get('TRACE_TRUSTED_CALLERS', [])]
+        self.exporter = FileSpanExporter(app.config.get('TRACE_EXPORT_PATH', 'traces.jsonl'),
+                                         app.config.get('TRACE_SERVICE_NAME', 'hbnb'))
+        app.before_request(self._start_request)
+        app.after_request(self._record_status)
+        app.teardown_request(self._end_request)
+        with app.app_context():
+            for engine in db.engines.values():
+                if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+                    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+                    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+                    event.listen(engine, 'handle_error', _handle_error)
+
+    def start_span(self, name, kind=SPAN_KIND_INTERNAL, **attributes):
+        """Start a child of the current span, or return None outside a sampled trace."""
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        return Span(parent.trace, name, parent.span_id, kind, attributes)
+
+    @contextmanager
+    def span(self, name, kind=SPAN_KIND_INTERNAL, **attributes):
+        """Trace the wrapped block as a child of the current span."""
+        span = self.start_span(name, kind, **attributes)
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.set_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def _trusted_caller(self):
+        try:
+            address = ipaddress.ip_address(request.remote_addr or '')
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted_callers)
+
+    def _sampled_parent(self):
+        """Continue an incoming W3C traceparent, or apply the sampling rate.
+
+        Only trusted callers decide the sampling through the traceparent
+        flag, so clients cannot force every request to be traced; the trace
+        and parent ids of other callers are kept when their request is sampled.
+        """
+        header = request.headers.get('traceparent', '')
+        parts = header.split('-')
+        parent = None, None
+        if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16 and len(parts[3]) == 2:
+            try:
+                flags = int(parts[3], 16)
+            except ValueError:
+                pass
+            else:
+                if self._trusted_caller():
+                    return (parts[1], parts[2]) if flags & 1 else None
+                parent = parts[1], parts[2]
+        if self.sample_rate and random.random() < self.sample_rate:
+            return parent
+        return None
+
+    def _start_request(self):
+        sampled = self._sampled_parent()
+        if sampled is None:
+            return
+        trace_id, parent_id = sampled
+        rule = request.url_rule.rule if request.url_rule else request.path
+        span = Span(Trace(trace_id), f"{request.method} {rule}", parent_id, SPAN_KIND_SERVER, {
+            'http.request.method': request.method,
+            'http.route': rule,
+            'url.path': request.path,
+        })
+        g._trace_span = span
+        g._trace_token = _current_span.set(span)
+
+    def _record_status(self, response):
+        span = g.get('_trace_span')
+        if span is not None:
+            span.set_attribute('http.response.status_code', response.status_code)
+            if response.status_code >= 500:
+                span.set_error(f"HTTP {response.status_code}")
+        return response
+
+    def _end_request(self, exc):
+        span = g.pop('_trace_span', None)
+        if span is None:
+            return
+        _current_span.reset(g.pop('_trace_token'))
+        if exc is not None:
+            span.set_error(exc)
+        span.end()
+        if self.exporter:
+            self.exporter.export(span.trace)
+
+
+tracer = Tracer()
+
+
+def traced(name=None):
+    """Decorator tracing every call of a function as a child span."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_public_methods(cls):
+    """Class decorator tracing every public method (used on HBnBFacade)."""
+    for attr, value in list(vars(cls).items()):
+        if callable(value) and not attr.startswith('_'):
+            setattr(cls, attr, traced(f"{cls.__name__}.{attr}")(value))
+    return cls
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = tracer.start_span(statement.split(None, 1)[0].upper() if statement else 'SQL', SPAN_KIND_CLIENT,
+                             **{'db.system': conn.dialect.name,
+                                'db.statement': statement[:MAX_STATEMENT_LENGTH]})
+    if span is not None and context is not None:
+        context._trace_span = span
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, '_trace_span', None)
+    if span is not None:
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            span.set_attribute('db.response.returned_rows', cursor.rowcount)
+        span.end()
+        context._trace_span = None
+
+
+def _handle_error(exception_context):
+    span = getattr(exception_context.execution_context, '_trace_span', None)
+    if span is not None:
+        span.set_error(exception_context.original_exception)
+        span.end()
+        exception_context.execution_context._trace_span = None
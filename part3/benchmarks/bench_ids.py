@@ -0,0 +1,98 @@
+"""Insert throughput and index size of the primary key schemes.
+
+    python -m benchmarks.bench_ids --rows 1000000
+
+Every scheme inserts the same number of rows, in batches, into a fresh
+SQLite file holding a table with a primary key and an indexed foreign key
+(like reviews.user_id) referencing earlier rows. Sizes come from the
+dbstat virtual table.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import Column, Index, MetaData, Table, create_engine, insert, text
+from app.models.types import GUID, uuid7
+from benchmarks.harness import RESULTS_DIR, git_commit
+
+SCHEMES = {
+    'uuid4-string': (lambda: str(uuid.uuid4()), False),
+    'uuid7-string': (lambda: str(uuid7()), False),
+    'uuid7-binary': (lambda: str(uuid7()), True),
+}
+
+
+def run_scheme(name, rows, batch_size, seed=42):
+    generate, binary = SCHEMES[name]
+    workdir = tempfile.mkdtemp(prefix='hbnb-ids-')
+    try:
+        engine = create_engine('sqlite:///' + os.path.join(workdir, 'ids.db'))
+        metadata = MetaData()
+        table = Table('records', metadata,
+                      Column('id', GUID(binary=binary), primary_key=True),
+                      Column('parent_id', GUID(binary=binary), nullable=False),
+                      Index('ix_records_parent_id', 'parent_id'))
+        metadata.create_all(engine)
+
+        rng = random.Random(seed)
+        parents = [generate() for _ in range(100)]
+        started = time.perf_counter()
+        for start in range(0, rows, batch_size):
+            batch = [{'id': generate(), 'parent_id': rng.choice(parents)}
+                     for _ in range(min(batch_size, rows - start))]
+            with engine.begin() as conn:
+                conn.execute(insert(table), batch)
+            parents.append(batch[-1]['id'])
+        elapsed = time.perf_counter() - started
+
+        with engine.connect() as conn:
+            sizes = dict(conn.execute(text(
+                "SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")).all())
+        engine.dispose()
+        primary_key = sum(size for index, size in sizes.items() if index.startswith('sqlite_autoindex_records'))
+        return {
+            'scheme': name,
+            'rows_per_s': round(rows / elapsed, 1),
+            'table_bytes': sizes.get('records', 0),
+            'primary_key_bytes': primary_key,
+            'fk_index_bytes': sizes.get('ix_records_parent_id', 0),
+            'file_bytes': os.path.getsize(os.path.join(workdir, 'ids.db')),
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--schemes', default=','.join(SCHEMES), help='Comma separated id schemes')
+    parser.add_argument('--output', help='Result file (defaults to benchmarks/results/)')
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'scheme':<14}{'rows/s':>12}{'table':>14}{'pk index':>14}{'fk index':>14}{'file':>14}")
+    for name in args.schemes.split(','):
+        result = run_scheme(name, args.rows, args.batch_size)
+        results.append(result)
+        print(f"{name:<14}{result['rows_per_s']:>12}{result['table_bytes']:>14}"
+              f"{result['primary_key_bytes']:>14}{result['fk_index_bytes']:>14}{result['file_bytes']:>14}")
+
+    commit = git_commit()
+    path = args.output
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"ids-{commit}.json")
+    with open(path, 'w') as f:
+        json.dump({'suite': 'ids', 'commit': commit, 'rows': args.rows,
+                   'batch_size': args.batch_size, 'results': results}, f, indent=2)
+    print(f"Results written to {path}")
+
+
+if __name__ == '__main__':
+    main()
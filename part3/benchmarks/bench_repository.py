@@ -0,0 +1,218 @@
+"""Micro-benchmarks of the repositories and HBnBFacade at growing data sizes.
+
+    python -m benchmarks.bench_repository --sizes 1000,100000,1000000
+    python -m benchmarks.compare benchmarks/results/repository-<old>.json \\
+                                 benchmarks/results/repository-<new>.json
+
+Each size is seeded into a fresh SQLite file with SyntheticDataGenerator
+(size places and about size reviews).
+"""
+import argparse
+import inspect
+import os
+import random
+import shutil
+import tempfile
+import types
+import uuid
+
+from sqlalchemy import insert
+from app import create_app, db
+from app.cli.seed import SyntheticDataGenerator
+from app.models import Place, Review, User
+from app.persistence.repository import InMemoryRepository, SQLAlchemyRepository
+from app.services import facade
+from benchmarks.harness import BenchmarkSuite
+from config import DevelopmentConfig
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+
+
+def make_config(path):
+    class BenchmarkConfig(DevelopmentConfig):
+        DEBUG = False
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+    return BenchmarkConfig
+
+
+class Dataset:
+    """Seeded database plus helpers returning random existing ids."""
+
+    def __init__(self, size, seed=42):
+        self.size = size
+        self.generator = SyntheticDataGenerator(users=max(10, size // 10), amenities=20,
+                                                places=size, reviews=size, seed=seed)
+        self.rng = random.Random(seed)
+        self.counts = {}
+
+    def seed(self):
+        self.counts = self.generator.generate(db.engine)
+
+    def random_id(self, kind, table):
+        return self.generator.make_id(kind, self.rng.randrange(self.counts[table]))
+
+    def user_id(self):
+        return self.random_id('user', 'users')
+
+    def place_id(self):
+        return self.random_id('place', 'places')
+
+    def review_id(self):
+        return self.random_id('review', 'reviews')
+
+    def amenity_id(self):
+        return self.random_id('amenity', 'amenities')
+
+    def new_place_data(self, owner_id=None):
+        return {'title': 'Benchmark place', 'description': 'Inserted by a benchmark',
+                'price': round(self.rng.uniform(20, 400), 2), 'latitude': self.rng.uniform(-80, 80),
+                'longitude': self.rng.uniform(-170, 170), 'owner_id': owner_id or self.user_id()}
+
+    def insert_row(self, table, **values):
+        """Insert a row outside the measured code and return its id."""
+        values.setdefault('id', str(uuid.uuid4()))
+        with db.engine.begin() as conn:
+            conn.execute(insert(table), values)
+        return values['id']
+
+    def insert_user(self):
+        return self.insert_row(User.__table__, first_name='Bench', last_name='User',
+                               email=f"bench-{uuid.uuid4().hex}@example.com", password='x')
+
+    def insert_place(self):
+        return self.insert_row(Place.__table__, **self.new_place_data())
+
+    def insert_review(self):
+        return self.insert_row(Review.__table__, text='Benchmark review', rating=4,
+                               place_id=self.place_id(), user_id=self.insert_user())
+
+
+def bench_sqlalchemy_repository(suite, data):
+    repository = SQLAlchemyRepository(Place)
+    size = data.size
+    reset = db.session.remove
+    suite.run('sqlalchemy', 'add', repository.add, setup=lambda: (Place(**data.new_place_data()),),
+              teardown=reset, size=size)
+    suite.run('sqlalchemy', 'get', repository.get, setup=lambda: (data.place_id(),), teardown=reset, size=size)
+    suite.run('sqlalchemy', 'get_all', repository.get_all, teardown=reset, min_rounds=1, size=size)
+    suite.run('sqlalchemy', 'update', repository.update,
+              setup=lambda: (data.place_id(), {'price': round(data.rng.uniform(20, 400), 2)}),
+              teardown=reset, size=size)
+    suite.run('sqlalchemy', 'delete', repository.delete, setup=lambda: (data.insert_place(),),
+              teardown=reset, size=size)
+    suite.run('sqlalchemy', 'get_by_attribute', repository.get_by_attribute,
+              setup=lambda: ('owner_id', data.user_id()), teardown=reset, size=size)
+
+
+def bench_in_memory_repository(suite, data):
+    repository = InMemoryRepository()
+    size = data.size
+    rng = data.rng
+    for i in range(size):
+        repository.add(types.SimpleNamespace(id=data.generator.make_id('place', i),
+                                             owner_id=data.generator.make_id('user', i % 97), price=100.0))
+
+    def new_record():
+        return (types.SimpleNamespace(id=str(uuid.uuid4()), owner_id='none', price=1.0),)
+
+    def added_record():
+        record = new_record()[0]
+        repository.add(record)
+        return (record.id,)
+
+    place_id = lambda: (data.generator.make_id('place', rng.randrange(size)),)
+    suite.run('memory', 'add', repository.add, setup=new_record, size=size)
+    suite.run('memory', 'get', repository.get, setup=place_id, size=size)
+    suite.run('memory', 'get_all', repository.get_all, min_rounds=1, size=size)
+    suite.run('memory', 'update', repository.update,
+              setup=lambda: (place_id()[0], {'price': rng.uniform(20, 400)}), size=size)
+    suite.run('memory', 'delete', repository.delete, setup=added_record, size=size)
+    suite.run('memory', 'get_by_attribute', repository.get_by_attribute,
+              setup=lambda: ('owner_id', data.generator.make_id('user', rng.randrange(97))), size=size)
+
+
+def facade_cases(data):
+    """Arguments builder for every benchmarked HBnBFacade method."""
+    unique = lambda prefix: f"{prefix} {uuid.uuid4().hex[:16]}"
+    return {
+        'create_user': lambda: ({'first_name': 'Bench', 'last_name': 'User',
+                                 'email': f"{uuid.uuid4().hex}@example.com", 'password': 'secret'},),
+        'get_users': lambda: (),
+        'get_user': lambda: (data.user_id(),),
+        'get_user_by_email': lambda: (f"user{data.rng.randrange(data.counts['users'])}@example.com",),
+        'update_user': lambda: (data.user_id(), {'first_name': 'Updated'}),
+        'authenticate_user': lambda: (f"user{data.rng.randrange(data.counts['users'])}@example.com", 'password'),
+        'create_amenity': lambda: ({'name': unique('Amenity')},),
+        'get_amenity': lambda: (data.amenity_id(),),
+        'get_amenity_by_name': lambda: ('Wi-Fi',),
+        'get_all_amenities': lambda: (),
+        'update_amenity': lambda: (data.insert_row(db.metadata.tables['amenities'], name=unique('Tmp')),
+                                   {'name': unique('Renamed')}),
+        'create_place': lambda: (data.new_place_data(),),
+        'get_places': lambda: (),
+        'get_all_places': lambda: (),
+        'get_place_by_id': lambda: (data.place_id(),),
+        'update_place': lambda: (data.place_id(), {'price': round(data.rng.uniform(20, 400), 2)}),
+        'create_review': lambda: ({'text': 'Benchmark review', 'rating': 5,
+                                   'user_id': data.insert_user(), 'place_id': data.place_id()},),
+        'get_review': lambda: (data.review_id(),),
+        'get_review_by_id': lambda: (data.review_id(),),
+        'get_all_reviews': lambda: (),
+        'get_reviews_by_place': lambda: (data.place_id(),),
+        'update_review': lambda: (data.review_id(), {'rating': data.rng.randint(1, 5)}),
+        'delete_review': lambda: (data.insert_review(),),
+        'get_review_by_place_and_user': lambda: (data.place_id(), data.user_id()),
+    }
+
+
+BULK_METHODS = {'get_users', 'get_all_amenities', 'get_places', 'get_all_places', 'get_all_reviews'}
+
+
+def bench_facade(suite, data):
+    cases = facade_cases(data)
+    public = {name for name, _ in inspect.getmembers(facade, inspect.ismethod) if not name.startswith('_')}
+    missing = sorted(public - set(cases))
+    if missing:
+        suite.echo(f"facade methods without a benchmark: {', '.join(missing)}")
+    for name in sorted(public & set(cases)):
+        suite.run('facade', name, getattr(facade, name), setup=cases[name], teardown=db.session.remove,
+                  min_rounds=1 if name in BULK_METHODS else None, size=data.size)
+
+
+GROUPS = {
+    'sqlalchemy': bench_sqlalchemy_repository,
+    'memory': bench_in_memory_repository,
+    'facade': bench_facade,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='Comma separated row counts')
+    parser.add_argument('--groups', default=','.join(GROUPS), help='Comma separated benchmark groups')
+    parser.add_argument('--min-time', type=float, default=0.5, help='Measured seconds per benchmark')
+    parser.add_argument('--output', help='Result file (defaults to benchmarks/results/)')
+    args = parser.parse_args(argv)
+
+    suite = BenchmarkSuite('repository', min_time=args.min_time)
+    for size in map(int, args.sizes.split(',')):
+        workdir = tempfile.mkdtemp(prefix='hbnb-bench-')
+        try:
+            app = create_app(make_config(os.path.join(workdir, 'bench.db')))
+            with app.app_context():
+                db.create_all()
+                data = Dataset(size)
+                print(f"Seeding {size} rows...")
+                data.seed()
+                for group in args.groups.split(','):
+                    GROUPS[group](suite, data)
+                db.session.remove()
+                db.engine.dispose()
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    print(f"Results written to {suite.save(args.output)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Concurrent read/write throughput of SQLite with and without SQLITE_PRAGMAS.
+
+    python -m benchmarks.bench_sqlite_concurrency --readers 8 --writers 4 --duration 10
+
+Readers fetch a random place with its reviews, writers insert users in
+short transactions. Each profile runs against a fresh seeded SQLite file.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+from app import create_app, db
+from app.cli.seed import SyntheticDataGenerator
+from app.models import Place, Review, User
+from benchmarks.harness import RESULTS_DIR, git_commit
+from config import DevelopmentConfig
+
+PROFILES = {
+    'default': {},
+    'tuned': DevelopmentConfig.SQLITE_PRAGMAS,
+}
+
+
+def run_profile(name, pragmas, readers, writers, duration, scale):
+    workdir = tempfile.mkdtemp(prefix='hbnb-sqlite-')
+
+    class ProfileConfig(DevelopmentConfig):
+        DEBUG = False
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+        SQLALCHEMY_ENGINE_OPTIONS = {'pool_size': readers + writers, 'max_overflow': 0,
+                                     'connect_args': {'timeout': 0.1}}
+        SQLITE_PRAGMAS = pragmas
+
+    try:
+        app = create_app(ProfileConfig)
+        with app.app_context():
+            db.create_all()
+            generator = SyntheticDataGenerator.from_scale(scale)
+            counts = generator.generate(db.engine)
+            engine = db.engine
+            place_ids = [generator.make_id('place', i) for i in range(counts['places'])]
+
+            stats = {'reads': 0, 'writes': 0, 'locked': 0}
+            lock = threading.Lock()
+            deadline = time.perf_counter() + duration
+
+            def count(key):
+                with lock:
+                    stats[key] += 1
+
+            def reader(seed):
+                rng = random.Random(seed)
+                while time.perf_counter() < deadline:
+                    place_id = rng.choice(place_ids)
+                    try:
+                        with engine.connect() as conn:
+                            conn.execute(select(Place.__table__).where(Place.id == place_id)).all()
+                            conn.execute(select(Review.__table__).where(Review.place_id == place_id)).all()
+                        count('reads')
+                    except OperationalError:
+                        count('locked')
+
+            def writer(index):
+                while time.perf_counter() < deadline:
+                    try:
+                        with engine.begin() as conn:
+                            user_id = str(uuid.uuid4())
+                            conn.execute(insert(User.__table__), {
+                                'id': user_id, 'first_name': 'Writer', 'last_name': str(index),
+                                'email': f"{user_id}@example.com", 'password': 'x'})
+                        count('writes')
+                    except OperationalError:
+                        count('locked')
+
+            threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+            threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+            db.engine.dispose()
+        return {
+            'profile': name,
+            'reads_per_s': round(stats['reads'] / elapsed, 1),
+            'writes_per_s': round(stats['writes'] / elapsed, 1),
+            'locked_errors': stats['locked'],
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--scale', default='small', help='SyntheticDataGenerator preset')
+    parser.add_argument('--output', help='Result file (defaults to benchmarks/results/)')
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, pragmas in PROFILES.items():
+        result = run_profile(name, pragmas, args.readers, args.writers, args.duration, args.scale)
+        results.append(result)
+        print(f"{name:<10}{result['reads_per_s']:>12} reads/s{result['writes_per_s']:>12} writes/s"
+              f"{result['locked_errors']:>8} locked")
+
+    commit = git_commit()
+    path = args.output
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"sqlite-concurrency-{commit}.json")
+    with open(path, 'w') as f:
+        json.dump({'suite': 'sqlite-concurrency', 'commit': commit, 'readers': args.readers,
+                   'writers': args.writers, 'duration': args.duration, 'results': results}, f, indent=2)
+    print(f"Results written to {path}")
+
+
+if __name__ == '__main__':
+    main()
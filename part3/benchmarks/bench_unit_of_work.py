@@ -0,0 +1,103 @@
+"""Write throughput of facade workloads with and without a unit of work.
+
+    python -m benchmarks.bench_unit_of_work --listings 500
+
+Each listing creates a host, a place with two amenities and a guest review
+through the facade (seven writes). The 'per-operation' mode commits every
+write, 'per-listing' wraps each listing in facade.transaction() and
+'batch' groups --batch-size listings per transaction. Every mode runs
+against a fresh SQLite file with SQLITE_PRAGMAS.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import nullcontext
+
+from sqlalchemy import event
+from app import create_app, db
+from app.services import facade
+from benchmarks.harness import RESULTS_DIR, git_commit
+from config import DevelopmentConfig
+
+MODES = ('per-operation', 'per-listing', 'batch')
+
+
+def create_listing(index):
+    host = facade.create_user({'first_name': 'Host', 'last_name': str(index),
+                               'email': f'host{index}@example.com', 'password': 'secret'})
+    guest = facade.create_user({'first_name': 'Guest', 'last_name': str(index),
+                                'email': f'guest{index}@example.com', 'password': 'secret'})
+    place = facade.create_place({'title': f'Place {index}', 'price': 50, 'latitude': 0, 'longitude': 0,
+                                 'owner_id': host.id})
+    amenities = [facade.create_amenity({'name': f'{name} {index}'}) for name in ('WiFi', 'Pool')]
+    facade.add_amenities_to_place(place, amenities)
+    facade.create_review({'text': 'Nice', 'rating': 5, 'place_id': place.id, 'user_id': guest.id})
+
+
+def run_mode(mode, listings, batch_size):
+    workdir = tempfile.mkdtemp(prefix='hbnb-uow-')
+
+    class ModeConfig(DevelopmentConfig):
+        DEBUG = False
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+        BCRYPT_LOG_ROUNDS = 4
+
+    try:
+        app = create_app(ModeConfig)
+        with app.app_context():
+            db.create_all()
+            commits = 0
+
+            def count(session):
+                nonlocal commits
+                commits += 1
+
+            event.listen(db.session, 'after_commit', count)
+            started = time.perf_counter()
+            for start in range(0, listings, batch_size if mode == 'batch' else 1):
+                end = min(listings, start + (batch_size if mode == 'batch' else 1))
+                with facade.transaction() if mode != 'per-operation' else nullcontext():
+                    for index in range(start, end):
+                        create_listing(index)
+            elapsed = time.perf_counter() - started
+            event.remove(db.session, 'after_commit', count)
+            db.session.remove()
+            db.engine.dispose()
+        return {'mode': mode, 'listings_per_s': round(listings / elapsed, 1),
+                'writes_per_s': round(7 * listings / elapsed, 1), 'commits': commits,
+                'seconds': round(elapsed, 3)}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--listings', type=int, default=300)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--modes', default=','.join(MODES), help='Comma separated modes')
+    parser.add_argument('--output', help='Result file (defaults to benchmarks/results/)')
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'mode':<16}{'listings/s':>12}{'writes/s':>12}{'commits':>10}")
+    for mode in args.modes.split(','):
+        result = run_mode(mode, args.listings, args.batch_size)
+        results.append(result)
+        print(f"{mode:<16}{result['listings_per_s']:>12}{result['writes_per_s']:>12}{result['commits']:>10}")
+
+    commit = git_commit()
+    path = args.output
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"unit-of-work-{commit}.json")
+    with open(path, 'w') as f:
+        json.dump({'suite': 'unit-of-work', 'commit': commit, 'listings': args.listings,
+                   'batch_size': args.batch_size, 'results': results}, f, indent=2)
+    print(f"Results written to {path}")
+
+
+if __name__ == '__main__':
+    main()
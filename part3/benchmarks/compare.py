@@ -0,0 +1,36 @@
+"""Compare two benchmark result files.
+
+    python -m benchmarks.compare benchmarks/results/repository-abc123.json \\
+                                 benchmarks/results/repository-def456.json
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.harness import compare
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark JSON files.')
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Median slowdown ratio reported as a regression')
+    args = parser.parse_args(argv)
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    print(f"{old['commit']} -> {new['commit']}")
+    regressions = 0
+    for (group, name, params), before, after, ratio, regressed in compare(old, new, args.threshold):
+        regressions += regressed
+        flag = 'REGRESSION' if regressed else ''
+        print(f"{group:<12}{name:<32}{params:<28}{before * 1e6:>12.1f} us{after * 1e6:>12.1f} us"
+              f"{ratio:>8.2f}x {flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
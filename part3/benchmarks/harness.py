@@ -0,0 +1,98 @@
+"""Small pytest-benchmark style harness: timed rounds, JSON results, comparisons."""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def git_commit():
+    """Short hash of the checked out commit, or 'unknown'."""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+class BenchmarkSuite:
+    """Collects timings of named callables.
+
+    Each round calls `setup()` (untimed) to get the arguments, times
+    `func(*args)`, then calls `teardown()` (untimed). Rounds repeat until
+    `min_time` seconds were measured or `max_rounds` is reached.
+    """
+
+    def __init__(self, name, min_rounds=3, max_rounds=1000, min_time=0.5, echo=print):
+        self.name = name
+        self.min_rounds = min_rounds
+        self.max_rounds = max_rounds
+        self.min_time = min_time
+        self.echo = echo
+        self.results = []
+
+    def run(self, group, name, func, setup=None, teardown=None, min_rounds=None, **params):
+        min_rounds = self.min_rounds if min_rounds is None else min_rounds
+        timings = []
+        while len(timings) < min_rounds or (
+                sum(timings) < self.min_time and len(timings) < self.max_rounds):
+            args = setup() if setup else ()
+            started = time.perf_counter()
+            func(*args)
+            timings.append(time.perf_counter() - started)
+            if teardown:
+                teardown()
+        result = {
+            'group': group,
+            'name': name,
+            'params': params,
+            'rounds': len(timings),
+            'min': min(timings),
+            'max': max(timings),
+            'mean': statistics.fmean(timings),
+            'median': statistics.median(timings),
+            'stddev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        }
+        result['ops'] = 1 / result['mean'] if result['mean'] else 0.0
+        self.results.append(result)
+        if self.echo:
+            label = ' '.join(f"{key}={value}" for key, value in params.items())
+            self.echo(f"{group:<12}{name:<32}{label:<24}{result['median'] * 1e6:>12.1f} us"
+                      f"  ({result['rounds']} rounds)")
+        return result
+
+    def save(self, path=None):
+        """Write the results as JSON; defaults to results/<suite>-<commit>.json."""
+        commit = git_commit()
+        if path is None:
+            os.makedirs(RESULTS_DIR, exist_ok=True)
+            path = os.path.join(RESULTS_DIR, f"{self.name}-{commit}.json")
+        with open(path, 'w') as f:
+            json.dump({
+                'suite': self.name,
+                'commit': commit,
+                'created_at': datetime.utcnow().isoformat(),
+                'python': platform.python_version(),
+                'machine': platform.platform(),
+                'benchmarks': self.results,
+            }, f, indent=2)
+        return path
+
+
+def _key(result):
+    return result['group'], result['name'], json.dumps(result['params'], sort_keys=True)
+
+
+def compare(old, new, threshold=0.1):
+    """Yield (key, old median, new median, ratio, regressed) for benchmarks present in both runs."""
+    previous = {_key(result): result for result in old['benchmarks']}
+    for result in new['benchmarks']:
+        before = previous.get(_key(result))
+        if before is None or not before['median']:
+            continue
+        ratio = result['median'] / before['median']
+        yield _key(result), before['median'], result['median'], ratio, ratio > 1 + threshold
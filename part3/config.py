@@ -1,15 +1,91 @@
 import os
+from datetime import timedelta
+
+def env_flag(name, default):
+    return os.getenv(name, default).lower() in ('1', 'true', 'yes', 'on')
 
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
 
+    # Identities are dicts ({'id': ..., 'is_admin': ...}), not strings
+    JWT_VERIFY_SUB = False
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+
+    # Revoked tokens are looked up through an in-memory Bloom filter
+    REVOCATION_BLOOM_CAPACITY = 100000
+    REVOCATION_BLOOM_ERROR_RATE = 0.001
+    REVOCATION_REBUILD_INTERVAL = 60
+    # Seconds before the amenity bitmaps are reloaded to see other workers' writes
+    AMENITY_BITMAP_REBUILD_INTERVAL = 60
+    # Seconds before the place search statistics (histograms) are recomputed
+    PLACE_STATISTICS_REFRESH_INTERVAL = 60
+    # Owner dashboard pages are cached this many seconds (review writes invalidate them)
+    OWNER_SUMMARY_CACHE_TTL = 30
+    OWNER_SUMMARY_CACHE_SIZE = 1024
+
+    # Fraction of requests traced and exported as OTLP/JSON lines
+    TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', '0'))
+    TRACE_EXPORT_PATH = os.getenv('TRACE_EXPORT_PATH', 'traces.jsonl')
+    # Addresses or networks (e.g. an internal gateway) whose traceparent sampled flag is honoured;
+    # other callers are sampled at TRACE_SAMPLE_RATE like any request
+    TRACE_TRUSTED_CALLERS = [caller.strip() for caller in os.getenv('TRACE_TRUSTED_CALLERS', '').split(',')
+                             if caller.strip()]
+
+    # Upper bound for the admin sampling profiler duration
+    PROFILER_MAX_SECONDS = 60
+
+    # Applied on every new SQLite connection (ignored by other databases)
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',        # readers no longer block the writer
+        'synchronous': 'NORMAL',      # fsync at checkpoints instead of every commit (safe with WAL)
+        'busy_timeout': 5000,         # wait up to 5s for a lock instead of "database is locked"
+        'cache_size': -64000,         # 64 MB page cache per connection
+        'mmap_size': 268435456,       # read pages through a 256 MB memory map
+        'temp_store': 'MEMORY',
+        'foreign_keys': 'ON',
+    }
+
+    # /health/ready answers 503 once this share of the pool is checked out
+    HEALTH_POOL_SATURATION = 1.0
+
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': 5,
+        'max_overflow': 10,
+        'pool_timeout': 30,
+        'pool_recycle': 1800,
+        'pool_pre_ping': True,
+    }
+
+class ProductionConfig(Config):
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///production.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '10')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '20')),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', '5')),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),
+        'pool_pre_ping': env_flag('DB_POOL_PRE_PING', 'true'),
+    }
+    # Reads of GET requests go to the replica when DATABASE_REPLICA_URL is set
+    SQLALCHEMY_BINDS = {'replica': os.environ['DATABASE_REPLICA_URL']} if os.getenv('DATABASE_REPLICA_URL') else {}
+    HEALTH_POOL_SATURATION = float(os.getenv('HEALTH_POOL_SATURATION', '1.0'))
+
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    BCRYPT_LOG_ROUNDS = 4
+    TRACE_SAMPLE_RATE = 0.0
 
 config = {
     'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
 }
@@ -0,0 +1,292 @@
+"""HTTP load test for the HBnB API.
+
+Runs scripted scenarios (browse places, view a place, login, post a review)
+from concurrent virtual users against a running server, reports latency
+percentiles and throughput per endpoint, and compares them with a stored
+baseline.
+
+    python run.py &                                  # start the API
+    python loadtest.py --duration 30 --save-baseline
+    python loadtest.py --duration 30 --threshold 0.2  # exit 1 on regression
+
+Use --serve to start the app in-process on a throw-away SQLite database.
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'loadtest_baseline.json')
+PERCENTILES = (50, 95, 99)
+SCENARIO_WEIGHTS = {
+    'browse_places': 50,
+    'view_place': 30,
+    'login': 10,
+    'post_review': 10,
+}
+# Access tokens expire after 15 minutes (JWT_ACCESS_TOKEN_EXPIRES): renew them well before
+TOKEN_REFRESH_AFTER = 600
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Recorder:
+    """Thread-safe collection of (endpoint, latency, status) samples."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def record(self, endpoint, latency, ok):
+        with self._lock:
+            self.samples.setdefault(endpoint, []).append(latency)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def report(self, duration):
+        """Latency percentiles (ms), throughput (req/s) and errors per endpoint."""
+        report = {}
+        for endpoint, latencies in sorted(self.samples.items()):
+            latencies = sorted(latencies)
+            entry = {f"p{pct}_ms": round(percentile(latencies, pct) * 1000, 2) for pct in PERCENTILES}
+            entry['requests'] = len(latencies)
+            entry['errors'] = self.errors.get(endpoint, 0)
+            entry['throughput_rps'] = round(len(latencies) / duration, 2)
+            report[endpoint] = entry
+        return report
+
+
+class Client:
+    """Minimal JSON HTTP client that times every request."""
+
+    def __init__(self, base_url, recorder):
+        self.base_url = base_url.rstrip('/')
+        self.recorder = recorder
+        self.token = None
+
+    def request(self, method, path, endpoint, payload=None, expected=(200,), token=None):
+        data = json.dumps(payload).encode() if payload is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method)
+        req.add_header('Content-Type', 'application/json')
+        token = token or self.token
+        if token:
+            req.add_header('Authorization', f'Bearer {token}')
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                status, body = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, body = e.code, e.read()
+        except (urllib.error.URLError, OSError):
+            status, body = 0, b''
+        if endpoint:
+            self.recorder.record(f"{method} {endpoint}", time.perf_counter() - started, status in expected)
+        try:
+            return status, json.loads(body) if body else None
+        except ValueError:
+            return status, None
+
+
+class VirtualUser:
+    """One simulated guest with its own account and review queue."""
+
+    def __init__(self, base_url, recorder, place_ids, rng):
+        self.client = Client(base_url, recorder)
+        self.rng = rng
+        self.place_ids = place_ids
+        self.to_review = rng.sample(place_ids, len(place_ids))
+        self.email = f"guest-{uuid.uuid4().hex[:12]}@loadtest.example"
+        self.password = 'loadtest'
+        status, body = self.client.request('POST', '/api/v1/users/', None, {
+            'first_name': 'Load', 'last_name': 'Test', 'email': self.email, 'password': self.password
+        }, expected=(201,))
+        if status != 201:
+            raise RuntimeError(f"Could not create load test user ({status}): {body}")
+        self.user_id = body['id']
+        self.refresh_token = None
+        self.token_refreshed_at = time.monotonic()
+        self.login()
+
+    def login(self, endpoint=None):
+        status, body = self.client.request('POST', '/api/v1/auth/login', endpoint, {
+            'email': self.email, 'password': self.password
+        })
+        if status == 200:
+            self.client.token = body['access_token']
+            self.refresh_token = body['refresh_token']
+            self.token_refreshed_at = time.monotonic()
+
+    def refresh(self):
+        """Renew the access token (not recorded), logging in again if the refresh token is refused."""
+        if self.refresh_token:
+            status, body = self.client.request('POST', '/api/v1/auth/refresh', None, token=self.refresh_token)
+            if status == 200:
+                self.client.token = body['access_token']
+                self.token_refreshed_at = time.monotonic()
+                return
+        self.login()
+
+    def browse_places(self):
+        self.client.request('GET', '/api/v1/places/', '/places/')
+
+    def view_place(self):
+        self.client.request('GET', f"/api/v1/places/{self.rng.choice(self.place_ids)}", '/places/<id>')
+
+    def post_review(self):
+        if not self.to_review:
+            return self.browse_places()
+        self.client.request('POST', '/api/v1/reviews/', '/reviews/', {
+            'text': 'Load test review', 'rating': self.rng.randint(1, 5),
+            'user_id': self.user_id, 'place_id': self.to_review.pop()
+        }, expected=(201,))
+
+    def run_scenario(self, name):
+        if time.monotonic() - self.token_refreshed_at > TOKEN_REFRESH_AFTER:
+            self.refresh()
+        if name == 'login':
+            return self.login('/auth/login')
+        getattr(self, name)()
+
+
+def create_places(base_url, count):
+    """Create a host account and `count` places to browse and review."""
+    host = Client(base_url, Recorder())
+    email = f"host-{uuid.uuid4().hex[:12]}@loadtest.example"
+    status, body = host.request('POST', '/api/v1/users/', None, {
+        'first_name': 'Load', 'last_name': 'Host', 'email': email, 'password': 'loadtest'
+    }, expected=(201,))
+    if status != 201:
+        raise RuntimeError(f"Could not reach the API at {base_url} ({status})")
+    _, body = host.request('POST', '/api/v1/auth/login', None, {'email': email, 'password': 'loadtest'})
+    host.token = body['access_token']
+    place_ids = []
+    for i in range(count):
+        _, body = host.request('POST', '/api/v1/places/', None, {
+            'title': f'Load test place {i}', 'description': 'Created by loadtest.py',
+            'price': 50 + i, 'latitude': 43.3, 'longitude': 5.4, 'amenities': []
+        }, expected=(201,))
+        place_ids.append(body['id'])
+    return place_ids
+
+
+def run_load(base_url, users, duration, places, seed=0, weights=None):
+    """Run the scenarios for `duration` seconds and return the report."""
+    weights = weights or SCENARIO_WEIGHTS
+    recorder = Recorder()
+    place_ids = create_places(base_url, places)
+    rng = random.Random(seed)
+    virtual_users = [VirtualUser(base_url, recorder, place_ids, random.Random(rng.random()))
+                     for _ in range(users)]
+    names, scenario_weights = list(weights), list(weights.values())
+    deadline = time.perf_counter() + duration
+
+    def loop(vu):
+        while time.perf_counter() < deadline:
+            vu.run_scenario(vu.rng.choices(names, scenario_weights)[0])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        list(executor.map(loop, virtual_users))
+    elapsed = time.perf_counter() - started
+    return {'users': users, 'duration_s': round(elapsed, 2), 'endpoints': recorder.report(elapsed)}
+
+
+def compare(report, baseline, threshold):
+    """Return the list of regressions beyond `threshold` (0.2 means 20%)."""
+    regressions = []
+    for endpoint, base in baseline.get('endpoints', {}).items():
+        current = report['endpoints'].get(endpoint)
+        if current is None:
+            regressions.append(f"{endpoint}: missing from this run")
+            continue
+        for pct in PERCENTILES:
+            key = f"p{pct}_ms"
+            if base[key] and current[key] > base[key] * (1 + threshold):
+                regressions.append(f"{endpoint} {key}: {current[key]} > {base[key]} (+{threshold:.0%})")
+        if current['throughput_rps'] < base['throughput_rps'] * (1 - threshold):
+            regressions.append(f"{endpoint} throughput: {current['throughput_rps']} < {base['throughput_rps']}")
+        if current['errors'] > base['errors']:
+            regressions.append(f"{endpoint} errors: {current['errors']} > {base['errors']}")
+    return regressions
+
+
+def print_report(report):
+    print(f"{'endpoint':<22}{'reqs':>8}{'err':>6}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for endpoint, entry in report['endpoints'].items():
+        print(f"{endpoint:<22}{entry['requests']:>8}{entry['errors']:>6}{entry['throughput_rps']:>10}"
+              f"{entry['p50_ms']:>10}{entry['p95_ms']:>10}{entry['p99_ms']:>10}")
+
+
+def serve_in_process():
+    """Start the app on a temporary SQLite database and return its base URL."""
+    from werkzeug.serving import make_server
+    from app import create_app, db
+    from config import DevelopmentConfig
+
+    class LoadTestConfig(DevelopmentConfig):
+        DEBUG = False
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'loadtest.db')
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    app = create_app(LoadTestConfig)
+    with app.app_context():
+        db.create_all()
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:5000', help='Base URL of the running API')
+    parser.add_argument('--serve', action='store_true', help='Start the app in-process instead')
+    parser.add_argument('--users', type=int, default=8, help='Concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=20, help='Test duration in seconds')
+    parser.add_argument('--places', type=int, default=50, help='Places created before the run')
+    parser.add_argument('--seed', type=int, default=0, help='Scenario random seed')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed regression ratio')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline')
+    parser.add_argument('--output', help='Also write the report to this JSON file')
+    args = parser.parse_args(argv)
+
+    base_url = serve_in_process() if args.serve else args.url
+    report = run_load(base_url, args.users, args.duration, args.places, args.seed)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare with (run with --save-baseline first)")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(report, json.load(f), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
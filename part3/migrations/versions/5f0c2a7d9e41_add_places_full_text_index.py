@@ -0,0 +1,27 @@
+"""add places full-text index
+
+Revision ID: 5f0c2a7d9e41
+Revises: d2e8a4c71b56
+Create Date: 2026-10-19 11:02:37.514208
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.persistence.place_repository import place_fulltext
+
+
+# revision identifiers, used by Alembic.
+revision = '5f0c2a7d9e41'
+down_revision = 'd2e8a4c71b56'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 table and sync triggers on SQLite; other databases use the in-process index
+    place_fulltext.create(op.get_bind())
+
+
+def downgrade():
+    place_fulltext.drop(op.get_bind())
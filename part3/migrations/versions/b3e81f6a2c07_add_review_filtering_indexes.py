@@ -0,0 +1,33 @@
+"""add review filtering indexes
+
+Revision ID: b3e81f6a2c07
+Revises: 5f0c2a7d9e41
+Create Date: 2026-10-19 11:48:05.203116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.persistence.review_repository import review_fulltext
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e81f6a2c07'
+down_revision = '5f0c2a7d9e41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_index('ix_reviews_place_id_rating', ['place_id', 'rating'], unique=False)
+
+    # FTS5 table and sync triggers on SQLite; other databases use the in-process index
+    review_fulltext.create(op.get_bind())
+
+
+def downgrade():
+    review_fulltext.drop(op.get_bind())
+
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index('ix_reviews_place_id_rating')
@@ -0,0 +1,26 @@
+"""add place search indexes
+
+Revision ID: c4a7d19e3f52
+Revises: b3e81f6a2c07
+Create Date: 2026-10-19 14:02:31.418207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a7d19e3f52'
+down_revision = 'b3e81f6a2c07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_places_price', 'places', ['price'], unique=False)
+    op.create_index('ix_places_latitude', 'places', ['latitude'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_places_latitude', table_name='places')
+    op.drop_index('ix_places_price', table_name='places')
@@ -0,0 +1,49 @@
+"""add integrity constraints and foreign key indexes
+
+Revision ID: d2e8a4c71b56
+Revises: a6d1f3b8c902
+Create Date: 2026-10-19 10:09:52.617384
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2e8a4c71b56'
+down_revision = 'a6d1f3b8c902'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite cannot add constraints in place: batch mode copies the tables
+    with op.batch_alter_table('places', schema=None) as batch_op:
+        batch_op.create_check_constraint('ck_places_price', 'price >= 0')
+        batch_op.create_check_constraint('ck_places_latitude', 'latitude BETWEEN -90 AND 90')
+        batch_op.create_check_constraint('ck_places_longitude', 'longitude BETWEEN -180 AND 180')
+        batch_op.create_index(batch_op.f('ix_places_owner_id'), ['owner_id'], unique=False)
+
+    with op.batch_alter_table('place_amenity', schema=None) as batch_op:
+        batch_op.create_index('ix_place_amenity_amenity_id', ['amenity_id'], unique=False)
+
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_check_constraint('ck_reviews_rating', 'rating BETWEEN 1 AND 5')
+        batch_op.create_unique_constraint('uq_reviews_place_user', ['place_id', 'user_id'])
+        batch_op.create_index(batch_op.f('ix_reviews_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_reviews_user_id'))
+        batch_op.drop_constraint('uq_reviews_place_user', type_='unique')
+        batch_op.drop_constraint('ck_reviews_rating', type_='check')
+
+    with op.batch_alter_table('place_amenity', schema=None) as batch_op:
+        batch_op.drop_index('ix_place_amenity_amenity_id')
+
+    with op.batch_alter_table('places', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_places_owner_id'))
+        batch_op.drop_constraint('ck_places_longitude', type_='check')
+        batch_op.drop_constraint('ck_places_latitude', type_='check')
+        batch_op.drop_constraint('ck_places_price', type_='check')
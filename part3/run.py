@@ -1,9 +1,9 @@
-from app import create_app, db
+import os
+from app import create_app
+from config import config
 
 
-app = create_app()
-with app.app_context():
-    db.create_all()
+app = create_app(config[os.getenv('FLASK_CONFIG', 'default')])
 
 if __name__ == '__main__':
     app.run(debug=True)